@@ -216,7 +216,13 @@ struct ContentView: View {
             let result = runPythonGenerator(
                 projectRoot: projectRoot,
                 inputPath: inputArg,
-                outputPath: outputPath
+                outputPath: outputPath,
+                onOutput: { text in
+                    // Shown live while the generator runs
+                    DispatchQueue.main.async {
+                        self.logText += text
+                    }
+                }
             )
 
             storeLastPaths()
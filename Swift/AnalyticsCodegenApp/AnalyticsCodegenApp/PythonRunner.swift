@@ -1,6 +1,18 @@
 import Foundation
 
-func runPythonGenerator(projectRoot: String, inputPath: String, outputPath: String) -> String {
+/// Runs the generator with `--progress-format jsonl` and streams its output.
+///
+/// Both pipes are read while the process runs, so a long list of warnings can
+/// never fill a pipe buffer and block the generator. Every progress event is
+/// passed to `onOutput` as a formatted log line as soon as it arrives.
+///
+/// - Returns: The final status line ("Exit status: N" or the launch error).
+func runPythonGenerator(
+    projectRoot: String,
+    inputPath: String,
+    outputPath: String,
+    onOutput: @escaping (String) -> Void
+) -> String {
     let process = Process()
     let pipe = Pipe()
     let errorPipe = Pipe()
@@ -13,30 +25,102 @@ func runPythonGenerator(projectRoot: String, inputPath: String, outputPath: Stri
         "python3",
         "-m", "python.analytics_codegen.cli",
         "--input", inputPath,
-        "--output", outputPath
+        "--output", outputPath,
+        "--progress-format", "jsonl"
     ]
 
-    var output = ""
-    do {
-        try process.run()
-        process.waitUntilExit()
+    let streams = DispatchGroup()
+    var stdoutBuffer = Data()
 
-        let outData = pipe.fileHandleForReading.readDataToEndOfFile()
-        let errData = errorPipe.fileHandleForReading.readDataToEndOfFile()
+    streams.enter()
+    pipe.fileHandleForReading.readabilityHandler = { handle in
+        let data = handle.availableData
+        if data.isEmpty {
+            handle.readabilityHandler = nil
+            if let rest = String(data: stdoutBuffer, encoding: .utf8), !rest.isEmpty {
+                onOutput(formatProgressLine(rest))
+            }
+            streams.leave()
+            return
+        }
+        stdoutBuffer.append(data)
+        while let newline = stdoutBuffer.firstIndex(of: UInt8(ascii: "\n")) {
+            let lineData = stdoutBuffer.subdata(in: stdoutBuffer.startIndex..<newline)
+            stdoutBuffer.removeSubrange(stdoutBuffer.startIndex...newline)
+            if let line = String(data: lineData, encoding: .utf8), !line.isEmpty {
+                onOutput(formatProgressLine(line))
+            }
+        }
+    }
 
-        if let outStr = String(data: outData, encoding: .utf8), !outStr.isEmpty {
-            output += outStr
+    streams.enter()
+    errorPipe.fileHandleForReading.readabilityHandler = { handle in
+        let data = handle.availableData
+        if data.isEmpty {
+            handle.readabilityHandler = nil
+            streams.leave()
+            return
         }
-        if let errStr = String(data: errData, encoding: .utf8), !errStr.isEmpty {
-            output += errStr
+        if let text = String(data: data, encoding: .utf8), !text.isEmpty {
+            onOutput(text)
         }
+    }
 
-        output += "\nExit status: \(process.terminationStatus)\n"
+    do {
+        try process.run()
+        process.waitUntilExit()
+        // Deliver everything written before the process exited
+        streams.wait()
+        return "\nExit status: \(process.terminationStatus)\n"
     } catch {
-        output += "Failed to run generator: \(error.localizedDescription)\n"
+        pipe.fileHandleForReading.readabilityHandler = nil
+        errorPipe.fileHandleForReading.readabilityHandler = nil
+        return "Failed to run generator: \(error.localizedDescription)\n"
     }
-
-    return output
 }
 
+/// Formats one line of `--progress-format jsonl` output for the log view.
+/// Lines that are not progress events are shown as they are.
+func formatProgressLine(_ line: String) -> String {
+    guard
+        let data = line.data(using: .utf8),
+        let event = (try? JSONSerialization.jsonObject(with: data)) as? [String: Any],
+        let kind = event["event"] as? String
+    else {
+        return line + "\n"
+    }
 
+    switch kind {
+    case "stage":
+        let stage = event["stage"] as? String ?? ""
+        if event["status"] as? String == "start" {
+            return "▶︎ \(stage)…\n"
+        }
+        let seconds = event["seconds"] as? Double ?? 0
+        return "✓ \(stage) (\(String(format: "%.2f", seconds)) s)\n"
+    case "fetch":
+        let bytes = event["bytes"] as? Int ?? 0
+        let size = ByteCountFormatter.string(fromByteCount: Int64(bytes), countStyle: .file)
+        return "⬇︎ Read \(size)\n"
+    case "rows":
+        return "   \(event["parsed"] as? Int ?? 0) rows parsed\n"
+    case "warning":
+        return (event["message"] as? String ?? "") + "\n"
+    case "warnings":
+        let kindName = event["kind"] as? String ?? "warning"
+        let suppressed = event["suppressed"] as? Int ?? 0
+        let total = event["total"] as? Int ?? 0
+        return "⚠️ \(suppressed) more \(kindName) warnings (\(total) in total)\n"
+    case "message":
+        return (event["text"] as? String ?? "") + "\n"
+    case "error":
+        return "❌ " + (event["message"] as? String ?? "") + "\n"
+    case "summary":
+        guard event["status"] as? String == "ok" else { return "" }
+        let functions = event["functions"] as? Int ?? 0
+        let outputs = event["outputs"] as? [String] ?? []
+        return outputs.map { "✅ Generated \(functions) functions → \($0)\n" }.joined()
+    default:
+        return line + "\n"
+    }
+}
@@ -684,22 +684,41 @@ struct Event {
 	// MARK: - Details
 	enum Details: EventTrackable {
 		case defined([EventDetailsParameter])
+		/// Typed details generated with `--typed-details`; converted to
+		/// parameters only when the event is sent
+		case typed(EventDetailsFields)
 
 		var values: [EventDetailsParameter] {
 			switch self {
 			case .defined(let parameters):
 				return parameters
+			case .typed(let fields):
+				return fields.parameters
 			}
 		}
 		var name: String {
 			switch self {
-			case .defined:
+			case .defined, .typed:
 				return "defined"
 			}
 		}
 	}
 }
 
+/// Details struct generated per tracking function with `--typed-details`.
+protocol EventDetailsFields {
+	var parameters: [EventDetailsParameter] { get }
+}
+
+/// String formats of typed event details values.
+enum EventDetailsFormat {
+	private static let dateFormatter: ISO8601DateFormatter = ISO8601DateFormatter()
+
+	static func string(from date: Date) -> String {
+		return dateFormatter.string(from: date)
+	}
+}
+
 extension Event.Label: RawRepresentable {
 
   public typealias RawValue = String
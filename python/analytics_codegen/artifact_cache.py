@@ -0,0 +1,354 @@
+"""
+Content-addressed cache of generated output.
+
+The cache key is a SHA-256 of the generator version (a hash of this package's
+source), the output-affecting CLI options and the normalized input bytes. An
+entry holds the rendered file of every target, so a hit is restored by
+copying files, without parsing the input.
+
+The cache directory can be shared between CI jobs and developer machines (a
+network or mounted path): entries are published with an atomic rename, and
+the least recently used entries are evicted once the cache exceeds its size
+limit. Changes to the directory (publishing, eviction, statistics) are made
+under an advisory lock on `<cache>/.lock`.
+"""
+
+from __future__ import annotations
+
+import codecs
+import hashlib
+import itertools
+import json
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import (
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .locking import DEFAULT_TIMEOUT, atomic_copy, atomic_write_text, file_lock
+
+# Bump when the entry layout changes
+CACHE_FORMAT = 1
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+_ENTRY_FILE = "entry.json"
+_STATS_FILE = "stats.json"
+_LOCK_FILE = ".lock"
+
+
+@lru_cache(maxsize=None)
+def generator_version() -> str:
+    """Hash of the generator's own source, so any code change invalidates the cache."""
+    digest = hashlib.sha256()
+    package_dir = Path(__file__).resolve().parent
+    for path in sorted(package_dir.glob("*.py")):
+        digest.update(path.name.encode("utf-8"))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def normalize_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """
+    Normalize input read in chunks before hashing.
+
+    CSV text loses a UTF-8 BOM, CRLF/CR line endings and trailing newlines, so
+    exports that differ only in those still share a key. Workbooks (zip
+    archives) are hashed as is. The joined result doesn't depend on where
+    the input is split.
+    """
+    chunks = iter(chunks)
+    head = b""
+    for chunk in chunks:
+        head += chunk
+        if len(head) >= 4:
+            break
+    if head.startswith(b"PK\x03\x04"):
+        yield head
+        yield from chunks
+        return
+    if head.startswith(codecs.BOM_UTF8):
+        head = head[len(codecs.BOM_UTF8):]
+
+    # Line endings at the end of a chunk wait for the next one: a CR may
+    # start a CRLF, and trailing newlines are only dropped at the end
+    pending = b""
+    for chunk in itertools.chain([head], chunks):
+        data = pending + chunk
+        carried_cr = b"\r" if data.endswith(b"\r") else b""
+        if carried_cr:
+            data = data[:-1]
+        data = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        text = data.rstrip(b"\n")
+        if text:
+            yield text
+        pending = data[len(text):] + carried_cr
+
+
+def normalize_input(data: bytes) -> bytes:
+    """Normalize input bytes before hashing (see `normalize_chunks`)."""
+    return b"".join(normalize_chunks([data]))
+
+
+def cache_key(
+    input_bytes: Union[bytes, Iterable[bytes]],
+    options: Mapping[str, object],
+    version: Optional[str] = None,
+) -> str:
+    """
+    Compute the cache key of a generator run.
+
+    Args:
+        input_bytes: Raw input (CSV text or workbook), whole or in chunks
+        options: Options that change the output (JSON-serializable)
+        version: Generator version (default: `generator_version()`)
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    header = {
+        "format": CACHE_FORMAT,
+        "generator": version or generator_version(),
+        "options": options,
+    }
+    digest = hashlib.sha256()
+    digest.update(json.dumps(header, sort_keys=True).encode("utf-8"))
+    digest.update(b"\0")
+    chunks = [input_bytes] if isinstance(input_bytes, bytes) else input_bytes
+    for chunk in normalize_chunks(chunks):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """A cached run: function count and one file per target name."""
+
+    key: str
+    path: Path
+    count: int
+    files: Dict[str, str]
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Lookups recorded in a cache directory."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ArtifactCache:
+    """Content-addressed cache directory with LRU eviction."""
+
+    def __init__(
+        self,
+        root: Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        lock_timeout: Optional[float] = DEFAULT_TIMEOUT,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            root: Cache directory (created on first store)
+            max_bytes: Total size above which entries are evicted
+            lock_timeout: Seconds to wait for the cache lock (None waits forever)
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        self.lock_timeout = lock_timeout
+
+    def _entry_dir(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def lookup(self, key: str) -> Optional[CacheEntry]:
+        """
+        Return the entry for `key` and mark it as recently used.
+
+        Unreadable or incomplete entries are treated as misses.
+        """
+        path = self._entry_dir(key)
+        meta_path = path / _ENTRY_FILE
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            files = {str(k): str(v) for k, v in meta["files"].items()}
+            if not all((path / name).is_file() for name in files.values()):
+                return None
+            os.utime(meta_path)
+        except (OSError, ValueError, KeyError, AttributeError):
+            return None
+        return CacheEntry(key=key, path=path, count=int(meta["count"]), files=files)
+
+    def restore(self, entry: CacheEntry, outputs: Mapping[str, Path]) -> bool:
+        """
+        Copy cached files to their output paths.
+
+        Lookups don't hold the cache lock, so a concurrent run can evict the
+        entry before it is copied.
+
+        Args:
+            entry: Entry from `lookup`
+            outputs: Output path per target name
+
+        Returns:
+            False if the entry was evicted in the meantime (outputs must then
+            be generated)
+        """
+        try:
+            for target, output_path in outputs.items():
+                atomic_copy(entry.path / entry.files[target], output_path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def store(self, key: str, count: int, outputs: Mapping[str, Path]) -> CacheEntry:
+        """
+        Add generated files to the cache and evict old entries if over the limit.
+
+        Args:
+            key: Cache key of the run
+            count: Number of functions generated
+            outputs: Generated file per target name
+
+        Returns:
+            The stored entry (an existing one if another run stored it first)
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=".staging-", dir=self.root))
+        files: Dict[str, str] = {}
+        try:
+            for target, output_path in outputs.items():
+                name = f"{target}{output_path.suffix}"
+                shutil.copyfile(output_path, staging / name)
+                files[target] = name
+            (staging / _ENTRY_FILE).write_text(
+                json.dumps({"count": count, "files": files}, sort_keys=True),
+                encoding="utf-8",
+            )
+
+            final = self._entry_dir(key)
+            with self._lock():
+                final.parent.mkdir(parents=True, exist_ok=True)
+                try:
+                    os.rename(staging, final)
+                except OSError:
+                    # Same content already published by a concurrent run
+                    if not final.is_dir():
+                        raise
+                self._evict()
+        finally:
+            if staging.exists():
+                shutil.rmtree(staging, ignore_errors=True)
+
+        return CacheEntry(key=key, path=final, count=count, files=files)
+
+    def _lock(self) -> ContextManager[None]:
+        return file_lock(self.root / _LOCK_FILE, self.lock_timeout)
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        entries: List[Tuple[float, int, Path]] = []
+        if not self.root.is_dir():
+            return entries
+        for meta_path in self.root.glob(f"*/*/{_ENTRY_FILE}"):
+            try:
+                entry_dir = meta_path.parent
+                size = sum(p.stat().st_size for p in entry_dir.iterdir())
+                entries.append((meta_path.stat().st_mtime, size, entry_dir))
+            except OSError:
+                # Evicted by a concurrent run
+                continue
+        return entries
+
+    def evict(self) -> int:
+        """
+        Remove least recently used entries until the cache fits its size limit.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock():
+            return self._evict()
+
+    def _evict(self) -> int:
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, entry_dir in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
+            removed += 1
+        if removed:
+            self._record(evictions=removed)
+        return removed
+
+    def stats(self) -> CacheStats:
+        """Return the lookups recorded so far."""
+        try:
+            data = json.loads((self.root / _STATS_FILE).read_text(encoding="utf-8"))
+            return CacheStats(
+                hits=int(data.get("hits", 0)),
+                misses=int(data.get("misses", 0)),
+                evictions=int(data.get("evictions", 0)),
+            )
+        except (OSError, ValueError, AttributeError):
+            return CacheStats()
+
+    def record(self, hits: int = 0, misses: int = 0, evictions: int = 0) -> CacheStats:
+        """
+        Add lookups to the persisted statistics.
+
+        Returns:
+            Statistics including these lookups
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._lock():
+            return self._record(hits, misses, evictions)
+
+    def _record(self, hits: int = 0, misses: int = 0, evictions: int = 0) -> CacheStats:
+        current = self.stats()
+        updated = CacheStats(
+            hits=current.hits + hits,
+            misses=current.misses + misses,
+            evictions=current.evictions + evictions,
+        )
+        atomic_write_text(
+            self.root / _STATS_FILE,
+            json.dumps(
+                {
+                    "hits": updated.hits,
+                    "misses": updated.misses,
+                    "evictions": updated.evictions,
+                }
+            ),
+        )
+        return updated
+
+
+def format_cache_report(hit: bool, key: str, stats: CacheStats) -> str:
+    """One-line summary of a lookup and the cache's hit rate."""
+    lookups = stats.hits + stats.misses
+    return (
+        f"📦 Cache {'hit' if hit else 'miss'} ({key[:12]}), "
+        f"hit rate {stats.hit_rate:.0%} ({stats.hits}/{lookups})"
+    )
@@ -0,0 +1,72 @@
+"""
+Compiled event catalog for server-side validation (`--target catalog`).
+
+The catalog is a JSON file holding every distinct
+`screen|component|section|element|action` key of the deduplicated rows
+(parameterized fields written as `*`) and the clients they apply to. Keys are
+stored in the slot order of a minimal perfect hash (see
+`dispatch.build_perfect_hash`), so consumers in any language can look a key
+up in O(1) from `seeds` and 32-bit FNV-1a without building their own table:
+
+    bucket = fnv1a(key) % len(seeds)
+    slot = fnv1a(key, seeds[bucket]) % len(keys)
+    valid = keys[slot] == key
+
+Python consumers use `validator.load_catalog`, which also handles wildcards.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Dict, List, Sequence
+
+from .codegen import EventRow, _taxonomy_key
+from .dispatch import build_perfect_hash
+from .validator import CATALOG_FORMAT, CATALOG_VERSION
+
+# Platforms of the taxonomy's client library
+DEFAULT_CLIENTS = ("android", "ios", "web", "web-mobile")
+
+
+def catalog_keys(rows: List[EventRow]) -> List[str]:
+    """
+    Distinct taxonomy keys of the rows, in first-occurrence order.
+
+    Rows differing only by `event_details` or `advertisement` share a key.
+    """
+    return list(dict.fromkeys(_taxonomy_key(row) for row in rows))
+
+
+def build_catalog(
+    rows: List[EventRow],
+    clients: Sequence[str] = DEFAULT_CLIENTS,
+) -> Dict[str, object]:
+    """
+    Build the catalog for deduplicated rows.
+
+    Args:
+        rows: Deduplicated event rows
+        clients: Client segments accepted for every key
+
+    Returns:
+        JSON-serializable catalog
+    """
+    table = build_perfect_hash(catalog_keys(rows))
+    return {
+        "format": CATALOG_FORMAT,
+        "version": CATALOG_VERSION,
+        "fields": ["screen", "component", "section", "element", "action"],
+        "clients": list(clients),
+        "hash": "fnv1a-32",
+        "seeds": table.seeds,
+        "keys": table.keys,
+    }
+
+
+def render_catalog(
+    rows: List[EventRow],
+    clients: Sequence[str] = DEFAULT_CLIENTS,
+) -> str:
+    """Render the catalog as compact JSON; see `build_catalog`."""
+    catalog = build_catalog(rows, clients)
+    return json.dumps(catalog, ensure_ascii=False, separators=(",", ":")) + "\n"
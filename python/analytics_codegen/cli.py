@@ -1,16 +1,26 @@
 from __future__ import annotations
 
 import argparse
+import os
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
 
-from .codegen import generate_swift_from_input
-from .input_source import (
-    FileInputSource,
-    GoogleSheetsInputSource,
-    InputType,
-    detect_input_type,
-)
+from . import progress
+
+# Heavy modules are imported inside the command handlers so that
+# `--input local.csv` doesn't pay for code paths it never runs.
+# See `analytics_codegen.startup_budget` for the import-time budget.
+if TYPE_CHECKING:
+    from .codegen import EventRow
+    from .input_source import InputSource
+    from .pipeline import StageSpec
+
+# Cache directory used when --cache-dir is not given (e.g. set once on CI)
+CACHE_DIR_ENV = "ANALYTICS_CODEGEN_CACHE_DIR"
+
+# Google Sheets URL prefix override, e.g. a `sheets_server` stand-in
+SHEETS_BASE_URL_ENV = "ANALYTICS_CODEGEN_SHEETS_BASE_URL"
 
 
 def _build_parser() -> argparse.ArgumentParser:
@@ -18,7 +28,12 @@ def _build_parser() -> argparse.ArgumentParser:
         description=(
             "Generate Swift analytics tracking functions from a CSV file "
             "using the 7-column analytics schema."
-        )
+        ),
+        epilog=(
+            "Subcommands: "
+            + ", ".join(_SUBCOMMANDS)
+            + " (run '<subcommand> --help' for details)"
+        ),
     )
     parser.add_argument(
         "--input",
@@ -26,10 +41,38 @@ def _build_parser() -> argparse.ArgumentParser:
         type=str,
         default="analytics.csv",
         help=(
-            "Path to CSV file or Google Sheets URL "
+            "Path to CSV/XLSX/ODS file or Google Sheets URL "
             "(default: analytics.csv)"
         ),
     )
+    parser.add_argument(
+        "--workbook",
+        action="store_true",
+        help=(
+            "Download a Google Sheet as one XLSX workbook and read all tabs "
+            "(local .xlsx/.ods inputs are always read as workbooks)"
+        ),
+    )
+    parser.add_argument(
+        "--tabs",
+        type=str,
+        default=None,
+        help="Comma-separated workbook tab names to read (default: all tabs)",
+    )
+    parser.add_argument(
+        "--project-columns",
+        action="store_true",
+        help=(
+            "Only download the taxonomy columns of a Google Sheet "
+            "(detected from its header row)"
+        ),
+    )
+    parser.add_argument(
+        "--range",
+        type=str,
+        default=None,
+        help='Only download this A1 range of a Google Sheet (e.g. "A1:K500")',
+    )
     parser.add_argument(
         "--output",
         "-o",
@@ -37,31 +80,416 @@ def _build_parser() -> argparse.ArgumentParser:
         default="Swift/GeneratedTrackingFunctions.swift",
         help=(
             "Path to output Swift file "
+            "(default: Swift/GeneratedTrackingFunctions.swift). "
+            "With several targets, each gets this path with its own extension"
+        ),
+    )
+    parser.add_argument(
+        "--target",
+        "-t",
+        type=str,
+        default="swift",
+        help=(
+            "Comma-separated output targets: swift, swift-table, kotlin, ts, "
+            "catalog (default: swift)"
+        ),
+    )
+    parser.add_argument(
+        "--dispatch-table",
+        action="store_true",
+        help=(
+            "Also emit trackEvent(forKey:) for concatenated "
+            "client|screen|component|section|element|action keys (Swift targets)"
+        ),
+    )
+    parser.add_argument(
+        "--event-strings",
+        action="store_true",
+        help=(
+            "Also emit precomputed concatenated key and snake_case field "
+            "string constants per function (Swift targets)"
+        ),
+    )
+    parser.add_argument(
+        "--typed-details",
+        action="store_true",
+        help=(
+            "Emit one typed argument per event_details key and a details "
+            "struct per function instead of [EventDetailsParameter] (swift target)"
+        ),
+    )
+    parser.add_argument(
+        "--details-schema",
+        help=(
+            "JSON file of event_details key -> type (string, integer, float, "
+            "boolean, datetime) extending the built-in keys; implies --typed-details"
+        ),
+    )
+    parser.add_argument(
+        "--disambiguate",
+        action="store_true",
+        help=(
+            "Rename functions whose generated names collide "
+            "(default: only warn about collisions)"
+        ),
+    )
+    parser.add_argument(
+        "--stage",
+        action="append",
+        default=[],
+        metavar='NAME[={"option": ...}]',
+        help=(
+            "Run a pipeline stage on the parsed rows before dedupe (repeatable): "
+            "rename, drop, append, a registered stage or module:factory"
+        ),
+    )
+    parser.add_argument(
+        "--pipeline-config",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help='JSON file with {"stages": [...]}, run before any --stage',
+    )
+    parser.add_argument(
+        "--dedupe-memory-mb",
+        type=int,
+        default=None,
+        help=(
+            "Deduplicate on disk, keeping about this many MB of rows in memory "
+            "(for inputs larger than RAM)"
+        ),
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help=(
+            "Reuse output of identical runs from this (possibly shared) cache "
+            f"directory (default: ${CACHE_DIR_ENV} if set)"
+        ),
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=512,
+        help="Evict least recently used cache entries above this size (default: 512)",
+    )
+    parser.add_argument(
+        "--lock-timeout",
+        type=float,
+        default=600.0,
+        help=(
+            "Seconds to wait for a concurrent run on the same input or output "
+            "(default: 600)"
+        ),
+    )
+    parser.add_argument(
+        "--progress-format",
+        choices=["text", "jsonl"],
+        default="text",
+        help=(
+            "Output format of progress, warnings and results: text, or flushed "
+            "JSON lines on stdout for front-ends (default: text)"
+        ),
+    )
+    parser.add_argument(
+        "--memprofile",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help=(
+            "Trace memory with tracemalloc and write peak/retained bytes and top "
+            "allocation sites per pipeline stage to PATH as JSON"
+        ),
+    )
+    return parser
+
+
+def _build_diff_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="analytics_codegen diff",
+        description=(
+            "Show which tracking functions are added, removed or changed "
+            "between two versions of the analytics events."
+        ),
+    )
+    parser.add_argument(
+        "old",
+        help="Previous version: CSV file, Google Sheets URL or .json snapshot",
+    )
+    parser.add_argument(
+        "new",
+        help="New version: CSV file, Google Sheets URL or .json snapshot",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["text", "json"],
+        default="text",
+        help="Output format (default: text)",
+    )
+    parser.add_argument(
+        "--save-snapshot",
+        type=str,
+        default=None,
+        help="Save the new version's rows as a .json snapshot",
+    )
+    return parser
+
+
+def _build_usage_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="analytics_codegen usage",
+        description=(
+            "Index call sites of generated tracking functions in a source tree "
+            "and report unused and missing functions."
+        ),
+    )
+    parser.add_argument("source_dir", help="Root of the source tree to scan")
+    names = parser.add_mutually_exclusive_group()
+    names.add_argument(
+        "--generated",
+        type=str,
+        default="Swift/GeneratedTrackingFunctions.swift",
+        help=(
+            "Generated Swift file listing the functions "
             "(default: Swift/GeneratedTrackingFunctions.swift)"
         ),
     )
+    names.add_argument(
+        "--input",
+        "-i",
+        type=str,
+        default=None,
+        help="Take function names from a CSV file or Google Sheets URL instead",
+    )
+    parser.add_argument(
+        "--ext",
+        type=str,
+        default=".swift",
+        help="Comma-separated file extensions to scan (default: .swift)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["text", "json"],
+        default="text",
+        help="Output format (default: text)",
+    )
     return parser
 
 
-def main(argv: list[str] | None = None) -> int:
-    parser = _build_parser()
+def _build_analyze_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="analytics_codegen analyze",
+        description=(
+            "Count defined events in newline-delimited event logs (plain or gzip) "
+            "and report events that never fired and fired events that are not defined."
+        ),
+    )
+    parser.add_argument("logs", nargs="+", help="Event log files")
+    parser.add_argument(
+        "--input",
+        "-i",
+        type=str,
+        default="analytics.csv",
+        help=(
+            "CSV/XLSX/ODS file, Google Sheets URL or JSON snapshot defining the "
+            "events (default: analytics.csv)"
+        ),
+    )
+    parser.add_argument(
+        "--clients",
+        type=str,
+        default=None,
+        help="Comma-separated accepted clients (default: android,ios,web,web-mobile)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "--shard-mb",
+        type=int,
+        default=64,
+        help="MB of a plain log read per worker task (default: 64)",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=20,
+        help="Undefined events listed in text output (default: 20)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["text", "json"],
+        default="text",
+        help="Output format (default: text)",
+    )
+    return parser
+
+
+def _split_list(value: str | None) -> List[str] | None:
+    if not value:
+        return None
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+def _create_input_source(
+    input_str: str,
+    workbook: bool = False,
+    tabs: List[str] | None = None,
+    project_columns: bool = False,
+    cell_range: str | None = None,
+) -> InputSource:
+    from .input_source import (
+        SHEETS_BASE_URL,
+        FileInputSource,
+        GoogleSheetsInputSource,
+        GoogleSheetsWorkbookInputSource,
+        InputType,
+        WorkbookInputSource,
+        detect_input_type,
+    )
+
+    # Detect input type and create the appropriate input source
+    input_type = detect_input_type(input_str)
+    projected = project_columns or cell_range
+    if projected and (input_type != InputType.GOOGLE_SHEETS or workbook or tabs):
+        raise ValueError(
+            "--project-columns and --range only apply to single-tab "
+            "Google Sheets exports"
+        )
+    if input_type == InputType.GOOGLE_SHEETS:
+        base_url = os.environ.get(SHEETS_BASE_URL_ENV) or SHEETS_BASE_URL
+        if workbook or tabs:
+            return GoogleSheetsWorkbookInputSource(input_str, tabs, base_url=base_url)
+        return GoogleSheetsInputSource(
+            input_str,
+            project_columns=project_columns,
+            cell_range=cell_range,
+            base_url=base_url,
+        )
+    if input_type == InputType.WORKBOOK_FILE:
+        return WorkbookInputSource(Path(input_str), tabs)
+    return FileInputSource(Path(input_str))
+
+
+def _load_rows(input_str: str) -> List[EventRow]:
+    from .codegen import _deduplicate, _parse_input
+    from .diff import load_snapshot
+
+    # Saved snapshots are already parsed and deduplicated
+    if input_str.strip().lower().endswith(".json"):
+        return load_snapshot(Path(input_str))
+    input_source = _create_input_source(input_str)
+    return _deduplicate(_parse_input(input_source))
+
+
+def _run_diff(argv: List[str]) -> int:
+    from .diff import diff_rows, format_diff_json, format_diff_text, write_snapshot
+
+    parser = _build_diff_parser()
     args = parser.parse_args(argv)
 
-    output_path = Path(args.output)
+    try:
+        old_rows = _load_rows(args.old)
+        new_rows = _load_rows(args.new)
+        result = diff_rows(old_rows, new_rows)
+        if args.save_snapshot:
+            write_snapshot(new_rows, Path(args.save_snapshot))
+    except FileNotFoundError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    except Exception as e:
+        print(f"❌ Unexpected error: {e}", file=sys.stderr)
+        return 1
+
+    if args.format == "json":
+        print(format_diff_json(result))
+    else:
+        print(format_diff_text(result))
+    return 0
+
+
+def _run_usage(argv: List[str]) -> int:
+    from .usage import (
+        format_usage_json,
+        format_usage_text,
+        generated_function_names,
+        scan_tree,
+    )
+
+    parser = _build_usage_parser()
+    args = parser.parse_args(argv)
+
+    extensions = [
+        ext if ext.startswith(".") else f".{ext}"
+        for ext in (part.strip() for part in args.ext.split(","))
+        if ext
+    ]
 
     try:
-        # Detect input type
-        input_type = detect_input_type(args.input)
+        exclude: List[Path] = []
+        if args.input:
+            from .codegen import _function_signature
 
-        # Create appropriate input source
-        if input_type == InputType.GOOGLE_SHEETS:
-            input_source = GoogleSheetsInputSource(args.input)
+            names = [_function_signature(row)[0] for row in _load_rows(args.input)]
         else:
-            input_source = FileInputSource(Path(args.input))
+            generated_path = Path(args.generated)
+            if not generated_path.is_file():
+                raise FileNotFoundError(f"Generated file not found: {generated_path}")
+            names = generated_function_names(generated_path.read_text(encoding="utf-8"))
+            exclude.append(generated_path)
+
+        report = scan_tree(
+            list(dict.fromkeys(names)),
+            Path(args.source_dir),
+            extensions=extensions,
+            exclude=exclude,
+            workers=args.workers,
+        )
+    except FileNotFoundError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    except Exception as e:
+        print(f"❌ Unexpected error: {e}", file=sys.stderr)
+        return 1
+
+    if args.format == "json":
+        print(format_usage_json(report))
+    else:
+        print(format_usage_text(report))
+    return 0
 
-        # Generate Swift code
-        count = generate_swift_from_input(input_source, output_path)
 
+def _run_analyze(argv: List[str]) -> int:
+    from .catalog import DEFAULT_CLIENTS, catalog_keys
+    from .log_coverage import analyze_logs, format_coverage_json, format_coverage_text
+
+    parser = _build_analyze_parser()
+    args = parser.parse_args(argv)
+
+    try:
+        report = analyze_logs(
+            catalog_keys(_load_rows(args.input)),
+            [Path(path) for path in args.logs],
+            clients=_split_list(args.clients) or DEFAULT_CLIENTS,
+            workers=args.workers,
+            shard_bytes=args.shard_mb * 1024 * 1024,
+        )
     except FileNotFoundError as e:
         print(f"❌ {e}", file=sys.stderr)
         return 1
@@ -72,11 +500,293 @@ def main(argv: list[str] | None = None) -> int:
         print(f"❌ Unexpected error: {e}", file=sys.stderr)
         return 1
 
-    print(f"✅ Generated {count} functions → {output_path}")
+    if args.format == "json":
+        print(format_coverage_json(report))
+    else:
+        print(format_coverage_text(report, top=args.top))
     return 0
 
 
-if __name__ == "__main__":
-    raise SystemExit(main())
+_SUBCOMMANDS: Dict[str, Callable[[List[str]], int]] = {
+    "diff": _run_diff,
+    "usage": _run_usage,
+    "analyze": _run_analyze,
+}
+
 
+def _stage_specs(args: argparse.Namespace) -> List[StageSpec]:
+    from .pipeline import load_pipeline_config, parse_stage_spec
 
+    specs: List[StageSpec] = []
+    if args.pipeline_config:
+        specs.extend(load_pipeline_config(Path(args.pipeline_config)))
+    specs.extend(parse_stage_spec(value) for value in args.stage)
+    return specs
+
+
+def _details_schema(args: argparse.Namespace) -> Optional[Dict[str, str]]:
+    """Key types for `--typed-details` (None when details stay untyped)."""
+    if args.details_schema:
+        from .details import load_details_schema
+
+        return load_details_schema(Path(args.details_schema))
+    if args.typed_details:
+        from .details import DEFAULT_DETAILS_SCHEMA
+
+        return dict(DEFAULT_DETAILS_SCHEMA)
+    return None
+
+
+def _cache_options(args: argparse.Namespace) -> Dict[str, object]:
+    # Everything that changes the generated files; output paths and
+    # --dedupe-memory-mb don't. Files read by stages are hashed separately
+    # (see `_stage_file_digests`).
+    return {
+        "target": args.target,
+        "dispatch_table": args.dispatch_table,
+        "event_strings": args.event_strings,
+        "details_schema": _details_schema(args),
+        "disambiguate": args.disambiguate,
+        "workbook": args.workbook,
+        "tabs": _split_list(args.tabs),
+        "project_columns": args.project_columns,
+        "range": args.range,
+        "stages": [spec.to_json() for spec in _stage_specs(args)],
+    }
+
+
+def _stage_file_digests(args: argparse.Namespace) -> Dict[str, Optional[str]]:
+    import hashlib
+
+    from .pipeline import stage_files
+
+    digests: Dict[str, Optional[str]] = {}
+    for path in stage_files(_stage_specs(args)):
+        try:
+            digest = hashlib.sha256()
+            with path.open("rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(chunk)
+            digests[str(path.resolve())] = digest.hexdigest()
+        except OSError:
+            # The stage reports the missing file itself
+            digests[str(path)] = None
+    return digests
+
+
+def _generate_cached(
+    cache_dir: Path,
+    args: argparse.Namespace,
+    input_source: InputSource,
+    outputs: Dict[str, Path],
+    generate: Callable[[], int],
+) -> int:
+    from .artifact_cache import ArtifactCache, cache_key, format_cache_report
+
+    cache = ArtifactCache(
+        cache_dir, args.cache_max_mb * 1024 * 1024, lock_timeout=args.lock_timeout
+    )
+    options = _cache_options(args)
+    options["stage_files"] = _stage_file_digests(args)
+    key = cache_key(input_source.iter_bytes(), options)
+
+    entry = cache.lookup(key)
+    if entry is not None and not cache.restore(entry, outputs):
+        # Evicted by a concurrent run after the lookup
+        entry = None
+    if entry is not None:
+        count = entry.count
+    else:
+        count = generate()
+        cache.store(key, count, outputs)
+
+    stats = cache.record(hits=int(entry is not None), misses=int(entry is None))
+    progress.current().message(format_cache_report(entry is not None, key, stats))
+    return count
+
+
+def _flight_key(args: argparse.Namespace, cached: bool) -> str:
+    from .input_source import InputType, detect_input_type
+    from .locking import flight_key
+
+    # Relative paths name different files in different projects
+    if detect_input_type(args.input) == InputType.GOOGLE_SHEETS:
+        source = [args.input, os.environ.get(SHEETS_BASE_URL_ENV)]
+    else:
+        source = [str(Path(args.input).resolve())]
+    if cached:
+        from .artifact_cache import generator_version
+
+        version = generator_version()
+    else:
+        # Hashing the package source is only worth it for cache keys; the
+        # installed package is enough to tell concurrent runs apart
+        version = str(Path(__file__).resolve().parent)
+    return flight_key(source, _cache_options(args), version)
+
+
+def _run_single_flight(
+    args: argparse.Namespace,
+    outputs: Dict[str, Path],
+    run: Callable[[], int],
+    cached: bool = False,
+) -> int:
+    from contextlib import ExitStack
+
+    from .locking import default_lock_dir, file_lock, output_lock_path, single_flight
+
+    # Concurrent runs with the same input and options wait for the first one
+    # and reuse its output instead of downloading and generating again
+    lock_dir = default_lock_dir()
+    key = _flight_key(args, cached)
+    with single_flight(lock_dir, key, args.lock_timeout) as flight, ExitStack() as stack:
+        # Runs with a different input can still target the same files
+        for lock_path in sorted({output_lock_path(lock_dir, p) for p in outputs.values()}):
+            stack.enter_context(file_lock(lock_path, args.lock_timeout))
+
+        count = flight.shared_count(outputs)
+        if count is not None:
+            progress.current().message(
+                "🔁 Reused the output of a concurrent run with the same input"
+            )
+            return count
+
+        count = run()
+        flight.publish(count, outputs)
+        return count
+
+
+def main(argv: list[str] | None = None) -> int:
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] in _SUBCOMMANDS:
+        return _SUBCOMMANDS[argv[0]](list(argv[1:]))
+
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+
+    reporter = progress.create_reporter(args.progress_format)
+    with progress.reporting(reporter):
+        return _generate(args, reporter)
+
+
+def _generate(args: argparse.Namespace, reporter: progress.ProgressReporter) -> int:
+    from .emitters import (
+        SwiftEmitter,
+        SwiftTableEmitter,
+        generate_targets_from_input,
+        parse_targets,
+        target_output_paths,
+    )
+    from .pipeline import unregistered_stages
+
+    profiler = None
+    profile_failed = False
+    if args.memprofile:
+        from .memprofile import MemoryProfiler
+
+        profiler = MemoryProfiler()
+        profiler.start()
+
+    try:
+        emitters = parse_targets(args.target)
+        details_schema = _details_schema(args)
+        if details_schema is not None and any(
+            isinstance(emitter, SwiftTableEmitter) for emitter in emitters
+        ):
+            raise ValueError(
+                "--typed-details and --details-schema only apply to the swift target, "
+                "not swift-table"
+            )
+        for emitter in emitters:
+            if isinstance(emitter, SwiftEmitter):
+                emitter.dispatch_table = args.dispatch_table
+                emitter.event_strings = args.event_strings
+                emitter.details_schema = details_schema
+        output_paths = target_output_paths(emitters, Path(args.output))
+
+        input_source = _create_input_source(
+            args.input,
+            workbook=args.workbook,
+            tabs=_split_list(args.tabs),
+            project_columns=args.project_columns,
+            cell_range=args.range,
+        )
+        stages = _stage_specs(args)
+
+        def generate() -> int:
+            # Parse once, render every target
+            return generate_targets_from_input(
+                input_source,
+                emitters,
+                output_paths,
+                disambiguate=args.disambiguate,
+                memory_budget=(
+                    args.dedupe_memory_mb * 1024 * 1024
+                    if args.dedupe_memory_mb is not None
+                    else None
+                ),
+                profiler=profiler,
+                stages=stages,
+            )
+
+        outputs = dict(zip((e.name for e in emitters), output_paths))
+        cache_dir = args.cache_dir or os.environ.get(CACHE_DIR_ENV)
+
+        uncacheable = unregistered_stages(stages) if cache_dir else []
+        if uncacheable:
+            reporter.message(
+                f"📦 Cache skipped: stage {uncacheable[0]} is loaded from outside "
+                "the generator, so its code isn't part of the cache key"
+            )
+
+        def run() -> int:
+            if cache_dir and not uncacheable:
+                return _generate_cached(
+                    Path(cache_dir), args, input_source, outputs, generate
+                )
+            return generate()
+
+        count = _run_single_flight(
+            args, outputs, run, cached=bool(cache_dir) and not uncacheable
+        )
+
+    except FileNotFoundError as e:
+        reporter.error(str(e))
+        reporter.failed()
+        return 1
+    except ValueError as e:
+        reporter.error(str(e))
+        reporter.failed()
+        return 1
+    except TimeoutError as e:
+        reporter.error(str(e))
+        reporter.failed()
+        return 1
+    except Exception as e:
+        reporter.error(f"Unexpected error: {e}")
+        reporter.failed()
+        return 1
+    finally:
+        # Failed runs get a profile too; a failed write must not replace
+        # their error with an OSError
+        if profiler is not None:
+            profiler.stop()
+            try:
+                profiler.write(Path(args.memprofile))
+            except OSError as e:
+                reporter.error(f"Could not write memory profile: {e}")
+                profile_failed = True
+            else:
+                reporter.message(f"🧠 Memory profile → {args.memprofile}")
+
+    if profile_failed:
+        reporter.failed()
+        return 1
+
+    reporter.summary(count, [str(path) for path in output_paths])
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,12 +1,36 @@
 from __future__ import annotations
 
 import csv
+import itertools
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Pattern,
+    Tuple,
+)
 
-from .input_source import InputSource
+if TYPE_CHECKING:
+    from .details import DetailField
+    from .input_source import InputSource
+
+
+# Client segment of concatenated keys for the generated Swift code
+SWIFT_CLIENT = "ios"
+
+# Swift tuple type of the precomputed snake_case field strings
+_EVENT_FIELD_STRINGS_TYPE = (
+    "typealias EventFieldStrings = (screen: String, component: String, "
+    "section: String, element: String, action: String)"
+)
 
 
 @dataclass(frozen=True)
@@ -18,6 +42,9 @@ class EventRow:
     action: str
     event_details: str = ""
     advertisement: str = ""
+    # Overrides the derived function name (set by symbol disambiguation);
+    # not part of the row's identity.
+    function_name: str = field(default="", compare=False)
 
 
 def _camel_case(value: str) -> str:
@@ -32,53 +59,70 @@ def _pascal_case(value: str) -> str:
     return "".join(p.capitalize() for p in value.strip().split("_") if p)
 
 
-def _remove_cyrillic(text: str) -> str:
-    """
-    Remove Cyrillic characters and clean up the text.
+# Characters separating section variants in a cell; whitespace stands for any
+# whitespace, including newlines
+VARIANT_DELIMITERS = " ,/-"
 
-    Args:
-        text: Input text that may contain Cyrillic
+# Shorter tokens are treated as artifacts (stray letters, "or", ...)
+MIN_VARIANT_LENGTH = 3
 
-    Returns:
-        Text with Cyrillic removed and cleaned up
-    """
-    # Remove Cyrillic characters (Ukrainian, Russian, etc.)
-    text = re.sub(r'[\u0400-\u04FF]+', ' ', text)
-    # Clean up multiple spaces and hyphens
-    text = re.sub(r'\s*-\s*', ' ', text)
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
+
+# Variants are taxonomy identifiers; other tokens are notes or typos
+_SNAKE_CASE = re.compile(r"[a-z][a-z0-9_]*")
+
+
+@lru_cache(maxsize=None)
+def _variant_pattern(delimiters: str, min_length: int) -> Pattern[str]:
+    # One scan: a token is a run of characters that are neither delimiters nor
+    # Cyrillic (Ukrainian/Russian comments), at least `min_length` long
+    excluded = {"\\s" if ch.isspace() else re.escape(ch) for ch in delimiters}
+    char_class = "".join(sorted(excluded)) + "\u0400-\u04FF"
+    return re.compile(f"[^{char_class}]{{{max(min_length, 1)},}}")
 
 
-def _split_variants(text: str) -> List[str]:
+@lru_cache(maxsize=4096)
+def _variant_tokens(text: str, delimiters: str, min_length: int) -> Tuple[str, ...]:
+    variants = [
+        token
+        for token in _variant_pattern(delimiters, min_length).findall(text)
+        if _SNAKE_CASE.fullmatch(token)
+    ]
+    if variants:
+        return tuple(variants)
+
+    # No valid variants: keep the cleaned text (e.g. "|") as a single value
+    cleaned = " ".join(_variant_pattern(delimiters, 1).findall(text))
+    return (cleaned if cleaned else text,)
+
+
+def _split_variants(
+    text: str,
+    delimiters: str = VARIANT_DELIMITERS,
+    min_length: int = MIN_VARIANT_LENGTH,
+) -> List[str]:
     """
     Split text into variants if it contains multiple snake_case identifiers.
 
+    Cyrillic text and tokens that are not snake_case (notes like "(see
+    doc)") are dropped, and results are cached because the same section
+    cell is usually repeated on many rows.
+
     Examples:
         "reach_category_advertise_button" -> ["reach_category_advertise_button"]
         "reach_category_advertise_button reach_category_after_posting" ->
             ["reach_category_advertise_button", "reach_category_after_posting"]
+        "boost_photo, boost_video/boost_story" ->
+            ["boost_photo", "boost_video", "boost_story"]
 
     Args:
         text: Input text potentially containing multiple variants
+        delimiters: Characters separating variants (a space means any whitespace)
+        min_length: Minimum length of a variant
 
     Returns:
         List of variant strings
     """
-    # First, remove Cyrillic text
-    cleaned = _remove_cyrillic(text)
-
-    # Split by whitespace
-    parts = cleaned.split()
-
-    # Filter out empty strings and very short words (likely artifacts)
-    variants = [p.strip() for p in parts if p.strip() and len(p.strip()) > 2]
-
-    # If no valid variants found, return the original cleaned text
-    if not variants:
-        return [cleaned] if cleaned else [text]
-
-    return variants
+    return list(_variant_tokens(text, delimiters, min_length))
 
 
 def _process_field(
@@ -102,7 +146,80 @@ def _process_field(
     return f"Event.{field_type}.{_camel_case(value)}", None
 
 
-def _generate_function(row: EventRow) -> str:
+def _row_key(row: EventRow) -> Tuple[str, str, str, str, str, str]:
+    """
+    Identity of an event row: (screen, section, component, element, action, advertisement).
+
+    Two rows with the same key generate the same Swift function.
+    """
+    return (
+        row.screen,
+        row.section,
+        row.component,
+        row.element,
+        row.action,
+        row.advertisement,
+    )
+
+
+def _event_key(row: EventRow, client: str) -> str:
+    """
+    Concatenated taxonomy key: `client|screen|component|section|element|action`.
+
+    Parameterized (`|`) fields are written as `*`.
+    """
+    return f"{client}|{_taxonomy_key(row)}"
+
+
+def _taxonomy_key(row: EventRow) -> str:
+    """`_event_key` without the client: `screen|component|section|element|action`."""
+    fields = (row.screen, row.component, row.section, row.element, row.action)
+    return "|".join("*" if "|" in value else value.strip() for value in fields)
+
+
+def _is_parameterized(row: EventRow) -> bool:
+    """True if any of the five taxonomy fields is a `|` parameter."""
+    fields = (row.screen, row.section, row.component, row.element, row.action)
+    return any("|" in value for value in fields)
+
+
+def _function_signature(
+    row: EventRow, details_schema: Optional[Mapping[str, str]] = None
+) -> Tuple[str, List[str]]:
+    """
+    Return the generated function name and its parameter list for a row.
+
+    Args:
+        row: Event row
+        details_schema: Key types of `--typed-details` (None: untyped)
+
+    Returns:
+        Tuple of (function name, list of "name: Type" parameter strings)
+    """
+    name, params, _ = _function_parts(row, _typed_details(row, details_schema))
+    return name, params
+
+
+def _typed_details(
+    row: EventRow, details_schema: Optional[Mapping[str, str]]
+) -> Optional[Tuple[DetailField, ...]]:
+    if details_schema is None or not row.event_details.strip():
+        return None
+    from .details import parse_event_details
+
+    return parse_event_details(row.event_details, details_schema)
+
+
+def _function_parts(
+    row: EventRow, details: Optional[Tuple[DetailField, ...]] = None
+) -> Tuple[str, List[str], List[str]]:
+    """
+    Mirrors Swift `generateFunction` up to the body:
+    returns (function name, parameters, `EventDetails` initializer lines).
+
+    With typed `details` (see `details.parse_event_details`), each key is its
+    own argument instead of `parameters: [EventDetailsParameter]`.
+    """
     params: List[str] = []
 
     has_advertisement = bool(row.advertisement.strip())
@@ -116,7 +233,9 @@ def _generate_function(row: EventRow) -> str:
     action_val, action_type = _process_field(row.action, "Action", params)
 
     has_event_details_param = bool(row.event_details.strip())
-    if has_event_details_param:
+    if details:
+        params.extend(f"{field.swift_name}: {field.swift_type}" for field in details)
+    elif has_event_details_param:
         params.append("parameters: [EventDetailsParameter]")
 
     func_name_parts = [
@@ -127,9 +246,7 @@ def _generate_function(row: EventRow) -> str:
         _pascal_case(element_type or row.element),
         _pascal_case(action_type or row.action),
     ]
-    func_name = "".join(func_name_parts)
-
-    params_str = "()" if not params else f"({', '.join(params)})"
+    func_name = row.function_name or "".join(func_name_parts)
 
     event_details_lines = [
         f"screen: {screen_val}",
@@ -138,16 +255,158 @@ def _generate_function(row: EventRow) -> str:
         f"element: {element_val}",
         f"action: {action_val}",
     ]
-    if has_event_details_param:
+    if details:
+        from .details import swift_details_arguments, swift_details_struct_name
+
+        struct_name = swift_details_struct_name(func_name)
+        event_details_lines.append(
+            f"details: .typed({swift_details_arguments(struct_name, details)})"
+        )
+    elif has_event_details_param:
         event_details_lines.append("details: .defined(parameters)")
 
+    return func_name, params, event_details_lines
+
+
+def _has_constant_details(row: EventRow) -> bool:
+    """
+    True when the row's `EventDetails` is fully known at codegen time:
+    no parameterized (`|`) fields and no `event_details`.
+
+    The advertisement is passed to `EventFactory` separately, so it doesn't
+    prevent hoisting the details.
+    """
+    if row.event_details.strip():
+        return False
+    return not _is_parameterized(row)
+
+
+def _declare(declared: Dict[str, object], base: str, content: object) -> Tuple[str, bool]:
+    """
+    Name a file-level Swift declaration without redeclaring an existing one.
+
+    Overloads of one function (e.g. with and without an advertisement) derive
+    the same declaration names. A name already declared with the same
+    content is shared; otherwise `base` gets the first free numeric suffix.
+
+    Args:
+        declared: Names declared so far in the file, mapped to their content
+        base: Preferred name
+        content: Value identifying what the declaration holds
+
+    Returns:
+        Tuple of (name, True if the declaration still has to be emitted)
+    """
+    name, number = base, 1
+    while name in declared:
+        if declared[name] == content:
+            return name, False
+        number += 1
+        name = f"{base}{number}"
+    declared[name] = content
+    return name, True
+
+
+def _swift_string(value: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def _event_string_constants(
+    row: EventRow, func_name: str, declared: Optional[Dict[str, object]] = None
+) -> List[str]:
+    """
+    Static constants with the concatenated key and snake_case field strings.
+
+    Only emitted for rows without parameterized fields, whose strings are
+    fully known at codegen time. The constants are named after the function,
+    so overloads sharing `declared` get them once (from the first one).
+    """
+    if _is_parameterized(row):
+        return []
+    key_name = f"{func_name}EventKey"
+    if declared is not None:
+        if key_name in declared:
+            return []
+        declared[key_name] = func_name
+    fields = ", ".join(
+        f"{name}: {_swift_string(value.strip())}"
+        for name, value in (
+            ("screen", row.screen),
+            ("component", row.component),
+            ("section", row.section),
+            ("element", row.element),
+            ("action", row.action),
+        )
+    )
+    return [
+        f"static let {key_name}: String = "
+        f"{_swift_string(_event_key(row, SWIFT_CLIENT))}",
+        f"static let {func_name}EventFields: EventFieldStrings = ({fields})",
+        "",
+    ]
+
+
+def _generate_function(
+    row: EventRow,
+    event_strings: bool = False,
+    details_schema: Optional[Mapping[str, str]] = None,
+    declared: Optional[Dict[str, object]] = None,
+) -> str:
+    """
+    Render one tracking function with the declarations it uses.
+
+    `declared` is shared by all functions of a file (see `_declare`), so
+    overloads don't redeclare the same constants.
+    """
+    if declared is None:
+        declared = {}
+    has_advertisement = bool(row.advertisement.strip())
+    details = _typed_details(row, details_schema)
+    func_name, params, event_details_lines = _function_parts(row, details)
+
+    params_str = "()" if not params else f"({', '.join(params)})"
+
     lines: List[str] = []
-    lines.append(f"static func {func_name}{params_str} " + "{")
-    lines.append("    let eventDetails: EventDetails = EventDetails(")
-    for i, line in enumerate(event_details_lines):
-        comma = "" if i == len(event_details_lines) - 1 else ","
-        lines.append(f"        {line}{comma}")
-    lines.append("    )")
+    if event_strings:
+        lines.extend(_event_string_constants(row, func_name, declared))
+    if details:
+        from .details import (
+            render_swift_details_struct,
+            swift_details_arguments,
+            swift_details_struct_name,
+        )
+
+        # Overloads with the same keys share one struct
+        struct_name, new = _declare(declared, swift_details_struct_name(func_name), details)
+        if new:
+            lines.extend(render_swift_details_struct(struct_name, details))
+        event_details_lines[-1] = (
+            f"details: .typed({swift_details_arguments(struct_name, details)})"
+        )
+    if _has_constant_details(row):
+        # Build the constant details once instead of on every call
+        details_name, new = _declare(
+            declared, f"{func_name}Details", tuple(event_details_lines)
+        )
+        if new:
+            lines.append(
+                f"private static let {details_name}: EventDetails = EventDetails("
+            )
+            for i, line in enumerate(event_details_lines):
+                comma = "" if i == len(event_details_lines) - 1 else ","
+                lines.append(f"    {line}{comma}")
+            lines.append(")")
+            lines.append("")
+        lines.append(f"static func {func_name}{params_str} " + "{")
+        lines.append(f"    let eventDetails: EventDetails = {details_name}")
+    else:
+        lines.append(f"static func {func_name}{params_str} " + "{")
+        lines.append("    let eventDetails: EventDetails = EventDetails(")
+        for i, line in enumerate(event_details_lines):
+            comma = "" if i == len(event_details_lines) - 1 else ","
+            lines.append(f"        {line}{comma}")
+        lines.append("    )")
     if has_advertisement:
         lines.append(
             "    let event: EventModel = "
@@ -165,6 +424,52 @@ def _generate_function(row: EventRow) -> str:
     return "\n".join(lines)
 
 
+# Header names recognized by `_parse_csv_rows` (case-insensitive)
+_HEADER_COLUMNS = {
+    "screen:": "screen",
+    "component:": "component",
+    "section:": "section",
+    "element:": "element",
+    "action:": "action",
+    "event_details": "event_details",
+}
+
+# Columns read from rows without a header row (legacy positional format)
+_POSITIONAL_COLUMNS = 7
+
+
+def _is_header_row(first_row: List[str]) -> bool:
+    # A header row has at least one known column name
+    return any(col.strip().lower() in _HEADER_COLUMNS for col in first_row)
+
+
+def _header_column_map(first_row: List[str]) -> Dict[str, int]:
+    """Map field names to column indices of a header row ({} if not a header)."""
+    column_map: Dict[str, int] = {}
+    if not _is_header_row(first_row):
+        return column_map
+    for idx, col_name in enumerate(first_row):
+        col_lower = col_name.strip().lower()
+        if col_lower in _HEADER_COLUMNS:
+            column_map[_HEADER_COLUMNS[col_lower]] = idx
+        elif "advertisement" in col_lower:
+            column_map["advertisement"] = idx
+    return column_map
+
+
+def _used_columns(first_row: List[str]) -> List[int]:
+    """
+    Return the column indices `_parse_csv_rows` reads, given the first row.
+
+    Every other column (owners, comments, ...) can be left out of an export
+    without changing the parsed rows.
+    """
+    column_map = _header_column_map(first_row)
+    if column_map:
+        return sorted(set(column_map.values()))
+    return list(range(_POSITIONAL_COLUMNS))
+
+
 def _parse_csv_rows(csv_rows: List[List[str]]) -> List[EventRow]:
     """
     Parse CSV rows into EventRow objects.
@@ -179,43 +484,23 @@ def _parse_csv_rows(csv_rows: List[List[str]]) -> List[EventRow]:
     Returns:
         List of EventRow objects
     """
-    if not csv_rows:
-        return []
+    return list(_iter_csv_rows(csv_rows))
 
-    rows: List[EventRow] = []
 
-    # Check if first row is a header row by looking for column names with colons
-    first_row = csv_rows[0] if csv_rows else []
-    is_header_row = any(
-        col.strip().lower() in ["screen:", "component:", "section:", "element:", "action:", "event_details"]
-        for col in first_row
-    )
+def _iter_csv_rows(csv_rows: Iterable[List[str]]) -> Iterator[EventRow]:
+    """Parse CSV rows lazily; see `_parse_csv_rows`."""
+    raw_rows = iter(csv_rows)
+    first_row = next(raw_rows, None)
+    if first_row is None:
+        return
 
     # If header row exists, find column indices
-    column_map = {}
-    start_idx = 0
-
-    if is_header_row:
-        start_idx = 1  # Skip header row
-        for idx, col_name in enumerate(first_row):
-            col_lower = col_name.strip().lower()
-            if col_lower == "screen:":
-                column_map["screen"] = idx
-            elif col_lower == "component:":
-                column_map["component"] = idx
-            elif col_lower == "section:":
-                column_map["section"] = idx
-            elif col_lower == "element:":
-                column_map["element"] = idx
-            elif col_lower == "action:":
-                column_map["action"] = idx
-            elif col_lower == "event_details":
-                column_map["event_details"] = idx
-            elif "advertisement" in col_lower:
-                column_map["advertisement"] = idx
+    column_map = _header_column_map(first_row)
+    if not _is_header_row(first_row):
+        raw_rows = itertools.chain([first_row], raw_rows)
 
     # Process data rows
-    for raw_row in csv_rows[start_idx:]:
+    for raw_row in raw_rows:
         # Skip empty lines
         if not raw_row or all(not c.strip() for c in raw_row):
             continue
@@ -260,18 +545,37 @@ def _parse_csv_rows(csv_rows: List[List[str]]) -> List[EventRow]:
             if not section_variant:
                 continue
 
-            rows.append(
-                EventRow(
-                    screen=screen,
-                    section=section_variant,
-                    component=component,
-                    element=element,
-                    action=action,
-                    event_details=event_details,
-                    advertisement=advertisement,
-                )
+            yield EventRow(
+                screen=screen,
+                section=section_variant,
+                component=component,
+                element=element,
+                action=action,
+                event_details=event_details,
+                advertisement=advertisement,
             )
-    return rows
+
+
+def _parse_input(input_source: InputSource) -> List[EventRow]:
+    """
+    Parse every table of an input source into EventRow objects.
+
+    Each table (e.g. a workbook tab) is parsed with its own header row, and
+    rows are returned in table order.
+
+    Args:
+        input_source: InputSource (CSV file, Google Sheets or workbook)
+
+    Returns:
+        List of EventRow objects
+    """
+    return list(_iter_input(input_source))
+
+
+def _iter_input(input_source: InputSource) -> Iterator[EventRow]:
+    """Parse an input source lazily, table by table; see `_parse_input`."""
+    for _, csv_rows in input_source.iter_tables():
+        yield from _iter_csv_rows(csv_rows)
 
 
 def _parse_csv(path: Path) -> List[EventRow]:
@@ -305,20 +609,13 @@ def _deduplicate(rows: Iterable[EventRow]) -> List[EventRow]:
     If two rows share this identity:
     - If event_details is the same → keep the first, drop duplicates silently.
     - If event_details differs → keep the first, drop the rest with a warning.
-    """
-    import sys
 
+    See `external_dedupe.deduplicate_external` for inputs larger than memory.
+    """
     by_key: Dict[Tuple[str, str, str, str, str, str], EventRow] = {}
 
     for row in rows:
-        key = (
-            row.screen,
-            row.section,
-            row.component,
-            row.element,
-            row.action,
-            row.advertisement,
-        )
+        key = _row_key(row)
         existing = by_key.get(key)
         if existing is None:
             by_key[key] = row
@@ -330,19 +627,47 @@ def _deduplicate(rows: Iterable[EventRow]) -> List[EventRow]:
             continue
 
         # Conflicting definitions: keep the first, warn about the later ones
-        print(
-            "⚠️ Conflicting rows for analytics event "
-            f"(screen={row.screen}, section={row.section}, "
-            f"component={row.component}, element={row.element}, "
-            f"action={row.action}, advertisement={row.advertisement}). "
-            "Using the first definition and ignoring this row "
-            "(event_details differ).",
-            file=sys.stderr,
-        )
+        _warn_conflict(row)
 
     return list(by_key.values())
 
 
+def _warn_conflict(row: EventRow) -> None:
+    from .progress import warn
+
+    warn(
+        "conflict",
+        "⚠️ Conflicting rows for analytics event "
+        f"(screen={row.screen}, section={row.section}, "
+        f"component={row.component}, element={row.element}, "
+        f"action={row.action}, advertisement={row.advertisement}). "
+        "Using the first definition and ignoring this row "
+        "(event_details differ).",
+    )
+
+
+def _render_swift(
+    rows: List[EventRow],
+    event_strings: bool = False,
+    details_schema: Optional[Mapping[str, str]] = None,
+) -> str:
+    """
+    Render the complete Swift file for deduplicated rows.
+
+    With `event_strings`, every non-parameterized function also gets
+    precomputed concatenated key and field string constants. With a
+    `details_schema`, `event_details` keys become typed arguments (see
+    `details`).
+    """
+    lines: List[str] = ["// Auto-generated tracking functions", ""]
+    if event_strings:
+        lines.extend([_EVENT_FIELD_STRINGS_TYPE, ""])
+    declared: Dict[str, object] = {}
+    for row in rows:
+        lines.append(_generate_function(row, event_strings, details_schema, declared))
+    return "\n".join(lines) + "\n"
+
+
 def generate_swift_from_input(
     input_source: InputSource,
     output_path: Path,
@@ -361,21 +686,12 @@ def generate_swift_from_input(
         FileNotFoundError: If input source is not accessible
         ValueError: If input data is invalid
     """
-    csv_rows = input_source.get_csv_rows()
-    rows = _parse_csv_rows(csv_rows)
-    rows = _deduplicate(rows)
-
-    lines: List[str] = ["// Auto-generated tracking functions", ""]
-
-    count = 0
-    for row in rows:
-        lines.append(_generate_function(row))
-        count += 1
-
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    from .emitters import SwiftEmitter
+    from .pipeline import Pipeline, StageSpec
 
-    return count
+    # Duplicates are dropped silently apart from conflicts; names aren't checked
+    pipeline = Pipeline([StageSpec("dedupe")])
+    return pipeline.run(input_source, [SwiftEmitter()], [output_path])
 
 
 def generate_swift_from_csv(
@@ -399,19 +715,6 @@ def generate_swift_from_csv(
         FileNotFoundError: If CSV file doesn't exist
         ValueError: If CSV data is invalid
     """
-    rows = _parse_csv(input_path)
-    rows = _deduplicate(rows)
-
-    lines: List[str] = ["// Auto-generated tracking functions", ""]
-
-    count = 0
-    for row in rows:
-        lines.append(_generate_function(row))
-        count += 1
-
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    output_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
-
-    return count
-
+    from .input_source import FileInputSource
 
+    return generate_swift_from_input(FileInputSource(input_path), output_path)
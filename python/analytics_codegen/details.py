@@ -0,0 +1,183 @@
+"""
+Typed `event_details` parameters (`--typed-details`).
+
+An `event_details` cell lists the metadata keys an event carries, separated
+by commas, semicolons, newlines or spaces. A key's type comes from the cell
+(`price|float` or `price:float`) or from the details schema, which defaults
+to the `event_details` metadata key table of the taxonomy README and can be
+extended with a JSON file of key → type (`--details-schema`).
+
+When every key of a cell is typed, the Swift generator emits one typed
+argument per key and a struct holding them, instead of a
+`parameters: [EventDetailsParameter]` array built at every call site. Cells
+with a key of unknown type keep the generic `parameters` argument.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from .codegen import _camel_case, _swift_string
+
+# Metadata keys of the taxonomy README and their data types
+DEFAULT_DETAILS_SCHEMA: Dict[str, str] = {
+    "status": "string",
+    "error_body": "string",
+    "price": "float",
+    "category_id": "integer",
+    "query": "string",
+    "location": "string",
+    "mobile": "string",
+    "timestamp": "datetime",
+    "last_screen": "string",
+    "last_action": "string",
+}
+
+# Schema data type → (Swift type, expression turning `value` into a String)
+SWIFT_DETAIL_TYPES: Dict[str, Tuple[str, str]] = {
+    "string": ("String", "{value}"),
+    "integer": ("Int", "String({value})"),
+    "float": ("Double", "String({value})"),
+    "boolean": ("Bool", "String({value})"),
+    "datetime": ("Date", "EventDetailsFormat.string(from: {value})"),
+}
+
+# Conforming type of the generated details structs (see `Swift/Event.swift`)
+_DETAILS_PROTOCOL = "EventDetailsFields"
+
+# Names taken by the generated code (taxonomy arguments, function locals,
+# the struct's `parameters`) and Swift keywords; cells using them keep the
+# generic `parameters` argument
+_RESERVED_NAMES = frozenset(
+    (
+        "advertisement", "screen", "section", "component", "element", "action",
+        "event", "eventDetails", "parameters",
+        # Keywords used in declarations
+        "associatedtype", "class", "deinit", "enum", "extension", "fileprivate",
+        "func", "import", "init", "inout", "internal", "let", "open", "operator",
+        "private", "precedencegroup", "protocol", "public", "rethrows", "static",
+        "struct", "subscript", "typealias", "var",
+        # Keywords used in statements
+        "break", "case", "catch", "continue", "default", "defer", "do", "else",
+        "fallthrough", "for", "guard", "if", "in", "repeat", "return", "switch",
+        "throw", "where", "while",
+        # Keywords used in expressions and types
+        "as", "async", "await", "false", "is", "nil", "self", "super", "throws",
+        "true", "try",
+    )
+)
+
+_SEPARATORS = re.compile(r"[\s,;]+")
+_TOKEN = re.compile(r"^([a-z][a-z0-9_]*)(?:[|:]([a-z]+))?$")
+
+
+@dataclass(frozen=True)
+class DetailField:
+    """One typed `event_details` key."""
+
+    key: str
+    type: str
+
+    @property
+    def swift_name(self) -> str:
+        return _camel_case(self.key)
+
+    @property
+    def swift_type(self) -> str:
+        return SWIFT_DETAIL_TYPES[self.type][0]
+
+
+def parse_event_details(
+    cell: str, schema: Mapping[str, str] = DEFAULT_DETAILS_SCHEMA
+) -> Optional[Tuple[DetailField, ...]]:
+    """
+    Parse an `event_details` cell into typed keys.
+
+    Args:
+        cell: `event_details` cell, e.g. "price, category_id" or "user_id|string"
+        schema: Data type by key, used for keys without an explicit type
+
+    Returns:
+        Keys in cell order (repeated keys once), or None if the cell is
+        empty, a key has no known type or its name is reserved
+    """
+    fields: Dict[str, DetailField] = {}
+    for token in _SEPARATORS.split(cell.strip().lower()):
+        if not token:
+            continue
+        match = _TOKEN.match(token)
+        if match is None:
+            return None
+        key, data_type = match.group(1), match.group(2) or schema.get(match.group(1))
+        if data_type not in SWIFT_DETAIL_TYPES or _camel_case(key) in _RESERVED_NAMES:
+            return None
+        fields.setdefault(key, DetailField(key, data_type))
+    return tuple(fields.values()) or None
+
+
+def load_details_schema(path: Path) -> Dict[str, str]:
+    """
+    Load a JSON object of key → data type on top of the default schema.
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        ValueError: If the file is not a valid schema
+    """
+    if not path.is_file():
+        raise FileNotFoundError(f"Details schema not found: {path}")
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid details schema {path}: {e}") from e
+    if not isinstance(data, dict):
+        raise ValueError(f"Details schema {path} must be a JSON object of key → type")
+
+    schema = dict(DEFAULT_DETAILS_SCHEMA)
+    for key, data_type in data.items():
+        if data_type not in SWIFT_DETAIL_TYPES:
+            raise ValueError(
+                f"Unknown type {data_type!r} for details key '{key}' in {path} "
+                f"(expected one of: {', '.join(SWIFT_DETAIL_TYPES)})"
+            )
+        schema[key] = data_type
+    return schema
+
+
+def swift_details_struct_name(func_name: str) -> str:
+    return f"{func_name[0].upper()}{func_name[1:]}Details"
+
+
+def render_swift_details_struct(struct_name: str, fields: Tuple[DetailField, ...]) -> List[str]:
+    """
+    Lines of the details struct of a tracking function.
+
+    Stored properties replace the `[EventDetailsParameter]` array at the
+    call site; the array is only built from them when the event is sent.
+    """
+    lines = [f"struct {struct_name}: {_DETAILS_PROTOCOL} {{"]
+    for field in fields:
+        lines.append(f"    let {field.swift_name}: {field.swift_type}")
+    lines.append("")
+    lines.append("    var parameters: [EventDetailsParameter] {")
+    lines.append("        return [")
+    for field in fields:
+        value = SWIFT_DETAIL_TYPES[field.type][1].format(value=field.swift_name)
+        lines.append(
+            f"            EventDetailsParameter(key: {_swift_string(field.key)}, value: {value}),"
+        )
+    lines.append("        ]")
+    lines.append("    }")
+    lines.append("}")
+    lines.append("")
+    return lines
+
+
+def swift_details_arguments(struct_name: str, fields: Tuple[DetailField, ...]) -> str:
+    """Initializer call building the details struct from the function's arguments."""
+    args = ", ".join(f"{f.swift_name}: {f.swift_name}" for f in fields)
+    return f"{struct_name}({args})"
+
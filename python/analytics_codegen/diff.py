@@ -0,0 +1,187 @@
+"""
+Taxonomy diff between two versions of the analytics event definitions.
+
+Rows are keyed by the same identity tuple `_deduplicate` uses, so the diff
+reflects exactly which generated tracking functions appear, disappear or
+change signature.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from .codegen import EventRow, _function_signature, _row_key
+
+SNAPSHOT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class EventChange:
+    """An event whose identity is unchanged but whose definition differs."""
+
+    old: EventRow
+    new: EventRow
+
+
+@dataclass
+class TaxonomyDiff:
+    """Added, removed and changed events between two row sets."""
+
+    added: List[EventRow] = field(default_factory=list)
+    removed: List[EventRow] = field(default_factory=list)
+    changed: List[EventChange] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+
+def diff_rows(old_rows: List[EventRow], new_rows: List[EventRow]) -> TaxonomyDiff:
+    """
+    Compute the diff between two deduplicated row sets with a hash join.
+
+    Runs in O(len(old_rows) + len(new_rows)). Added and changed events are
+    reported in `new_rows` order, removed events in `old_rows` order.
+
+    Args:
+        old_rows: Rows of the previous version
+        new_rows: Rows of the new version
+
+    Returns:
+        TaxonomyDiff
+    """
+    remaining: Dict[Tuple[str, str, str, str, str, str], EventRow] = {}
+    for row in old_rows:
+        remaining.setdefault(_row_key(row), row)
+
+    result = TaxonomyDiff()
+    seen = set()
+    for row in new_rows:
+        key = _row_key(row)
+        if key in seen:
+            continue
+        seen.add(key)
+
+        old = remaining.pop(key, None)
+        if old is None:
+            result.added.append(row)
+        elif old.event_details != row.event_details:
+            result.changed.append(EventChange(old=old, new=row))
+
+    result.removed.extend(remaining.values())
+    return result
+
+
+def write_snapshot(rows: List[EventRow], path: Path) -> None:
+    """
+    Save rows as a JSON snapshot that can later be used as a diff input.
+
+    Args:
+        rows: Rows to save (normally deduplicated)
+        path: Snapshot file path
+    """
+    payload = {
+        "version": SNAPSHOT_VERSION,
+        "rows": [asdict(row) for row in rows],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps(payload, ensure_ascii=False, indent=2) + "\n",
+        encoding="utf-8",
+    )
+
+
+def load_snapshot(path: Path) -> List[EventRow]:
+    """
+    Load rows from a JSON snapshot written by `write_snapshot`.
+
+    Args:
+        path: Snapshot file path
+
+    Returns:
+        List of EventRow objects
+
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        ValueError: If the file is not a valid snapshot
+    """
+    if not path.is_file():
+        raise FileNotFoundError(f"Snapshot file not found: {path}")
+
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid snapshot file: {path}\nDetails: {e}") from e
+
+    if not isinstance(payload, dict) or payload.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(
+            f"Unsupported snapshot file: {path}\n"
+            f"Expected a version {SNAPSHOT_VERSION} snapshot."
+        )
+
+    try:
+        return [EventRow(**item) for item in payload.get("rows", [])]
+    except TypeError as e:
+        raise ValueError(f"Invalid snapshot row in {path}\nDetails: {e}") from e
+
+
+def _describe(row: EventRow) -> Dict[str, object]:
+    func_name, params = _function_signature(row)
+    data: Dict[str, object] = asdict(row)
+    data["function"] = func_name
+    data["parameters"] = params
+    return data
+
+
+def _signature_text(row: EventRow) -> str:
+    func_name, params = _function_signature(row)
+    return f"{func_name}({', '.join(params)})"
+
+
+def format_diff_json(result: TaxonomyDiff) -> str:
+    """Render a diff as a JSON document."""
+    payload = {
+        "added": [_describe(row) for row in result.added],
+        "removed": [_describe(row) for row in result.removed],
+        "changed": [
+            {
+                "function": _function_signature(change.new)[0],
+                "old": _describe(change.old),
+                "new": _describe(change.new),
+            }
+            for change in result.changed
+        ],
+        "summary": {
+            "added": len(result.added),
+            "removed": len(result.removed),
+            "changed": len(result.changed),
+        },
+    }
+    return json.dumps(payload, ensure_ascii=False, indent=2)
+
+
+def format_diff_text(result: TaxonomyDiff) -> str:
+    """Render a diff in a human-readable, line-oriented form."""
+    lines: List[str] = []
+    for row in result.added:
+        lines.append(f"+ {_signature_text(row)}")
+    for row in result.removed:
+        lines.append(f"- {_signature_text(row)}")
+    for change in result.changed:
+        old_sig = _signature_text(change.old)
+        new_sig = _signature_text(change.new)
+        if old_sig != new_sig:
+            lines.append(f"~ {old_sig} -> {new_sig}")
+        else:
+            lines.append(
+                f"~ {new_sig}: event_details "
+                f"{change.old.event_details!r} -> {change.new.event_details!r}"
+            )
+    lines.append(
+        f"{len(result.added)} added, {len(result.removed)} removed, "
+        f"{len(result.changed)} changed"
+    )
+    return "\n".join(lines)
@@ -0,0 +1,220 @@
+"""
+Dispatch table from concatenated event keys to tracking events.
+
+Builds a minimal perfect hash over the `client|screen|component|section|element|action`
+keys at codegen time and emits it as static Swift arrays, so the app can track
+an event from a remote-config key in O(1) without parsing the string.
+
+The hash is 32-bit FNV-1a over the key's UTF-8 bytes, with the seed XORed
+into the offset basis; the Swift side reproduces it byte for byte.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+from .codegen import (
+    SWIFT_CLIENT,
+    EventRow,
+    _camel_case,
+    _event_key,
+    _is_parameterized,
+    _swift_string,
+)
+
+_FNV_OFFSET_BASIS = 0x811C9DC5
+_FNV_PRIME = 0x01000193
+
+# Upper bound on seeds tried per bucket before giving up
+_MAX_SEED = 1 << 24
+
+
+def fnv1a(data: bytes, seed: int = 0) -> int:
+    """32-bit FNV-1a hash of `data` with `seed` mixed into the offset basis."""
+    h = _FNV_OFFSET_BASIS ^ seed
+    for byte in data:
+        h = ((h ^ byte) * _FNV_PRIME) & 0xFFFFFFFF
+    return h
+
+
+@dataclass(frozen=True)
+class PerfectHash:
+    """
+    Minimal perfect hash ("hash and displace") over a fixed key set.
+
+    A key's bucket is `fnv1a(key) % len(seeds)`; its slot is
+    `fnv1a(key, seeds[bucket]) % len(keys)`. `keys` is in slot order.
+    """
+
+    seeds: List[int]
+    keys: List[str]
+
+    def slot(self, key: str) -> Optional[int]:
+        """Return the slot of `key`, or None if it is not in the key set."""
+        if not self.keys:
+            return None
+        data = key.encode("utf-8")
+        seed = self.seeds[fnv1a(data) % len(self.seeds)]
+        index = fnv1a(data, seed) % len(self.keys)
+        return index if self.keys[index] == key else None
+
+
+def build_perfect_hash(keys: Sequence[str]) -> PerfectHash:
+    """
+    Build a minimal perfect hash for distinct keys.
+
+    Buckets are placed largest first, each with the smallest seed that maps
+    all of its keys to free slots.
+
+    Args:
+        keys: Distinct keys
+
+    Returns:
+        PerfectHash with one slot per key
+
+    Raises:
+        ValueError: If keys are not distinct or no seed can be found
+    """
+    n = len(keys)
+    if len(set(keys)) != n:
+        raise ValueError("Dispatch keys must be distinct")
+    if n == 0:
+        return PerfectHash(seeds=[0], keys=[])
+
+    encoded = [key.encode("utf-8") for key in keys]
+    buckets: List[List[int]] = [[] for _ in range(n)]
+    for i, data in enumerate(encoded):
+        buckets[fnv1a(data) % n].append(i)
+
+    seeds = [0] * n
+    slots: List[Optional[int]] = [None] * n
+    for bucket_index in sorted(range(n), key=lambda b: len(buckets[b]), reverse=True):
+        members = buckets[bucket_index]
+        if not members:
+            break
+        seed = 1
+        while True:
+            positions = [fnv1a(encoded[i], seed) % n for i in members]
+            if len(set(positions)) == len(positions) and all(
+                slots[p] is None for p in positions
+            ):
+                break
+            seed += 1
+            if seed > _MAX_SEED:
+                raise ValueError("Unable to build a perfect hash for dispatch keys")
+        seeds[bucket_index] = seed
+        for i, position in zip(members, positions):
+            slots[position] = i
+
+    return PerfectHash(seeds=seeds, keys=[keys[i] for i in slots])  # type: ignore[index]
+
+
+def dispatch_rows(rows: List[EventRow], client: str = SWIFT_CLIENT) -> Dict[str, EventRow]:
+    """
+    Map concatenated keys to rows.
+
+    Parameterized rows have no fixed key and are skipped. Rows differing only
+    by advertisement share a key; the first one wins.
+    """
+    result: Dict[str, EventRow] = {}
+    for row in rows:
+        if _is_parameterized(row):
+            continue
+        result.setdefault(_event_key(row, client), row)
+    return result
+
+
+def render_swift_dispatch_table(rows: List[EventRow], client: str = SWIFT_CLIENT) -> str:
+    """
+    Render the Swift dispatch table and `trackEvent(forKey:)`.
+
+    Args:
+        rows: Deduplicated event rows
+        client: Client segment of the keys
+
+    Returns:
+        Swift source to append to the generated tracking functions
+    """
+    by_key = dispatch_rows(rows, client)
+    table = build_perfect_hash(list(by_key))
+
+    lines: List[str] = ["// MARK: - Dispatch by concatenated event key", ""]
+    lines.append(
+        "private static let dispatchSeeds: [UInt32] = ["
+        + ", ".join(str(seed) for seed in table.seeds)
+        + "]"
+    )
+    lines.append("")
+    lines.append("private static let dispatchKeys: [String] = [")
+    for key in table.keys:
+        lines.append(f"    {_swift_string(key)},")
+    lines.append("]")
+    lines.append("")
+    lines.append(
+        "private static let dispatchEvents: [(screen: Event.Screen, "
+        "section: Event.Section, component: Event.Component, "
+        "element: Event.Element, action: Event.Action)] = ["
+    )
+    for key in table.keys:
+        row = by_key[key]
+        values = (row.screen, row.section, row.component, row.element, row.action)
+        lines.append(
+            "    (" + ", ".join(f".{_camel_case(value.strip())}" for value in values) + "),"
+        )
+    lines.append("]")
+    lines.append("")
+    lines.append("private static func dispatchHash(_ key: String, seed: UInt32) -> UInt32 {")
+    lines.append(f"    var hash: UInt32 = 0x{_FNV_OFFSET_BASIS:08X} ^ seed")
+    lines.append("    for byte in key.utf8 {")
+    lines.append(f"        hash = (hash ^ UInt32(byte)) &* 0x{_FNV_PRIME:08X}")
+    lines.append("    }")
+    lines.append("    return hash")
+    lines.append("}")
+    lines.append("")
+    lines.append("private static func dispatchSlot(forKey key: String) -> Int? {")
+    lines.append("    guard !dispatchKeys.isEmpty else { return nil }")
+    lines.append(
+        "    let bucket = Int(dispatchHash(key, seed: 0) % UInt32(dispatchSeeds.count))"
+    )
+    lines.append(
+        "    let slot = Int(dispatchHash(key, seed: dispatchSeeds[bucket]) "
+        "% UInt32(dispatchKeys.count))"
+    )
+    lines.append("    return dispatchKeys[slot] == key ? slot : nil")
+    lines.append("}")
+    lines.append("")
+    lines.append(
+        f"/// Tracks the event for a `{client}|screen|component|section|element|action` key."
+    )
+    lines.append("/// Returns false if the key is not defined.")
+    lines.append("@discardableResult")
+    lines.append(
+        "static func trackEvent(forKey key: String, "
+        "advertisement: EventAdvertisementProtocol? = nil, "
+        "parameters: [EventDetailsParameter]? = nil) -> Bool {"
+    )
+    lines.append("    guard let slot = dispatchSlot(forKey: key) else { return false }")
+    lines.append("    let descriptor = dispatchEvents[slot]")
+    lines.append("    let eventDetails: EventDetails")
+    fields = ("screen", "section", "component", "element", "action")
+    for branch in ("if let parameters = parameters {", "} else {"):
+        lines.append(f"    {branch}")
+        lines.append("        eventDetails = EventDetails(")
+        with_details = branch.startswith("if")
+        for i, name in enumerate(fields):
+            comma = "," if i < len(fields) - 1 or with_details else ""
+            lines.append(f"            {name}: descriptor.{name}{comma}")
+        if with_details:
+            lines.append("            details: .defined(parameters)")
+        lines.append("        )")
+    lines.append("    }")
+    lines.append(
+        "    let event: EventModel = "
+        "EventFactory.event(for: advertisement, with: eventDetails)"
+    )
+    lines.append("    trackEvent(event: event)")
+    lines.append("    return true")
+    lines.append("}")
+    lines.append("")
+    return "\n".join(lines)
@@ -0,0 +1,468 @@
+"""
+Target-language emitters sharing one parse pass.
+
+The input is fetched, parsed and deduplicated once (see `pipeline`); every
+requested target (Swift, Kotlin, TypeScript) then renders from the same list
+of `EventRow`s.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Mapping, Optional, Sequence, Tuple, Type
+
+from .codegen import (
+    _EVENT_FIELD_STRINGS_TYPE,
+    EventRow,
+    _camel_case,
+    _event_string_constants,
+    _function_signature,
+    _render_swift,
+)
+
+if TYPE_CHECKING:
+    from .input_source import InputSource
+    from .memprofile import MemoryProfiler
+    from .pipeline import StageSpec
+
+# Field order of the generated EventDetails initializer
+_FIELD_TYPES: Tuple[str, ...] = ("Screen", "Section", "Component", "Element", "Action")
+
+# Below this many rows, rendering targets in worker processes costs more
+# than it saves (process start-up plus pickling the rows).
+_PARALLEL_MIN_ROWS = 2000
+
+
+@dataclass(frozen=True)
+class FunctionSpec:
+    """Target-neutral description of one generated tracking function."""
+
+    name: str
+    has_advertisement: bool
+    # (field type, value, is_parameter) in `_FIELD_TYPES` order
+    fields: Tuple[Tuple[str, str, bool], ...]
+    has_event_details: bool
+
+
+def function_spec(row: EventRow) -> FunctionSpec:
+    """
+    Describe the tracking function generated for a row.
+
+    Uses the same naming and parameterization rules as the Swift generator.
+    """
+    func_name, _ = _function_signature(row)
+    values = (row.screen, row.section, row.component, row.element, row.action)
+    fields = tuple(
+        (field_type, value.strip(), "|" in value)
+        for field_type, value in zip(_FIELD_TYPES, values)
+    )
+    return FunctionSpec(
+        name=func_name,
+        has_advertisement=bool(row.advertisement.strip()),
+        fields=fields,
+        has_event_details=bool(row.event_details.strip()),
+    )
+
+
+class Emitter(ABC):
+    """Abstract base class for target-language code emitters."""
+
+    #: Target name used on the command line (`--target`)
+    name: str = ""
+    #: File extension of the generated source file
+    file_extension: str = ""
+
+    @abstractmethod
+    def render(self, rows: List[EventRow]) -> str:
+        """
+        Render the complete generated source file.
+
+        Args:
+            rows: Deduplicated event rows
+
+        Returns:
+            File contents
+        """
+        pass
+
+
+class SwiftEmitter(Emitter):
+    """Emits Swift `static func` tracking functions."""
+
+    name = "swift"
+    file_extension = ".swift"
+
+    def __init__(
+        self,
+        dispatch_table: bool = False,
+        event_strings: bool = False,
+        details_schema: Optional[Mapping[str, str]] = None,
+    ):
+        """
+        Initialize Swift emitter.
+
+        Args:
+            dispatch_table: Also emit `trackEvent(forKey:)` with a static
+                lookup table from concatenated event keys
+            event_strings: Also emit precomputed concatenated key and
+                snake_case field string constants per function
+            details_schema: Emit typed `event_details` arguments and a
+                details struct per function, typing keys with this schema
+                (see `details`)
+        """
+        self.dispatch_table = dispatch_table
+        self.event_strings = event_strings
+        self.details_schema = details_schema
+
+    def _render_functions(self, rows: List[EventRow]) -> str:
+        return _render_swift(rows, self.event_strings, self.details_schema)
+
+    def render(self, rows: List[EventRow]) -> str:
+        content = self._render_functions(rows)
+        if self.dispatch_table:
+            from .dispatch import render_swift_dispatch_table
+
+            content += "\n" + render_swift_dispatch_table(rows)
+        return content
+
+
+class SwiftTableEmitter(SwiftEmitter):
+    """
+    Emits a table-driven Swift variant of the tracking functions.
+
+    All events are stored once in a static descriptor table indexed by a
+    generated integer ID, and each public `track...` function is a one-line
+    wrapper into a single shared implementation. The public API is the same
+    as `SwiftEmitter`'s, while the generated code (and the compile work for
+    thousands of rows) is a fraction of the size.
+    """
+
+    name = "swift-table"
+    file_extension = ".swift"
+
+    def _descriptor(self, spec: FunctionSpec) -> str:
+        values = [
+            "nil" if is_param else f".{_camel_case(value)}"
+            for _, value, is_param in spec.fields
+        ]
+        return f"({', '.join(values)})"
+
+    def _wrapper(self, event_id: int, spec: FunctionSpec) -> str:
+        params: List[str] = []
+        args: List[str] = [str(event_id)]
+        if spec.has_advertisement:
+            params.append("advertisement: EventAdvertisementProtocol")
+            args.append("advertisement: advertisement")
+        for field_type, _, is_param in spec.fields:
+            if is_param:
+                arg = field_type.lower()
+                params.append(f"{arg}: Event.{field_type}")
+                args.append(f"{arg}: {arg}")
+        if spec.has_event_details:
+            params.append("parameters: [EventDetailsParameter]")
+            args.append("parameters: parameters")
+        return (
+            f"static func {spec.name}({', '.join(params)}) "
+            f"{{ trackDescriptor({', '.join(args)}) }}"
+        )
+
+    def _render_functions(self, rows: List[EventRow]) -> str:
+        specs = [function_spec(row) for row in rows]
+        field_args = [field_type.lower() for field_type in _FIELD_TYPES]
+
+        lines: List[str] = ["// Auto-generated tracking functions", ""]
+        lines.append(
+            "private typealias EventDescriptor = ("
+            + ", ".join(
+                f"{arg}: Event.{field_type}?"
+                for arg, field_type in zip(field_args, _FIELD_TYPES)
+            )
+            + ")"
+        )
+        lines.append("")
+        lines.append("private static let eventDescriptors: [EventDescriptor] = [")
+        for event_id, spec in enumerate(specs):
+            lines.append(f"    /* {event_id} */ {self._descriptor(spec)},")
+        lines.append("]")
+        lines.append("")
+        lines.append("private static func trackDescriptor(")
+        lines.append("    _ id: Int,")
+        lines.append("    advertisement: EventAdvertisementProtocol? = nil,")
+        for arg, field_type in zip(field_args, _FIELD_TYPES):
+            lines.append(f"    {arg}: Event.{field_type}? = nil,")
+        lines.append("    parameters: [EventDetailsParameter]? = nil")
+        lines.append(") {")
+        lines.append("    let descriptor: EventDescriptor = eventDescriptors[id]")
+        lines.append("    let eventDetails: EventDetails")
+        for branch in ("if let parameters = parameters {", "} else {"):
+            lines.append(f"    {branch}")
+            lines.append("        eventDetails = EventDetails(")
+            for i, arg in enumerate(field_args):
+                comma = "," if i < len(field_args) - 1 or branch.startswith("if") else ""
+                lines.append(f"            {arg}: {arg} ?? descriptor.{arg}!{comma}")
+            if branch.startswith("if"):
+                lines.append("            details: .defined(parameters)")
+            lines.append("        )")
+        lines.append("    }")
+        lines.append(
+            "    let event: EventModel = "
+            "EventFactory.event(for: advertisement, with: eventDetails)"
+        )
+        lines.append("    trackEvent(event: event)")
+        lines.append("}")
+        lines.append("")
+        for event_id, spec in enumerate(specs):
+            lines.append(self._wrapper(event_id, spec))
+        if self.event_strings:
+            lines.extend(["", _EVENT_FIELD_STRINGS_TYPE, ""])
+            declared: Dict[str, object] = {}
+            for row, spec in zip(rows, specs):
+                lines.extend(_event_string_constants(row, spec.name, declared))
+        return "\n".join(lines) + "\n"
+
+
+class KotlinEmitter(Emitter):
+    """Emits Kotlin top-level tracking functions."""
+
+    name = "kotlin"
+    file_extension = ".kt"
+
+    def _function(self, spec: FunctionSpec) -> str:
+        params: List[str] = []
+        if spec.has_advertisement:
+            params.append("advertisement: EventAdvertisement")
+
+        details: List[str] = []
+        for field_type, value, is_param in spec.fields:
+            arg = field_type.lower()
+            if is_param:
+                params.append(f"{arg}: Event.{field_type}")
+                details.append(f"{arg} = {arg}")
+            else:
+                details.append(f"{arg} = Event.{field_type}.{value.upper()}")
+
+        if spec.has_event_details:
+            params.append("parameters: List<EventDetailsParameter>")
+            details.append("details = EventDetailsValue.Defined(parameters)")
+
+        lines: List[str] = [f"fun {spec.name}({', '.join(params)}) {{"]
+        lines.append("    val eventDetails = EventDetails(")
+        for i, line in enumerate(details):
+            comma = "" if i == len(details) - 1 else ","
+            lines.append(f"        {line}{comma}")
+        lines.append("    )")
+        if spec.has_advertisement:
+            lines.append(
+                "    val event = EventFactory.event(advertisement = advertisement, "
+                "eventDetails = eventDetails)"
+            )
+        else:
+            lines.append("    val event = EventFactory.event(eventDetails = eventDetails)")
+        lines.append("    trackEvent(event)")
+        lines.append("}")
+        lines.append("")
+        return "\n".join(lines)
+
+    def render(self, rows: List[EventRow]) -> str:
+        lines: List[str] = ["// Auto-generated tracking functions", ""]
+        for row in rows:
+            lines.append(self._function(function_spec(row)))
+        return "\n".join(lines) + "\n"
+
+
+class TypeScriptEmitter(Emitter):
+    """Emits exported TypeScript tracking functions."""
+
+    name = "ts"
+    file_extension = ".ts"
+
+    def _function(self, spec: FunctionSpec) -> str:
+        params: List[str] = []
+        if spec.has_advertisement:
+            params.append("advertisement: EventAdvertisement")
+
+        details: List[str] = []
+        for field_type, value, is_param in spec.fields:
+            arg = field_type.lower()
+            if is_param:
+                params.append(f"{arg}: Event.{field_type}")
+                details.append(arg)
+            else:
+                details.append(f"{arg}: Event.{field_type}.{_camel_case(value)}")
+
+        if spec.has_event_details:
+            params.append("parameters: EventDetailsParameter[]")
+            details.append('details: { kind: "defined", parameters }')
+
+        lines: List[str] = [
+            f"export function {spec.name}({', '.join(params)}): void {{"
+        ]
+        lines.append("  const eventDetails: EventDetails = {")
+        for line in details:
+            lines.append(f"    {line},")
+        lines.append("  };")
+        if spec.has_advertisement:
+            lines.append(
+                "  const event: EventModel = "
+                "EventFactory.event(eventDetails, advertisement);"
+            )
+        else:
+            lines.append("  const event: EventModel = EventFactory.event(eventDetails);")
+        lines.append("  trackEvent(event);")
+        lines.append("}")
+        lines.append("")
+        return "\n".join(lines)
+
+    def render(self, rows: List[EventRow]) -> str:
+        lines: List[str] = ["// Auto-generated tracking functions", ""]
+        for row in rows:
+            lines.append(self._function(function_spec(row)))
+        return "\n".join(lines) + "\n"
+
+
+class CatalogEmitter(Emitter):
+    """Emits the compiled event catalog for server-side validation (see `catalog`)."""
+
+    name = "catalog"
+    file_extension = ".json"
+
+    def render(self, rows: List[EventRow]) -> str:
+        from .catalog import render_catalog
+
+        return render_catalog(rows)
+
+
+EMITTERS: Dict[str, Type[Emitter]] = {
+    SwiftEmitter.name: SwiftEmitter,
+    SwiftTableEmitter.name: SwiftTableEmitter,
+    KotlinEmitter.name: KotlinEmitter,
+    TypeScriptEmitter.name: TypeScriptEmitter,
+    CatalogEmitter.name: CatalogEmitter,
+}
+
+
+def parse_targets(value: str) -> List[Emitter]:
+    """
+    Parse a comma-separated target list such as "swift,kotlin,ts".
+
+    Raises:
+        ValueError: If a target is unknown or the list is empty
+    """
+    names = [name.strip().lower() for name in value.split(",") if name.strip()]
+    if not names:
+        raise ValueError("No output targets specified")
+
+    emitters: List[Emitter] = []
+    for name in dict.fromkeys(names):
+        emitter_cls = EMITTERS.get(name)
+        if emitter_cls is None:
+            raise ValueError(
+                f"Unknown target: {name}\n"
+                f"Supported targets: {', '.join(EMITTERS)}"
+            )
+        emitters.append(emitter_cls())
+    return emitters
+
+
+def target_output_paths(emitters: Sequence[Emitter], output_path: Path) -> List[Path]:
+    """
+    Return the output file of each target.
+
+    A single target writes to `output_path` as given; with several targets
+    each one gets `output_path` with its own file extension.
+
+    Raises:
+        ValueError: If two targets would write the same file
+    """
+    if len(emitters) == 1:
+        return [output_path]
+
+    paths: List[Path] = []
+    for emitter in emitters:
+        path = output_path.with_suffix(emitter.file_extension)
+        if path in paths:
+            raise ValueError(
+                f"Targets {', '.join(e.name for e in emitters)} would write "
+                f"the same file: {path}"
+            )
+        paths.append(path)
+    return paths
+
+
+def _render(emitter: Emitter, rows: List[EventRow]) -> str:
+    return emitter.render(rows)
+
+
+def render_targets(emitters: Sequence[Emitter], rows: List[EventRow]) -> List[str]:
+    """
+    Render every target from the same rows.
+
+    Large inputs with several targets are rendered in worker processes.
+    """
+    if len(emitters) < 2 or len(rows) < _PARALLEL_MIN_ROWS:
+        return [emitter.render(rows) for emitter in emitters]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=len(emitters)) as executor:
+        futures = [executor.submit(_render, emitter, rows) for emitter in emitters]
+        return [future.result() for future in futures]
+
+
+def generate_targets_from_input(
+    input_source: InputSource,
+    emitters: Sequence[Emitter],
+    output_paths: Sequence[Path],
+    disambiguate: bool = False,
+    memory_budget: Optional[int] = None,
+    profiler: Optional[MemoryProfiler] = None,
+    stages: Sequence[StageSpec] = (),
+) -> int:
+    """
+    Load analytics events once and write tracking functions for every target.
+
+    Function name collisions are reported on stderr, or resolved when
+    `disambiguate` is set (see `symbols.disambiguate_rows`); typed Swift
+    details (`SwiftEmitter.details_schema`) are part of the signatures.
+
+    Args:
+        input_source: InputSource (CSV file or Google Sheets)
+        emitters: Target emitters
+        output_paths: Output file for each emitter
+        disambiguate: Rename colliding functions instead of only warning
+        memory_budget: Deduplicate on disk, holding about this many bytes of
+            rows in memory (default: deduplicate in memory)
+        profiler: Record the memory used by each stage (see `memprofile`)
+        stages: Custom row stages, run before the built-in ones
+            (see `pipeline.default_stages`)
+
+    Returns:
+        Number of functions generated per target
+
+    Raises:
+        FileNotFoundError: If input source is not accessible
+        ValueError: If input data is invalid
+    """
+    from .pipeline import Pipeline, default_stages
+
+    # Typed details change Swift signatures, and so the name collisions
+    details_schema = next(
+        (
+            emitter.details_schema
+            for emitter in emitters
+            if isinstance(emitter, SwiftEmitter) and emitter.details_schema is not None
+        ),
+        None,
+    )
+    pipeline = Pipeline(
+        default_stages(
+            stages,
+            disambiguate=disambiguate,
+            memory_budget=memory_budget,
+            details_schema=details_schema,
+        ),
+        profiler=profiler,
+    )
+    return pipeline.run(input_source, emitters, output_paths)
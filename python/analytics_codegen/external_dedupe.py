@@ -0,0 +1,223 @@
+"""
+Spill-to-disk deduplication for inputs larger than memory.
+
+Gives the same result as `codegen._deduplicate` (the first row of every
+identity wins, later rows with different `event_details` are reported, and
+output is in first-occurrence order) while holding only about
+`memory_budget` bytes of rows at a time:
+
+1. Rows are numbered in input order and buffered up to the budget. If the
+   whole input fits, the in-memory `_deduplicate` is used as is.
+2. Otherwise rows are partitioned by a hash of their identity into temporary
+   CSV runs, so all copies of an identity land in the same run.
+3. Each run is deduplicated on its own; a run still over budget is split
+   again with a different hash salt.
+4. The survivors of all runs are merged by input number, and conflict
+   warnings are printed in input order. At most `_MERGE_FAN_IN` runs are
+   open at once; more runs are first merged in batches into larger runs.
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import heapq
+import itertools
+import tempfile
+from dataclasses import fields
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .codegen import EventRow, _deduplicate, _row_key, _warn_conflict
+
+# Runs written per partitioning pass
+_DEFAULT_PARTITIONS = 64
+
+# Partitioning passes before a run is deduplicated in memory regardless of size
+_MAX_DEPTH = 4
+
+# Runs read at once by a merge, well below common open file limits
+_MERGE_FAN_IN = 32
+
+# Approximate in-memory cost of an EventRow and its dict entry, excluding text
+_ROW_OVERHEAD = 600
+
+_ROW_FIELDS = tuple(f.name for f in fields(EventRow))
+
+NumberedRow = Tuple[int, EventRow]
+
+
+def _row_size(row: EventRow) -> int:
+    return _ROW_OVERHEAD + sum(len(getattr(row, name)) for name in _ROW_FIELDS)
+
+
+def _to_record(seq: int, row: EventRow) -> List[str]:
+    return [str(seq)] + [getattr(row, name) for name in _ROW_FIELDS]
+
+
+def _from_record(record: List[str]) -> NumberedRow:
+    return int(record[0]), EventRow(**dict(zip(_ROW_FIELDS, record[1:])))
+
+
+class _SpillDirectory:
+    """Temporary run files, named uniquely within one deduplication."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self._counter = itertools.count()
+
+    def new_path(self, kind: str) -> Path:
+        return self.root / f"{kind}-{next(self._counter)}.csv"
+
+    def write(self, kind: str, rows: Iterable[NumberedRow]) -> Path:
+        path = self.new_path(kind)
+        with path.open("w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            for seq, row in rows:
+                writer.writerow(_to_record(seq, row))
+        return path
+
+    @staticmethod
+    def read(path: Path) -> Iterator[NumberedRow]:
+        with path.open("r", encoding="utf-8", newline="") as f:
+            for record in csv.reader(f):
+                yield _from_record(record)
+
+
+def _bucket(row: EventRow, partitions: int, salt: int) -> int:
+    key = "\0".join(_row_key(row)).encode("utf-8")
+    digest = hashlib.blake2b(key, digest_size=8, salt=salt.to_bytes(16, "little"))
+    return int.from_bytes(digest.digest(), "little") % partitions
+
+
+def _partition(
+    rows: Iterable[NumberedRow],
+    spill: _SpillDirectory,
+    partitions: int,
+    salt: int,
+) -> List[Tuple[Path, int]]:
+    """Split rows into runs by identity hash; return (run, estimated size)."""
+    paths = [spill.new_path("run") for _ in range(partitions)]
+    sizes = [0] * partitions
+    files = [path.open("w", encoding="utf-8", newline="") for path in paths]
+    try:
+        writers = [csv.writer(f) for f in files]
+        for seq, row in rows:
+            index = _bucket(row, partitions, salt)
+            writers[index].writerow(_to_record(seq, row))
+            sizes[index] += _row_size(row)
+    finally:
+        for f in files:
+            f.close()
+    return list(zip(paths, sizes))
+
+
+def _dedupe_run(
+    path: Path,
+    size: int,
+    spill: _SpillDirectory,
+    memory_budget: int,
+    partitions: int,
+    depth: int,
+    survivors: List[Path],
+    conflicts: List[Path],
+) -> None:
+    if size > memory_budget and depth < _MAX_DEPTH:
+        runs = _partition(spill.read(path), spill, partitions, salt=depth + 1)
+        path.unlink()
+        for run, run_size in runs:
+            _dedupe_run(
+                run, run_size, spill, memory_budget, partitions, depth + 1,
+                survivors, conflicts,
+            )
+        return
+
+    # Runs are in input order, so first-wins here is first-wins overall
+    by_key: Dict[Tuple[str, str, str, str, str, str], NumberedRow] = {}
+    conflicting: List[NumberedRow] = []
+    for seq, row in spill.read(path):
+        key = _row_key(row)
+        existing = by_key.get(key)
+        if existing is None:
+            by_key[key] = (seq, row)
+        elif existing[1].event_details != row.event_details:
+            conflicting.append((seq, row))
+    path.unlink()
+
+    if by_key:
+        survivors.append(spill.write("survivors", by_key.values()))
+    if conflicting:
+        conflicts.append(spill.write("conflicts", conflicting))
+
+
+def _merge_runs(runs: List[Path], spill: _SpillDirectory) -> Iterator[NumberedRow]:
+    """Merge runs by input number, reading at most `_MERGE_FAN_IN` at a time."""
+    while len(runs) > _MERGE_FAN_IN:
+        merged: List[Path] = []
+        for start in range(0, len(runs), _MERGE_FAN_IN):
+            batch = runs[start:start + _MERGE_FAN_IN]
+            merged.append(
+                spill.write("merged", heapq.merge(*map(spill.read, batch), key=_seq))
+            )
+            for path in batch:
+                path.unlink()
+        runs = merged
+    yield from heapq.merge(*map(spill.read, runs), key=_seq)
+
+
+def _seq(numbered: NumberedRow) -> int:
+    return numbered[0]
+
+
+def deduplicate_external(
+    rows: Iterable[EventRow],
+    memory_budget: int,
+    partitions: int = _DEFAULT_PARTITIONS,
+    temp_dir: Optional[Path] = None,
+) -> Iterator[EventRow]:
+    """
+    Deduplicate rows like `_deduplicate`, spilling to disk over a memory budget.
+
+    Args:
+        rows: Event rows in input order (consumed lazily)
+        memory_budget: Approximate bytes of rows to hold in memory at once
+        partitions: Runs written per partitioning pass
+        temp_dir: Directory for temporary runs (default: system temp dir)
+
+    Returns:
+        Iterator of unique rows in first-occurrence order
+
+    Raises:
+        ValueError: If memory_budget or partitions is not positive
+    """
+    if memory_budget <= 0:
+        raise ValueError("Memory budget must be positive")
+    if partitions <= 0:
+        raise ValueError("Partition count must be positive")
+
+    numbered = enumerate(rows)
+    buffered: List[NumberedRow] = []
+    buffered_size = 0
+    for seq, row in numbered:
+        buffered.append((seq, row))
+        buffered_size += _row_size(row)
+        if buffered_size > memory_budget:
+            break
+    else:
+        yield from _deduplicate(row for _, row in buffered)
+        return
+
+    with tempfile.TemporaryDirectory(prefix="analytics-dedupe-", dir=temp_dir) as tmp:
+        spill = _SpillDirectory(Path(tmp))
+        runs = _partition(itertools.chain(buffered, numbered), spill, partitions, salt=0)
+        del buffered
+
+        survivors: List[Path] = []
+        conflicts: List[Path] = []
+        for run, size in runs:
+            _dedupe_run(run, size, spill, memory_budget, partitions, 0, survivors, conflicts)
+
+        for _, row in _merge_runs(conflicts, spill):
+            _warn_conflict(row)
+        for _, row in _merge_runs(survivors, spill):
+            yield row
@@ -4,10 +4,49 @@ import csv
 import re
 import sys
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
 from enum import Enum
+from functools import lru_cache
 from pathlib import Path
-from typing import List
-from urllib import error, request
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Pattern,
+    Sequence,
+    Tuple,
+)
+
+from . import progress
+
+if TYPE_CHECKING:
+    from urllib import error, request
+
+
+def __getattr__(name: str) -> Any:
+    # `urllib.request` pulls in http.client, ssl and email; only import it
+    # when a Google Sheet is actually fetched (or a test patches it).
+    if name in ("request", "error"):
+        import importlib
+
+        return importlib.import_module(f"urllib.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@lru_cache(maxsize=None)
+def _sheet_id_pattern() -> Pattern[str]:
+    # Pattern: https://docs.google.com/spreadsheets/d/{SHEET_ID}/...
+    return re.compile(r"/spreadsheets/d/([a-zA-Z0-9-_]+)")
+
+
+@lru_cache(maxsize=None)
+def _gid_pattern() -> Pattern[str]:
+    # Pattern: ...#gid=123 or ...&gid=123
+    return re.compile(r"[#&]gid=([0-9]+)")
 
 
 class InputType(Enum):
@@ -15,6 +54,23 @@ class InputType(Enum):
 
     CSV_FILE = "csv_file"
     GOOGLE_SHEETS = "google_sheets"
+    WORKBOOK_FILE = "workbook_file"
+
+
+# Spreadsheet URLs are built under this prefix (overridable for a local server)
+SHEETS_BASE_URL = "https://docs.google.com/spreadsheets/d"
+
+# Local workbook formats read by WorkbookInputSource
+WORKBOOK_EXTENSIONS = (".xlsx", ".ods")
+
+# Downloaded workbooks larger than this are buffered in a temporary file
+_SPOOL_MAX_BYTES = 8 * 1024 * 1024
+
+# Bytes read from a download between progress reports
+_DOWNLOAD_CHUNK = 256 * 1024
+
+# Bytes read at a time when hashing a local input file
+_READ_CHUNK = 1024 * 1024
 
 
 def detect_input_type(input_str: str) -> InputType:
@@ -50,6 +106,8 @@ def detect_input_type(input_str: str) -> InputType:
                 "Only Google Sheets URLs are supported. "
                 "Expected format: https://docs.google.com/spreadsheets/d/SHEET_ID"
             )
+    elif input_str.lower().endswith(WORKBOOK_EXTENSIONS):
+        return InputType.WORKBOOK_FILE
     else:
         # Treat as file path
         return InputType.CSV_FILE
@@ -72,6 +130,68 @@ class InputSource(ABC):
         """
         pass
 
+    def get_tables(self) -> List[Tuple[str, List[List[str]]]]:
+        """
+        Return the input as named tables, each with its own header row.
+
+        Sources with a single table return it with an empty name; workbook
+        sources return one table per tab, named after the tab.
+
+        Returns:
+            List of (table name, CSV rows) pairs
+
+        Raises:
+            FileNotFoundError: If input source is not accessible
+            ValueError: If input data is invalid
+        """
+        return [("", self.get_csv_rows())]
+
+    def iter_tables(self) -> Iterator[Tuple[str, Iterable[List[str]]]]:
+        """
+        Iterate over the tables of `get_tables`, possibly without loading them.
+
+        Sources that can stream (local CSV files) override this so rows are
+        read as they are consumed; the default loads every table first.
+
+        Returns:
+            Iterator of (table name, CSV rows) pairs
+
+        Raises:
+            FileNotFoundError: If input source is not accessible
+            ValueError: If input data is invalid
+        """
+        return iter(self.get_tables())
+
+    def read_bytes(self) -> bytes:
+        """
+        Return the raw input (used to key the artifact cache).
+
+        The default serializes `get_tables` as CSV; sources backed by a file
+        or a download return its bytes unchanged.
+
+        Raises:
+            FileNotFoundError: If input source is not accessible
+            ValueError: If input data is invalid
+        """
+        import io
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for name, rows in self.get_tables():
+            writer.writerow([f"# {name}"])
+            writer.writerows(rows)
+        return buffer.getvalue().encode("utf-8")
+
+    def iter_bytes(self) -> Iterator[bytes]:
+        """
+        Return `read_bytes` in chunks, without loading a local file whole.
+
+        Raises:
+            FileNotFoundError: If input source is not accessible
+            ValueError: If input data is invalid
+        """
+        yield self.read_bytes()
+
 
 class FileInputSource(InputSource):
     """Input source that reads from a local CSV file."""
@@ -106,16 +226,61 @@ class FileInputSource(InputSource):
 
         return rows
 
+    def iter_tables(self) -> Iterator[Tuple[str, Iterable[List[str]]]]:
+        """
+        Stream the file as a single table, reading rows as they are consumed.
+
+        Raises:
+            FileNotFoundError: If file doesn't exist
+        """
+        if not self.file_path.is_file():
+            raise FileNotFoundError(f"Input file not found: {self.file_path}")
+        progress.fetched(self.file_path.stat().st_size)
+        return iter([("", self._iter_csv_rows())])
+
+    def _iter_csv_rows(self) -> Iterator[List[str]]:
+        with self.file_path.open("r", encoding="utf-8", newline="") as f:
+            yield from csv.reader(f)
+
+    def read_bytes(self) -> bytes:
+        """
+        Return the file contents.
+
+        Raises:
+            FileNotFoundError: If file doesn't exist
+        """
+        if not self.file_path.is_file():
+            raise FileNotFoundError(f"Input file not found: {self.file_path}")
+        return self.file_path.read_bytes()
+
+    def iter_bytes(self) -> Iterator[bytes]:
+        """
+        Read the file in chunks.
+
+        Raises:
+            FileNotFoundError: If file doesn't exist
+        """
+        return _iter_file_bytes(self.file_path)
+
 
 class GoogleSheetsInputSource(InputSource):
     """Input source that fetches data from a Google Sheets URL."""
 
-    def __init__(self, url: str):
+    def __init__(
+        self,
+        url: str,
+        project_columns: bool = False,
+        cell_range: Optional[str] = None,
+        base_url: str = SHEETS_BASE_URL,
+    ):
         """
         Initialize Google Sheets input source.
 
         Args:
             url: Google Sheets URL
+            project_columns: Only download the columns the parser reads
+            cell_range: Only download this A1 range (e.g. "A1:K500")
+            base_url: Spreadsheets URL prefix (for a local stand-in server)
 
         Raises:
             ValueError: If URL is invalid
@@ -123,6 +288,11 @@ class GoogleSheetsInputSource(InputSource):
         self.url = url
         self.sheet_id = self._extract_sheet_id(url)
         self.gid = self._extract_gid(url)
+        self.project_columns = project_columns
+        self.cell_range = cell_range
+        self.base_url = base_url.rstrip("/")
+        # Downloads by URL, so the artifact cache key and parsing share one fetch
+        self._responses: Dict[str, bytes] = {}
 
     def _extract_sheet_id(self, url: str) -> str:
         """
@@ -137,8 +307,7 @@ class GoogleSheetsInputSource(InputSource):
         Raises:
             ValueError: If ID cannot be extracted
         """
-        # Pattern: https://docs.google.com/spreadsheets/d/{SHEET_ID}/...
-        match = re.search(r"/spreadsheets/d/([a-zA-Z0-9-_]+)", url)
+        match = _sheet_id_pattern().search(url)
         if not match:
             raise ValueError(
                 f"Invalid Google Sheets URL: {url}\n"
@@ -156,8 +325,7 @@ class GoogleSheetsInputSource(InputSource):
         Returns:
             Sheet GID, or "0" (first sheet) if not specified
         """
-        # Pattern: ...#gid=123 or ...&gid=123
-        match = re.search(r"[#&]gid=([0-9]+)", url)
+        match = _gid_pattern().search(url)
         if match:
             return match.group(1)
         return "0"  # Default to first sheet
@@ -169,36 +337,65 @@ class GoogleSheetsInputSource(InputSource):
         Returns:
             CSV export URL
         """
-        base_url = (
-            f"https://docs.google.com/spreadsheets/d/{self.sheet_id}/export"
-        )
+        base_url = f"{self.base_url}/{self.sheet_id}/export"
         return f"{base_url}?format=csv&gid={self.gid}"
 
-    def get_csv_rows(self) -> List[List[str]]:
+    def _build_query_url(self, query: Optional[str] = None) -> str:
         """
-        Fetch CSV data from Google Sheets.
+        Build a visualization-query CSV URL for the sheet.
+
+        All rows are returned as data (`headers=0`), so the header row comes
+        back as the first row, like in the plain CSV export.
+
+        Args:
+            query: Query language statement (e.g. "select A, C limit 1")
 
         Returns:
-            List of CSV rows
+            Query CSV URL
+        """
+        from urllib.parse import urlencode
+
+        params = {"tqx": "out:csv", "gid": self.gid, "headers": "0"}
+        if self.cell_range:
+            params["range"] = self.cell_range
+        if query:
+            params["tq"] = query
+        return f"{self.base_url}/{self.sheet_id}/gviz/tq?{urlencode(params)}"
+
+    def _range_first_column(self) -> int:
+        # "C2:K" or "Sheet1!C2:K" -> 2; columns in queries are named by
+        # sheet column letter
+        if not self.cell_range:
+            return 0
+        # Sheet names can be quoted and contain "!", cell references can't
+        cell_range = self.cell_range.rpartition("!")[2].lstrip("$")
+        letters = ""
+        for ch in cell_range:
+            if not ch.isalpha():
+                break
+            letters += ch.upper()
+        return max(_column_number(letters) - 1, 0) if letters else 0
+
+    def _projection_query(self, first_row: List[str]) -> str:
+        from .codegen import _used_columns
+
+        offset = self._range_first_column()
+        columns = [_column_letter(offset + idx) for idx in _used_columns(first_row)]
+        return "select " + ", ".join(columns)
+
+    @contextmanager
+    def _translate_errors(self) -> Iterator[None]:
+        """
+        Map urllib errors raised while fetching to user-facing errors.
 
         Raises:
             FileNotFoundError: If sheet is not found (404)
             ValueError: If permission is denied (403) or network error occurs
         """
-        export_url = self._build_export_url()
+        from urllib import error
 
         try:
-            with request.urlopen(export_url, timeout=30) as response:
-                # Read and decode response
-                data = response.read().decode("utf-8")
-
-                # Parse CSV data
-                rows: List[List[str]] = []
-                reader = csv.reader(data.splitlines())
-                for raw_row in reader:
-                    rows.append(raw_row)
-
-                return rows
+            yield
 
         except error.HTTPError as e:
             if e.code == 404:
@@ -230,3 +427,252 @@ class GoogleSheetsInputSource(InputSource):
                 f"Unexpected error fetching Google Sheet: {self.url}\n"
                 f"Details: {str(e)}"
             ) from e
+
+    def get_csv_rows(self) -> List[List[str]]:
+        """
+        Fetch CSV data from Google Sheets.
+
+        Returns:
+            List of CSV rows
+
+        Raises:
+            FileNotFoundError: If sheet is not found (404)
+            ValueError: If permission is denied (403) or network error occurs
+        """
+        return self._fetch_csv(self._data_url())
+
+    def read_bytes(self) -> bytes:
+        """
+        Download the CSV export (shared with a later `get_csv_rows`).
+
+        Raises:
+            FileNotFoundError: If sheet is not found (404)
+            ValueError: If permission is denied (403) or network error occurs
+        """
+        return self._fetch_bytes(self._data_url())
+
+    def _data_url(self) -> str:
+        if self.project_columns:
+            # Fetch the header row first, then only the columns it maps
+            header = self._fetch_csv(self._build_query_url("limit 1"))
+            query = self._projection_query(header[0] if header else [])
+            return self._build_query_url(query)
+        if self.cell_range:
+            return self._build_query_url()
+        return self._build_export_url()
+
+    def _fetch_bytes(self, url: str) -> bytes:
+        from urllib import request
+
+        data = self._responses.get(url)
+        if data is None:
+            with self._translate_errors():
+                with request.urlopen(url, timeout=30) as response:
+                    chunks: List[bytes] = []
+                    for chunk in _read_chunks(response):
+                        chunks.append(chunk)
+                    data = b"".join(chunks)
+            self._responses[url] = data
+        return data
+
+    def _fetch_csv(self, url: str) -> List[List[str]]:
+        # Decode response
+        data = self._fetch_bytes(url).decode("utf-8")
+
+        # Parse CSV data
+        rows: List[List[str]] = []
+        reader = csv.reader(data.splitlines())
+        for raw_row in reader:
+            rows.append(raw_row)
+
+        return rows
+
+
+def _iter_file_bytes(path: Path) -> Iterator[bytes]:
+    if not path.is_file():
+        raise FileNotFoundError(f"Input file not found: {path}")
+
+    def chunks() -> Iterator[bytes]:
+        with path.open("rb") as f:
+            yield from iter(lambda: f.read(_READ_CHUNK), b"")
+
+    return chunks()
+
+
+def _read_chunks(response: Any) -> Iterator[bytes]:
+    # Reports download progress as the body arrives
+    while True:
+        chunk = response.read(_DOWNLOAD_CHUNK)
+        if not chunk:
+            break
+        progress.fetched(len(chunk))
+        yield chunk
+
+    # `read(amt)` returns b"" when the connection closes early instead of
+    # raising; bytes still owed by Content-Length mean a truncated download
+    remaining = getattr(response, "length", None)
+    if isinstance(remaining, int) and remaining > 0:
+        raise ValueError(f"Connection closed with {remaining} bytes of the response missing")
+
+
+def _column_number(letters: str) -> int:
+    # "A" -> 1, "AB" -> 28
+    number = 0
+    for ch in letters:
+        number = number * 26 + (ord(ch) - ord("A") + 1)
+    return number
+
+
+def _column_letter(index: int) -> str:
+    # 0 -> "A", 27 -> "AB"
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
+
+
+def _first_table_rows(tables: List[Tuple[str, List[List[str]]]]) -> List[List[str]]:
+    return tables[0][1] if tables else []
+
+
+class WorkbookInputSource(InputSource):
+    """Input source that reads every tab of a local .xlsx or .ods workbook."""
+
+    def __init__(self, file_path: Path, tabs: Optional[Sequence[str]] = None):
+        """
+        Initialize workbook input source.
+
+        Args:
+            file_path: Path to .xlsx or .ods file
+            tabs: Only read these tabs (default: all tabs)
+        """
+        self.file_path = file_path
+        self.tabs = list(tabs) if tabs else None
+
+    def get_tables(self) -> List[Tuple[str, List[List[str]]]]:
+        """
+        Stream-parse the workbook into one table per tab.
+
+        Returns:
+            List of (tab name, rows) pairs in workbook order
+
+        Raises:
+            FileNotFoundError: If file doesn't exist
+            ValueError: If the file is not a valid workbook
+        """
+        from .workbook import read_workbook_tables
+
+        if not self.file_path.is_file():
+            raise FileNotFoundError(f"Input file not found: {self.file_path}")
+        progress.fetched(self.file_path.stat().st_size)
+        return read_workbook_tables(str(self.file_path), self.tabs)
+
+    def read_bytes(self) -> bytes:
+        """
+        Return the workbook file contents.
+
+        Raises:
+            FileNotFoundError: If file doesn't exist
+        """
+        if not self.file_path.is_file():
+            raise FileNotFoundError(f"Input file not found: {self.file_path}")
+        return self.file_path.read_bytes()
+
+    def iter_bytes(self) -> Iterator[bytes]:
+        """
+        Read the file in chunks.
+
+        Raises:
+            FileNotFoundError: If file doesn't exist
+        """
+        return _iter_file_bytes(self.file_path)
+
+    def get_csv_rows(self) -> List[List[str]]:
+        """Return the rows of the first (or first selected) tab."""
+        return _first_table_rows(self.get_tables())
+
+
+class GoogleSheetsWorkbookInputSource(GoogleSheetsInputSource):
+    """
+    Input source that downloads all tabs of a Google Sheet as one XLSX export.
+
+    One request replaces a CSV export per `gid`, and tab names are kept.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        tabs: Optional[Sequence[str]] = None,
+        base_url: str = SHEETS_BASE_URL,
+    ):
+        """
+        Initialize Google Sheets workbook input source.
+
+        Args:
+            url: Google Sheets URL (any `gid` is ignored)
+            tabs: Only read these tabs (default: all tabs)
+            base_url: Spreadsheets URL prefix (for a local stand-in server)
+
+        Raises:
+            ValueError: If URL is invalid
+        """
+        super().__init__(url, base_url=base_url)
+        self.tabs = list(tabs) if tabs else None
+
+    def _build_export_url(self) -> str:
+        """
+        Build XLSX export URL for the whole spreadsheet.
+
+        Returns:
+            XLSX export URL
+        """
+        return f"{self.base_url}/{self.sheet_id}/export?format=xlsx"
+
+    def get_tables(self) -> List[Tuple[str, List[List[str]]]]:
+        """
+        Download the workbook once and parse one table per tab.
+
+        Returns:
+            List of (tab name, rows) pairs in workbook order
+
+        Raises:
+            FileNotFoundError: If sheet is not found (404)
+            ValueError: If permission is denied (403), network error occurs
+                or the export is not a valid workbook
+        """
+        import io
+        import tempfile
+        from urllib import request
+
+        from .workbook import read_workbook_tables
+
+        export_url = self._build_export_url()
+
+        # Already downloaded for the artifact cache key
+        if export_url in self._responses:
+            return read_workbook_tables(io.BytesIO(self._responses[export_url]), self.tabs)
+
+        # Large exports spill to disk instead of being held in memory
+        with tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_BYTES) as f:
+            with self._translate_errors():
+                with request.urlopen(export_url, timeout=30) as response:
+                    for chunk in _read_chunks(response):
+                        f.write(chunk)
+            f.seek(0)
+            return read_workbook_tables(f, self.tabs)
+
+    def get_csv_rows(self) -> List[List[str]]:
+        """Return the rows of the first (or first selected) tab."""
+        return _first_table_rows(self.get_tables())
+
+    def read_bytes(self) -> bytes:
+        """
+        Download the XLSX export (shared with a later `get_tables`).
+
+        Raises:
+            FileNotFoundError: If sheet is not found (404)
+            ValueError: If permission is denied (403) or network error occurs
+        """
+        return self._fetch_bytes(self._build_export_url())
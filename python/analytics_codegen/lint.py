@@ -0,0 +1,271 @@
+"""
+Check taxonomy fields against the screen/component/section/element/action
+libraries (`lint` pipeline stage).
+
+The libraries are loaded from a JSON file into one set per field, so every
+cell is checked with a single set lookup. For values that are not in a
+library, suggestions come from a trigram index built once per field: only
+words listed under the value's rarest trigrams are candidates, and the ones
+sharing the most trigrams are checked with a bounded edit distance, so a
+suggestion costs a few short posting lists rather than a scan of the whole
+vocabulary. Each distinct unknown value is looked up once per run however
+many rows use it.
+
+Library file:
+
+    {
+      "screen": ["ad", "home", "listing"],
+      "action": {"tap": "Single tap on an element", "view": "..."}
+    }
+
+Each field holds a list of values or an object of value → description.
+Fields that are missing are not checked.
+"""
+
+from __future__ import annotations
+
+import json
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from .codegen import EventRow, _taxonomy_key
+
+# Taxonomy fields that have a library, in event key order
+LINT_FIELDS = ("screen", "component", "section", "element", "action")
+
+DEFAULT_MAX_SUGGESTIONS = 3
+
+# Candidates (by shared trigrams) checked with the edit distance per lookup
+_CANDIDATES_PER_SUGGESTION = 4
+
+
+def _trigrams(value: str) -> FrozenSet[str]:
+    padded = f"  {value.lower()} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Optimal string alignment distance between `a` and `b`.
+
+    Adjacent transpositions count as one edit. Returns `limit + 1` as soon
+    as the distance is known to exceed `limit`.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            cost = 0 if ca == cb else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class TrigramIndex:
+    """Near-miss lookup over a fixed vocabulary."""
+
+    def __init__(self, words: Iterable[str]):
+        self.words = sorted(set(words))
+        self._grams = [_trigrams(word) for word in self.words]
+        self._lengths = [len(word) for word in self.words]
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        for i, grams in enumerate(self._grams):
+            for gram in grams:
+                self._postings[gram].append(i)
+
+    def suggest(
+        self,
+        value: str,
+        limit: int = DEFAULT_MAX_SUGGESTIONS,
+        max_distance: Optional[int] = None,
+    ) -> List[str]:
+        """
+        Words of the vocabulary closest to `value`.
+
+        Args:
+            value: Unknown value
+            limit: Maximum number of suggestions
+            max_distance: Maximum edit distance (default: 1 for values of up
+                to 4 characters, otherwise 2)
+
+        Returns:
+            Up to `limit` words, closest first
+        """
+        if max_distance is None:
+            max_distance = 1 if len(value) <= 4 else 2
+        grams = _trigrams(value)
+
+        # An edit changes at most 4 trigrams (a transposition), so a word
+        # within `max_distance` shares one of any 4 * max_distance + 1 of the
+        # value's trigrams: collect candidates from the rarest ones only.
+        rarest = sorted(grams, key=lambda g: len(self._postings.get(g, ())))
+        candidates: Set[int] = set()
+        for gram in rarest[: 4 * max_distance + 1]:
+            candidates.update(self._postings.get(gram, ()))
+
+        min_shared = len(grams) - 4 * max_distance
+        size, length = len(grams), len(value)
+        word_grams, lengths = self._grams, self._lengths
+        by_dice: List[Tuple[float, int]] = []
+        for i in candidates:
+            if abs(lengths[i] - length) > max_distance:
+                continue
+            other = word_grams[i]
+            shared = len(grams & other)
+            if shared >= min_shared:
+                # Dice coefficient of the trigram sets ranks the candidates
+                by_dice.append((-2 * shared / (size + len(other)), i))
+        ranked = [i for _, i in sorted(by_dice)[: limit * _CANDIDATES_PER_SUGGESTION]]
+
+        lowered = value.lower()
+        scored: List[Tuple[int, int, str]] = []
+        for rank, i in enumerate(ranked):
+            distance = _edit_distance(lowered, self.words[i].lower(), max_distance)
+            if distance <= max_distance:
+                scored.append((distance, rank, self.words[i]))
+        return [word for _, _, word in sorted(scored)[:limit]]
+
+
+class TaxonomyLibrary:
+    """Allowed values per taxonomy field."""
+
+    def __init__(self, fields: Mapping[str, Iterable[str]]):
+        """
+        Initialize the library.
+
+        Args:
+            fields: Allowed values by field name (see `LINT_FIELDS`)
+
+        Raises:
+            ValueError: If a field name is unknown
+        """
+        unknown = set(fields) - set(LINT_FIELDS)
+        if unknown:
+            raise ValueError(
+                f"Unknown library field(s): {', '.join(sorted(unknown))} "
+                f"(expected: {', '.join(LINT_FIELDS)})"
+            )
+        self.values: Dict[str, FrozenSet[str]] = {
+            name: frozenset(values) for name, values in fields.items()
+        }
+        # Built on the first unknown value of a field
+        self._indexes: Dict[str, TrigramIndex] = {}
+
+    def is_known(self, field: str, value: str) -> bool:
+        values = self.values.get(field)
+        return values is None or value in values
+
+    def suggest(
+        self, field: str, value: str, limit: int = DEFAULT_MAX_SUGGESTIONS
+    ) -> List[str]:
+        """Library values of `field` close to an unknown `value`."""
+        index = self._indexes.get(field)
+        if index is None:
+            index = self._indexes[field] = TrigramIndex(self.values.get(field, ()))
+        return index.suggest(value, limit)
+
+
+def load_library(path: Path) -> TaxonomyLibrary:
+    """
+    Load taxonomy libraries from a JSON file (see the module docstring).
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        ValueError: If the file is not a valid library file
+    """
+    if not path.is_file():
+        raise FileNotFoundError(f"Taxonomy library not found: {path}")
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid taxonomy library {path}: {e}") from e
+    if not isinstance(data, dict):
+        raise ValueError(f"Taxonomy library {path} must be a JSON object")
+
+    fields: Dict[str, List[str]] = {}
+    for name, values in data.items():
+        if isinstance(values, dict):
+            values = list(values)
+        if not isinstance(values, list) or not all(isinstance(v, str) for v in values):
+            raise ValueError(
+                f"Library field '{name}' in {path} must be a list of strings "
+                "or an object of value → description"
+            )
+        fields[name] = values
+    return TaxonomyLibrary(fields)
+
+
+@dataclass(frozen=True)
+class LintIssue:
+    """A value missing from the library of its field."""
+
+    field: str
+    value: str
+    rows: int
+    example: str  # Taxonomy key of the first row using the value
+    suggestions: Tuple[str, ...]
+
+    def message(self) -> str:
+        rows = "1 row" if self.rows == 1 else f"{self.rows} rows"
+        text = f"⚠️ Unknown {self.field} '{self.value}' in {self.example} ({rows})"
+        if self.suggestions:
+            text += " — did you mean " + ", ".join(f"'{s}'" for s in self.suggestions) + "?"
+        return text
+
+
+def _field_values(value: str) -> Sequence[str]:
+    # Parameterized fields list their allowed values separated by `|`
+    if "|" in value:
+        return [v.strip() for v in value.split("|") if v.strip()]
+    return (value.strip(),)
+
+
+def lint_rows(
+    rows: Iterable[EventRow],
+    library: TaxonomyLibrary,
+    max_suggestions: int = DEFAULT_MAX_SUGGESTIONS,
+) -> List[LintIssue]:
+    """
+    Find taxonomy values that are not in the library.
+
+    Returns:
+        One issue per distinct (field, value), in order of first use
+    """
+    checked = [(name, library.values[name]) for name in LINT_FIELDS if name in library.values]
+    counts: Dict[Tuple[str, str], int] = {}
+    examples: Dict[Tuple[str, str], str] = {}
+    for row in rows:
+        for name, known in checked:
+            cell = getattr(row, name)
+            if cell in known:
+                continue
+            for value in _field_values(cell):
+                if value in known:
+                    continue
+                key = (name, value)
+                if key in counts:
+                    counts[key] += 1
+                else:
+                    counts[key] = 1
+                    examples[key] = _taxonomy_key(row)
+
+    return [
+        LintIssue(
+            field=name,
+            value=value,
+            rows=count,
+            example=examples[name, value],
+            suggestions=tuple(library.suggest(name, value, max_suggestions)),
+        )
+        for (name, value), count in counts.items()
+    ]
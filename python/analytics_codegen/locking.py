@@ -0,0 +1,252 @@
+"""
+Advisory file locks, atomic file replacement and single-flight runs.
+
+Several generator runs (Xcode build phases, the macOS app) can start at the
+same time against the same sheet, output files and cache directory:
+
+- Output files are replaced atomically, so readers never see a torn file.
+- Outputs and the cache directory are guarded by advisory locks
+  (`flock`/`msvcrt.locking`), released by the OS if a process dies.
+- Runs with the same input and options are single-flight: they queue on one
+  lock, and a run that had to wait reuses the result the first run published
+  instead of downloading and generating again.
+"""
+
+from __future__ import annotations
+
+import getpass
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, Mapping, Optional
+
+DEFAULT_TIMEOUT = 600.0
+
+_POLL_INTERVAL = 0.05
+
+
+def default_lock_dir() -> Path:
+    """
+    Per-user directory for lock and single-flight files, created if missing.
+
+    The system temp dir is shared, so the directory is suffixed with the
+    user and private to them (0o700); another user's locks are never touched.
+    """
+    getuid = getattr(os, "getuid", None)
+    user = str(getuid()) if getuid is not None else getpass.getuser()
+    path = Path(tempfile.gettempdir()) / f"analytics-codegen-locks-{user}"
+    path.mkdir(mode=0o700, exist_ok=True)
+    return path
+
+
+def _try_lock(fd: int) -> bool:
+    if os.name == "nt":
+        import msvcrt
+
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+
+    import fcntl
+
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except (BlockingIOError, PermissionError):
+        return False
+    return True
+
+
+def _unlock(fd: int) -> None:
+    if os.name == "nt":
+        import msvcrt
+
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        return
+
+    import fcntl
+
+    fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+@contextmanager
+def file_lock(path: Path, timeout: Optional[float] = DEFAULT_TIMEOUT) -> Iterator[None]:
+    """
+    Hold an exclusive advisory lock on `path` (created if missing).
+
+    Args:
+        path: Lock file
+        timeout: Seconds to wait for the lock (None waits forever)
+
+    Raises:
+        TimeoutError: If the lock is not acquired within `timeout`
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o666)
+    try:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not _try_lock(fd):
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"Timed out waiting for lock: {path}")
+            time.sleep(_POLL_INTERVAL)
+        try:
+            yield
+        finally:
+            _unlock(fd)
+    finally:
+        os.close(fd)
+
+
+def output_lock_path(lock_dir: Path, output_path: Path) -> Path:
+    """Lock file for an output path, kept out of the source tree."""
+    digest = hashlib.sha1(str(output_path.resolve()).encode("utf-8")).hexdigest()
+    return lock_dir / f"output-{digest[:16]}.lock"
+
+
+@lru_cache(maxsize=None)
+def _umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def _file_mode(path: Path) -> int:
+    # Keep the mode of the file being replaced; new files get the usual
+    # 0o666 & ~umask instead of mkstemp's 0o600
+    try:
+        return path.stat().st_mode & 0o777
+    except OSError:
+        return 0o666 & ~_umask()
+
+
+def atomic_write_text(path: Path, content: str) -> None:
+    """Write `content` to `path` through a temporary file and a rename."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.chmod(tmp, _file_mode(path))
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def atomic_copy(source: Path, destination: Path) -> None:
+    """Copy `source` over `destination` through a temporary file and a rename."""
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{destination.name}.", dir=destination.parent)
+    os.close(fd)
+    try:
+        shutil.copyfile(source, tmp)
+        os.chmod(tmp, _file_mode(destination))
+        os.replace(tmp, destination)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def _file_digest(path: Path) -> Optional[str]:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def flight_key(*parts: object) -> str:
+    """Key of a single-flight group (JSON-serializable parts)."""
+    data = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class Flight:
+    """A run holding its single-flight lock."""
+
+    result_path: Path
+    started: float
+
+    def shared_count(self, outputs: Mapping[str, Path]) -> Optional[int]:
+        """
+        Reuse the result of a run that finished while this one was waiting.
+
+        Outputs are reused only if the published files are unchanged; they are
+        copied when this run writes to different paths.
+
+        Args:
+            outputs: Output path per target name
+
+        Returns:
+            Function count of the reused result, or None if it must run itself
+        """
+        try:
+            result = json.loads(self.result_path.read_text(encoding="utf-8"))
+            if float(result["finished"]) < self.started:
+                return None
+            published: Dict[str, Dict[str, str]] = result["outputs"]
+            count = int(result["count"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+        sources: Dict[str, Path] = {}
+        for target in outputs:
+            if target not in published:
+                return None
+            source = Path(published[target]["path"])
+            if _file_digest(source) != published[target]["sha256"]:
+                return None
+            sources[target] = source
+
+        for target, output_path in outputs.items():
+            if sources[target].resolve() != output_path.resolve():
+                atomic_copy(sources[target], output_path)
+        return count
+
+    def publish(self, count: int, outputs: Mapping[str, Path]) -> None:
+        """Record this run's result for runs waiting on the same flight."""
+        result = {
+            "finished": time.time(),
+            "count": count,
+            "outputs": {
+                target: {
+                    "path": str(path.resolve()),
+                    "sha256": _file_digest(path) or "",
+                }
+                for target, path in outputs.items()
+            },
+        }
+        atomic_write_text(self.result_path, json.dumps(result, sort_keys=True))
+
+
+@contextmanager
+def single_flight(
+    lock_dir: Path,
+    key: str,
+    timeout: Optional[float] = DEFAULT_TIMEOUT,
+) -> Iterator[Flight]:
+    """
+    Run at most one flight per key at a time.
+
+    Args:
+        lock_dir: Directory for lock and result files
+        key: Flight key (see `flight_key`)
+        timeout: Seconds to wait for a running flight (None waits forever)
+
+    Raises:
+        TimeoutError: If the running flight doesn't finish within `timeout`
+    """
+    started = time.time()
+    with file_lock(lock_dir / f"flight-{key[:32]}.lock", timeout):
+        yield Flight(result_path=lock_dir / f"flight-{key[:32]}.json", started=started)
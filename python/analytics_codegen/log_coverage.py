@@ -0,0 +1,307 @@
+"""
+Coverage of the taxonomy by production event logs (`analyze` subcommand).
+
+Streams newline-delimited event logs, plain or gzip-compressed, and reports
+how often every defined event fired, which defined events never fired and
+which fired events are not defined. A record is one of:
+
+- a JSON object with an `event` string in the concatenated
+  `client|screen|component|section|element|action` format
+- a JSON object with the six taxonomy fields (see the README's JSON format)
+- a JSON string, or a bare line, in the concatenated format
+
+Plain logs are split into byte ranges that worker processes read on their
+own; gzip streams cannot be entered in the middle, so each gzip file is one
+shard. Workers only count distinct event strings, and the strings are
+matched against the taxonomy once each after merging, so memory grows with
+the number of distinct keys and not with the size of the logs.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .validator import EventValidator
+
+# Below this many bytes of logs, counting in-process is faster than starting workers
+_PARALLEL_MIN_BYTES = 16 * 1024 * 1024
+
+# Default byte range read by one worker task
+DEFAULT_SHARD_BYTES = 64 * 1024 * 1024
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+# Taxonomy fields of a JSON record, in concatenated key order
+_RECORD_FIELDS = ("client", "screen", "component", "section", "element", "action")
+
+
+@dataclass(frozen=True)
+class Shard:
+    """A byte range of a plain log, or a whole gzip log (`end` is None)."""
+
+    path: str
+    start: int = 0
+    end: Optional[int] = None
+
+
+@dataclass
+class ShardCounts:
+    """Occurrences of each distinct event string in one or more shards."""
+
+    events: Counter
+    records: int = 0
+    malformed: int = 0
+
+    def merge(self, other: "ShardCounts") -> None:
+        self.events.update(other.events)
+        self.records += other.records
+        self.malformed += other.malformed
+
+
+@dataclass
+class CoverageReport:
+    """Firing counts of defined events and the undefined events seen."""
+
+    # Defined taxonomy key (without client, `*` for parameters) → count
+    defined: Dict[str, int]
+    unused: List[str]
+    # Undefined event string → count, most frequent first
+    undefined: Dict[str, int]
+    records: int
+    malformed: int
+
+    @property
+    def coverage(self) -> float:
+        if not self.defined:
+            return 0.0
+        return (len(self.defined) - len(self.unused)) / len(self.defined)
+
+
+def _is_gzip(path: str) -> bool:
+    with open(path, "rb") as f:
+        return f.read(2) == _GZIP_MAGIC
+
+
+def plan_shards(
+    paths: Sequence[Path],
+    shard_bytes: int = DEFAULT_SHARD_BYTES,
+) -> List[Shard]:
+    """
+    Split logs into shards of about `shard_bytes`.
+
+    Raises:
+        FileNotFoundError: If a log doesn't exist
+        ValueError: If shard_bytes is not positive
+    """
+    if shard_bytes <= 0:
+        raise ValueError("Shard size must be positive")
+    shards: List[Shard] = []
+    for path in paths:
+        if not path.is_file():
+            raise FileNotFoundError(f"Log file not found: {path}")
+        name = str(path)
+        if _is_gzip(name):
+            shards.append(Shard(name))
+            continue
+        size = path.stat().st_size
+        for start in range(0, size, shard_bytes):
+            shards.append(Shard(name, start, min(start + shard_bytes, size)))
+    return shards
+
+
+def _iter_shard_lines(shard: Shard) -> Iterator[bytes]:
+    if shard.end is None:
+        with gzip.open(shard.path, "rb") as f:
+            yield from f
+        return
+
+    with open(shard.path, "rb") as f:
+        # A shard owns the lines that start inside it; the line running into
+        # the range belongs to the previous shard
+        if shard.start > 0:
+            f.seek(shard.start - 1)
+            f.readline()
+        position = f.tell()
+        while position < shard.end:
+            line = f.readline()
+            if not line:
+                break
+            position += len(line)
+            yield line
+
+
+def _record_event(line: bytes) -> Optional[str]:
+    """Concatenated event string of a log record; raises ValueError if malformed."""
+    text = line.strip()
+    if not text:
+        return None
+    if text[:1] not in (b"{", b'"'):
+        return text.decode("utf-8")
+
+    record = json.loads(text)
+    if isinstance(record, str):
+        return record
+    if not isinstance(record, dict):
+        raise ValueError("Unsupported record")
+    event = record.get("event")
+    if isinstance(event, str):
+        return event
+    values = [record.get(name) for name in _RECORD_FIELDS]
+    if not all(isinstance(value, str) for value in values):
+        raise ValueError("Record has no event")
+    return "|".join(values)  # type: ignore[arg-type]
+
+
+def count_shard(shard: Shard) -> ShardCounts:
+    """Count the event strings of one shard."""
+    events: Counter = Counter()
+    records = malformed = 0
+    for line in _iter_shard_lines(shard):
+        try:
+            event = _record_event(line)
+        except ValueError:
+            # json.JSONDecodeError and UnicodeDecodeError included
+            records += 1
+            malformed += 1
+            continue
+        if event is not None:
+            records += 1
+            events[event] += 1
+    return ShardCounts(events, records, malformed)
+
+
+def count_events(shards: Sequence[Shard], workers: Optional[int] = None) -> ShardCounts:
+    """
+    Count event strings across shards, in worker processes for large logs.
+
+    Args:
+        shards: Shards from `plan_shards`
+        workers: Number of worker processes (default: CPU count)
+
+    Returns:
+        Merged counts
+    """
+    total = ShardCounts(Counter())
+    total_bytes = sum(
+        os.path.getsize(s.path) if s.end is None else s.end - s.start for s in shards
+    )
+    if len(shards) < 2 or total_bytes < _PARALLEL_MIN_BYTES or workers == 1:
+        for shard in shards:
+            total.merge(count_shard(shard))
+        return total
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for partial in executor.map(count_shard, shards):
+            total.merge(partial)
+    return total
+
+
+def coverage_report(
+    keys: Sequence[str],
+    validator: EventValidator,
+    counts: ShardCounts,
+) -> CoverageReport:
+    """
+    Match counted event strings against the taxonomy.
+
+    Args:
+        keys: Defined taxonomy keys in taxonomy order (see `catalog.catalog_keys`)
+        validator: Validator built from the same keys
+        counts: Merged event counts
+
+    Returns:
+        CoverageReport
+    """
+    defined = dict.fromkeys(keys, 0)
+    undefined: Counter = Counter()
+    for event, count in counts.events.items():
+        key = validator.match(event)
+        if key is None:
+            undefined[event] += count
+        else:
+            defined[key] += count
+    return CoverageReport(
+        defined=defined,
+        unused=[key for key, count in defined.items() if count == 0],
+        undefined=dict(undefined.most_common()),
+        records=counts.records,
+        malformed=counts.malformed,
+    )
+
+
+def analyze_logs(
+    keys: Sequence[str],
+    paths: Sequence[Path],
+    clients: Sequence[str],
+    workers: Optional[int] = None,
+    shard_bytes: int = DEFAULT_SHARD_BYTES,
+) -> CoverageReport:
+    """
+    Report how the defined events fire in event logs.
+
+    Args:
+        keys: Defined taxonomy keys (see `catalog.catalog_keys`)
+        paths: Newline-delimited logs, plain or gzip
+        clients: Accepted client segments
+        workers: Number of worker processes (default: CPU count)
+        shard_bytes: Bytes of a plain log read per worker task
+
+    Returns:
+        CoverageReport
+
+    Raises:
+        FileNotFoundError: If a log doesn't exist
+    """
+    shards = plan_shards(paths, shard_bytes)
+    counts = count_events(shards, workers)
+    return coverage_report(keys, EventValidator(clients, keys), counts)
+
+
+def format_coverage_text(report: CoverageReport, top: int = 20) -> str:
+    """Render a coverage report in a human-readable form."""
+    lines: List[str] = []
+    if report.unused:
+        lines.append(f"Defined events that never fired ({len(report.unused)}):")
+        lines.extend(f"  {key}" for key in report.unused)
+    if report.undefined:
+        shown: List[Tuple[str, int]] = list(report.undefined.items())[:top]
+        lines.append(
+            f"Fired events that are not defined ({len(report.undefined)}"
+            + (f", top {len(shown)}" if len(shown) < len(report.undefined) else "")
+            + "):"
+        )
+        lines.extend(f"  {count:>10}  {event}" for event, count in shown)
+    fired = len(report.defined) - len(report.unused)
+    lines.append(
+        f"{fired}/{len(report.defined)} defined events fired "
+        f"({report.coverage:.0%}), {report.records} records, "
+        f"{sum(report.undefined.values())} undefined, {report.malformed} malformed"
+    )
+    return "\n".join(lines)
+
+
+def format_coverage_json(report: CoverageReport) -> str:
+    """Render a coverage report as a JSON document."""
+    payload = {
+        "defined": report.defined,
+        "unused": report.unused,
+        "undefined": report.undefined,
+        "summary": {
+            "defined": len(report.defined),
+            "fired": len(report.defined) - len(report.unused),
+            "coverage": round(report.coverage, 4),
+            "records": report.records,
+            "undefined_records": sum(report.undefined.values()),
+            "malformed": report.malformed,
+        },
+    }
+    return json.dumps(payload, ensure_ascii=False, indent=2)
+
@@ -0,0 +1,155 @@
+"""
+Per-stage memory profile of a generator run (`--memprofile`).
+
+Built on `tracemalloc`: every pipeline stage (fetch, parse, dedupe, render,
+...) records its peak and retained traced memory relative to the start of the
+stage, and the source lines that allocated the most memory still held at its
+end. The result is written as JSON so memory budgets per input size can be
+tracked in CI.
+
+Only the current process is traced; renders done in worker processes (see
+`emitters.render_targets`) show up as the cost of collecting their results.
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+# Allocation sites reported per stage
+DEFAULT_TOP_SITES = 10
+
+
+@dataclass(frozen=True)
+class AllocationSite:
+    """Memory allocated by one source line during a stage and still held."""
+
+    file: str
+    line: int
+    size_bytes: int
+    count: int
+
+
+@dataclass
+class StageProfile:
+    """Memory used by one pipeline stage."""
+
+    name: str
+    seconds: float
+    # Highest traced memory during the stage, above its starting level
+    peak_bytes: int
+    # Traced memory still held at the end of the stage, above its starting level
+    retained_bytes: int
+    top_allocations: List[AllocationSite] = field(default_factory=list)
+
+
+@dataclass
+class MemoryProfile:
+    """All stages of a run plus facts about its input for per-size budgets."""
+
+    stages: List[StageProfile] = field(default_factory=list)
+    peak_bytes: int = 0
+    metadata: Dict[str, object] = field(default_factory=dict)
+
+    def to_json(self) -> str:
+        payload = {
+            "python": platform.python_version(),
+            "peak_bytes": self.peak_bytes,
+            "metadata": self.metadata,
+            "stages": [asdict(stage) for stage in self.stages],
+        }
+        return json.dumps(payload, indent=2)
+
+
+class MemoryProfiler:
+    """Collects a `MemoryProfile` while tracing is active."""
+
+    def __init__(self, top_sites: int = DEFAULT_TOP_SITES):
+        """
+        Initialize the profiler.
+
+        Args:
+            top_sites: Allocation sites to report per stage
+        """
+        self.top_sites = top_sites
+        self.profile = MemoryProfile()
+        self._started_tracing = False
+
+    def start(self) -> None:
+        """Start tracing allocations (if not already traced)."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def stop(self) -> None:
+        """Stop tracing if `start` started it."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Profile the enclosed block as one stage."""
+        if not tracemalloc.is_tracing():
+            yield
+            return
+
+        # The baseline snapshot is taken first so that it counts as
+        # memory held before the stage
+        before = tracemalloc.take_snapshot()
+        start_bytes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            end_bytes, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+            self.profile.stages.append(
+                StageProfile(
+                    name=name,
+                    seconds=round(seconds, 6),
+                    peak_bytes=peak - start_bytes,
+                    retained_bytes=end_bytes - start_bytes,
+                    top_allocations=self._top_sites(before, after),
+                )
+            )
+            self.profile.peak_bytes = max(self.profile.peak_bytes, peak)
+
+    def _top_sites(
+        self,
+        before: tracemalloc.Snapshot,
+        after: tracemalloc.Snapshot,
+    ) -> List[AllocationSite]:
+        exclude = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        differences = after.filter_traces(exclude).compare_to(
+            before.filter_traces(exclude), "lineno"
+        )
+        sites: List[AllocationSite] = []
+        for diff in differences:
+            if diff.size_diff <= 0:
+                continue
+            frame = diff.traceback[0]
+            sites.append(
+                AllocationSite(
+                    file=frame.filename,
+                    line=frame.lineno,
+                    size_bytes=diff.size_diff,
+                    count=diff.count_diff,
+                )
+            )
+            if len(sites) == self.top_sites:
+                break
+        return sites
+
+    def write(self, path: Path) -> None:
+        """Write the profile as JSON."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(self.profile.to_json() + "\n", encoding="utf-8")
@@ -0,0 +1,456 @@
+"""
+Composable generation pipeline: fetch → parse → row stages → render → write.
+
+Row stages are registered callables that take the whole batch of parsed rows
+and return a new batch, so a custom transform (normalizing legacy names,
+injecting platform-specific rows, dropping deprecated screens) is one call
+per run rather than one call per row. The built-in steps are stages too:
+
+- `dedupe`: drop duplicate rows (`codegen._deduplicate`); with a
+  `memory_budget` option it streams from the parser into the on-disk dedupe
+- `collisions`: warn about colliding function names
+- `disambiguate`: rename colliding functions
+- `rename`: map values of one field (`{"field": "screen", "mapping": {...}}`)
+- `drop`: drop rows by field value (`{"field": "screen", "values": [...]}`)
+- `append`: add the rows of another CSV file (`{"path": "ios_only.csv"}`)
+- `lint`: warn about values missing from the taxonomy libraries
+  (`{"library": "taxonomy.json", "strict": false}`, see `lint`)
+
+New stages are added with `register_stage`, or referenced without
+registering as `package.module:factory`. A factory takes the stage options
+as keyword arguments and returns the stage callable.
+"""
+
+from __future__ import annotations
+
+import json
+from contextlib import contextmanager
+from dataclasses import dataclass, field, fields, replace
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from . import progress
+from .codegen import EventRow, _deduplicate, _iter_csv_rows
+
+if TYPE_CHECKING:
+    from .emitters import Emitter
+    from .input_source import InputSource
+    from .memprofile import MemoryProfiler
+
+RowBatch = List[EventRow]
+RowStage = Callable[[RowBatch], RowBatch]
+StageFactory = Callable[..., RowStage]
+
+# Registered stage factories by name
+STAGES: Dict[str, StageFactory] = {}
+
+# Options naming the files a registered stage reads, by stage name
+STAGE_FILES: Dict[str, Tuple[str, ...]] = {}
+
+_ROW_FIELDS = tuple(f.name for f in fields(EventRow))
+
+
+def register_stage(
+    name: str, files: Sequence[str] = ()
+) -> Callable[[StageFactory], StageFactory]:
+    """
+    Register a stage factory under a name usable from `--stage` and configs.
+
+    Args:
+        name: Stage name
+        files: Options holding paths of files the stage reads; their contents
+            are part of the artifact cache key (see `stage_files`)
+
+    Example:
+        @register_stage("strip_legacy_prefix")
+        def strip_legacy_prefix(prefix="legacy_"):
+            def stage(rows):
+                return [replace(r, screen=r.screen.removeprefix(prefix)) for r in rows]
+            return stage
+    """
+
+    def decorator(factory: StageFactory) -> StageFactory:
+        STAGES[name] = factory
+        STAGE_FILES[name] = tuple(files)
+        return factory
+
+    return decorator
+
+
+@dataclass(frozen=True)
+class StageSpec:
+    """A stage name plus the options passed to its factory."""
+
+    name: str
+    options: Mapping[str, Any] = field(default_factory=dict)
+
+    def to_json(self) -> List[object]:
+        return [self.name, dict(self.options)]
+
+
+def parse_stage_spec(value: str) -> StageSpec:
+    """
+    Parse a `--stage` value: `NAME` or `NAME={"option": ...}`.
+
+    Raises:
+        ValueError: If the options are not a JSON object
+    """
+    name, sep, options = value.partition("=")
+    if not sep:
+        return StageSpec(name.strip())
+    try:
+        parsed = json.loads(options)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid options for stage '{name}': {e}") from e
+    if not isinstance(parsed, dict):
+        raise ValueError(f"Options for stage '{name}' must be a JSON object")
+    return StageSpec(name.strip(), parsed)
+
+
+def load_pipeline_config(path: Path) -> List[StageSpec]:
+    """
+    Load stages from a JSON config file.
+
+    The file holds `{"stages": [...]}`, where each stage is a name or
+    `{"name": ..., "options": {...}}`.
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        ValueError: If the file is not a valid pipeline config
+    """
+    if not path.is_file():
+        raise FileNotFoundError(f"Pipeline config not found: {path}")
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid pipeline config {path}: {e}") from e
+
+    stages = data.get("stages") if isinstance(data, dict) else None
+    if not isinstance(stages, list):
+        raise ValueError(f"Pipeline config {path} must contain a \"stages\" list")
+
+    specs: List[StageSpec] = []
+    for entry in stages:
+        if isinstance(entry, str):
+            specs.append(StageSpec(entry))
+        elif (
+            isinstance(entry, dict)
+            and isinstance(entry.get("name"), str)
+            and isinstance(entry.get("options", {}), dict)
+        ):
+            specs.append(StageSpec(entry["name"], entry.get("options", {})))
+        else:
+            raise ValueError(f"Invalid stage in pipeline config {path}: {entry!r}")
+    return specs
+
+
+def _resolve_factory(name: str) -> StageFactory:
+    factory = STAGES.get(name)
+    if factory is not None:
+        return factory
+    if ":" in name:
+        import importlib
+
+        module_name, _, attribute = name.partition(":")
+        try:
+            return getattr(importlib.import_module(module_name), attribute)
+        except (ImportError, AttributeError) as e:
+            raise ValueError(f"Cannot load stage '{name}': {e}") from e
+    raise ValueError(
+        f"Unknown pipeline stage '{name}'. "
+        f"Registered stages: {', '.join(sorted(STAGES))}"
+    )
+
+
+def stage_files(specs: Sequence[StageSpec]) -> List[Path]:
+    """Files read by registered stages, from the options declared in `register_stage`."""
+    paths: List[Path] = []
+    for spec in specs:
+        for option in STAGE_FILES.get(spec.name, ()):
+            value = spec.options.get(option)
+            if isinstance(value, str):
+                paths.append(Path(value))
+    return paths
+
+
+def unregistered_stages(specs: Sequence[StageSpec]) -> List[str]:
+    """
+    Names of `module:factory` stages.
+
+    Their code and the files they read are unknown, so runs using them
+    can't be cached.
+    """
+    return [spec.name for spec in specs if spec.name not in STAGES]
+
+
+def build_stage(spec: StageSpec) -> RowStage:
+    """
+    Create the stage callable for a spec.
+
+    Raises:
+        ValueError: If the stage is unknown or its options are invalid
+    """
+    factory = _resolve_factory(spec.name)
+    try:
+        return factory(**spec.options)
+    except TypeError as e:
+        raise ValueError(f"Invalid options for stage '{spec.name}': {e}") from e
+
+
+def default_stages(
+    stages: Sequence[StageSpec] = (),
+    disambiguate: bool = False,
+    memory_budget: Optional[int] = None,
+    details_schema: Optional[Mapping[str, str]] = None,
+) -> List[StageSpec]:
+    """
+    Add the built-in dedupe and collision stages after custom stages.
+
+    Custom stages run first so that rows they rename or inject are
+    deduplicated too. A built-in already listed in `stages` is not added
+    again, which lets a config place it explicitly. With a `details_schema`
+    (`--typed-details`), the collision stages compare typed signatures.
+    """
+    names = {spec.name for spec in stages}
+    result = list(stages)
+    if details_schema is not None:
+        result = [
+            replace(spec, options={"details_schema": details_schema, **spec.options})
+            if spec.name in ("collisions", "disambiguate")
+            else spec
+            for spec in result
+        ]
+    if "dedupe" not in names:
+        options = {} if memory_budget is None else {"memory_budget": memory_budget}
+        result.append(StageSpec("dedupe", options))
+    if not names & {"collisions", "disambiguate"}:
+        options = {} if details_schema is None else {"details_schema": details_schema}
+        result.append(StageSpec("disambiguate" if disambiguate else "collisions", options))
+    return result
+
+
+class Pipeline:
+    """Runs an input source through row stages and writes every target."""
+
+    def __init__(
+        self,
+        stages: Sequence[StageSpec],
+        profiler: Optional[MemoryProfiler] = None,
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            stages: Row stages in run order
+            profiler: Record the memory used by each stage (see `memprofile`)
+
+        Raises:
+            ValueError: If a stage is unknown or its options are invalid
+        """
+        self.specs = list(stages)
+        self.stages = [build_stage(spec) for spec in self.specs]
+        self.profiler = profiler
+
+    @contextmanager
+    def _stage(self, name: str) -> Iterator[None]:
+        if self.profiler is None:
+            # memprofile (and tracemalloc) is only imported with --memprofile
+            with progress.current().stage(name):
+                yield
+            return
+        with self.profiler.stage(name), progress.current().stage(name):
+            yield
+
+    def _count_parsed(self, rows: Iterable[EventRow]) -> Iterator[EventRow]:
+        # Counted on the way through, since streaming stages never hold them all
+        count = 0
+        for row in rows:
+            count += 1
+            yield row
+        if self.profiler is not None:
+            self.profiler.profile.metadata["rows_parsed"] = count
+
+    def rows(self, input_source: InputSource) -> RowBatch:
+        """Fetch, parse and transform the rows of an input source."""
+        with self._stage("fetch"):
+            # Streaming sources (local CSV files) only open the file here
+            tables = list(input_source.iter_tables())
+        parsed = progress.current().count_rows(
+            row for _, csv_rows in tables for row in _iter_csv_rows(csv_rows)
+        )
+        if self.profiler is not None:
+            parsed = self._count_parsed(parsed)
+
+        specs, stages = self.specs, self.stages
+        if stages and getattr(stages[0], "streaming", False):
+            # Parsing streams straight into the first stage
+            with self._stage(f"parse+{specs[0].name}"):
+                rows = stages[0](parsed)
+                del tables, parsed
+            specs, stages = specs[1:], stages[1:]
+        else:
+            if any(getattr(row_stage, "streaming", False) for row_stage in stages):
+                progress.warn(
+                    "memory",
+                    f"⚠️ Stage '{specs[0].name}' runs before the on-disk dedupe, so "
+                    "every parsed row is held in memory and --dedupe-memory-mb "
+                    "doesn't bound it. List \"dedupe\" with a \"memory_budget\" "
+                    "option first in the pipeline config to stream the input.",
+                )
+            with self._stage("parse"):
+                rows = list(parsed)
+                del tables, parsed
+
+        for spec, row_stage in zip(specs, stages):
+            with self._stage(spec.name):
+                rows = row_stage(rows)
+        return rows
+
+    def run(
+        self,
+        input_source: InputSource,
+        emitters: Sequence[Emitter],
+        output_paths: Sequence[Path],
+    ) -> int:
+        """
+        Generate and write every target.
+
+        Returns:
+            Number of functions generated per target
+
+        Raises:
+            FileNotFoundError: If input source is not accessible
+            ValueError: If input data is invalid
+        """
+        from .emitters import render_targets
+        from .locking import atomic_write_text
+
+        rows = self.rows(input_source)
+
+        with self._stage("render"):
+            contents = render_targets(emitters, rows)
+
+        # Replaced atomically so concurrent readers never see a partial file
+        with self._stage("write"):
+            for output_path, content in zip(output_paths, contents):
+                atomic_write_text(output_path, content)
+
+        if self.profiler is not None:
+            self.profiler.profile.metadata["functions"] = len(rows)
+            self.profiler.profile.metadata["targets"] = [e.name for e in emitters]
+        return len(rows)
+
+
+def _check_field(name: str) -> None:
+    if name not in _ROW_FIELDS:
+        raise ValueError(
+            f"Unknown row field '{name}' (expected one of: {', '.join(_ROW_FIELDS)})"
+        )
+
+
+@register_stage("dedupe")
+def dedupe_stage(memory_budget: Optional[int] = None) -> RowStage:
+    if memory_budget is None:
+        return _deduplicate
+
+    from .external_dedupe import deduplicate_external
+
+    def stage(rows: Iterable[EventRow]) -> RowBatch:
+        return list(deduplicate_external(rows, memory_budget))
+
+    # Accepts rows lazily, so the parser never materializes the input
+    stage.streaming = True  # type: ignore[attr-defined]
+    return stage
+
+
+@register_stage("collisions")
+def collisions_stage(details_schema: Optional[Mapping[str, str]] = None) -> RowStage:
+    from .symbols import build_symbol_table, report_collisions
+
+    def stage(rows: RowBatch) -> RowBatch:
+        report_collisions(build_symbol_table(rows, details_schema).collisions)
+        return rows
+
+    return stage
+
+
+@register_stage("disambiguate")
+def disambiguate_stage(details_schema: Optional[Mapping[str, str]] = None) -> RowStage:
+    from .symbols import disambiguate_rows
+
+    def stage(rows: RowBatch) -> RowBatch:
+        return disambiguate_rows(rows, details_schema)
+
+    return stage
+
+
+@register_stage("rename")
+def rename_stage(field: str, mapping: Mapping[str, str]) -> RowStage:
+    _check_field(field)
+
+    def stage(rows: RowBatch) -> RowBatch:
+        return [
+            replace(row, **{field: mapping[getattr(row, field)]})
+            if getattr(row, field) in mapping
+            else row
+            for row in rows
+        ]
+
+    return stage
+
+
+@register_stage("drop")
+def drop_stage(field: str, values: Sequence[str]) -> RowStage:
+    _check_field(field)
+    dropped = frozenset(values)
+
+    def stage(rows: RowBatch) -> RowBatch:
+        return [row for row in rows if getattr(row, field) not in dropped]
+
+    return stage
+
+
+@register_stage("append", files=("path",))
+def append_stage(path: str) -> RowStage:
+    from .input_source import FileInputSource
+
+    source = FileInputSource(Path(path))
+
+    def stage(rows: RowBatch) -> RowBatch:
+        tables = source.iter_tables()
+        return rows + [row for _, csv_rows in tables for row in _iter_csv_rows(csv_rows)]
+
+    return stage
+
+
+@register_stage("lint", files=("library",))
+def lint_stage(
+    library: str, strict: bool = False, max_suggestions: int = 3
+) -> RowStage:
+    from .lint import lint_rows, load_library
+
+    taxonomy = load_library(Path(library))
+
+    def stage(rows: RowBatch) -> RowBatch:
+        issues = lint_rows(rows, taxonomy, max_suggestions)
+        for issue in issues:
+            progress.warn("lint", issue.message())
+        if strict and issues:
+            raise ValueError(
+                f"{len(issues)} taxonomy value(s) missing from the libraries in {library}"
+            )
+        return rows
+
+    return stage
@@ -0,0 +1,244 @@
+"""
+Progress and warning output of a generator run (`--progress-format`).
+
+Code that reports progress or warnings calls the module functions (`warn`,
+`fetched`, ...), which forward to the reporter of the current run:
+
+- `ProgressReporter` (`text`, the default) prints warnings to stderr and
+  messages to stdout as they happen, exactly like the plain CLI output.
+- `JsonlProgressReporter` (`jsonl`) writes one JSON event per line to stdout
+  and flushes every line, so front-ends such as the macOS app can show the
+  run live. Fetch and parse progress is sent at most every `interval`
+  seconds, and after the first `max_warnings` warnings of a kind, further
+  ones are only counted and sent as periodic aggregates, so the output
+  stays bounded however many rows conflict.
+
+Events (all with `"event"` and `"time"` keys):
+
+    {"event": "stage", "stage": "parse", "status": "start"}
+    {"event": "stage", "stage": "parse", "status": "end", "seconds": 0.12}
+    {"event": "fetch", "bytes": 1048576}
+    {"event": "rows", "parsed": 20000}
+    {"event": "warning", "kind": "conflict", "message": "⚠️ Conflicting rows ..."}
+    {"event": "warnings", "kind": "conflict", "suppressed": 480, "total": 500}
+    {"event": "message", "text": "📦 Cache hit ..."}
+    {"event": "error", "message": "Input file not found: ..."}
+    {"event": "summary", "status": "ok", "functions": 812, "outputs": [...],
+     "warnings": {"conflict": 500}, "seconds": 1.7}
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import IO, Dict, Iterable, Iterator, Optional, Sequence, TypeVar
+
+T = TypeVar("T")
+
+# Warnings of one kind sent individually before they are only counted
+DEFAULT_MAX_WARNINGS = 20
+
+# Minimum seconds between throttled progress and aggregate events
+DEFAULT_INTERVAL = 0.25
+
+# Rows between checks of the throttle clock while parsing
+_ROW_CHECK_EVERY = 1000
+
+PROGRESS_FORMATS = ("text", "jsonl")
+
+
+class ProgressReporter:
+    """Plain CLI output: warnings on stderr, messages on stdout."""
+
+    def warning(self, kind: str, message: str) -> None:
+        print(message, file=sys.stderr)
+
+    def message(self, text: str) -> None:
+        print(text)
+
+    def error(self, message: str) -> None:
+        print(f"❌ {message}", file=sys.stderr)
+
+    def fetched(self, nbytes: int) -> None:
+        """Record `nbytes` more bytes of input downloaded or read."""
+
+    def count_rows(self, rows: Iterable[T]) -> Iterable[T]:
+        """Pass rows through, reporting how many were parsed."""
+        return rows
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        yield
+
+    def summary(self, functions: int, outputs: Sequence[str]) -> None:
+        for output in outputs:
+            print(f"✅ Generated {functions} functions → {output}")
+
+    def failed(self) -> None:
+        """Finish a run that ended with an error."""
+
+
+class JsonlProgressReporter(ProgressReporter):
+    """Flushed JSON-lines events with throttled progress and warnings."""
+
+    def __init__(
+        self,
+        stream: Optional[IO[str]] = None,
+        max_warnings: int = DEFAULT_MAX_WARNINGS,
+        interval: float = DEFAULT_INTERVAL,
+    ):
+        """
+        Initialize the reporter.
+
+        Args:
+            stream: Output stream (default: the current `sys.stdout`)
+            max_warnings: Warnings of one kind sent individually
+            interval: Minimum seconds between throttled events
+        """
+        self.stream = stream
+        self.max_warnings = max_warnings
+        self.interval = interval
+        self.warnings: Dict[str, int] = {}
+        self._suppressed: Dict[str, int] = {}
+        self._fetched = 0
+        self._fetched_sent = 0
+        self._rows = 0
+        self._started = time.monotonic()
+        self._last_sent: Optional[float] = None
+
+    def _emit(self, event: str, **fields: object) -> None:
+        import json
+
+        payload = {"event": event, "time": round(time.monotonic() - self._started, 3)}
+        payload.update(fields)
+        stream = self.stream or sys.stdout
+        stream.write(json.dumps(payload, ensure_ascii=False) + "\n")
+        stream.flush()
+
+    def _due(self) -> bool:
+        now = time.monotonic()
+        if self._last_sent is not None and now - self._last_sent < self.interval:
+            return False
+        self._last_sent = now
+        return True
+
+    def _flush_pending(self) -> None:
+        if self._fetched != self._fetched_sent:
+            self._fetched_sent = self._fetched
+            self._emit("fetch", bytes=self._fetched)
+        for kind, suppressed in self._suppressed.items():
+            if suppressed:
+                self._emit(
+                    "warnings", kind=kind, suppressed=suppressed, total=self.warnings[kind]
+                )
+                self._suppressed[kind] = 0
+
+    def warning(self, kind: str, message: str) -> None:
+        count = self.warnings[kind] = self.warnings.get(kind, 0) + 1
+        if count <= self.max_warnings:
+            self._emit("warning", kind=kind, message=message)
+            return
+        self._suppressed[kind] = self._suppressed.get(kind, 0) + 1
+        if self._due():
+            self._flush_pending()
+
+    def message(self, text: str) -> None:
+        self._emit("message", text=text)
+
+    def error(self, message: str) -> None:
+        self._emit("error", message=message)
+
+    def fetched(self, nbytes: int) -> None:
+        self._fetched += nbytes
+        if self._due():
+            self._flush_pending()
+
+    def count_rows(self, rows: Iterable[T]) -> Iterator[T]:
+        count = self._rows
+        for row in rows:
+            count += 1
+            if count % _ROW_CHECK_EVERY == 0 and self._due():
+                self._emit("rows", parsed=count)
+            yield row
+        self._rows = count
+        self._emit("rows", parsed=count)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        self._flush_pending()
+        self._emit("stage", stage=name, status="start")
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self._flush_pending()
+            self._emit(
+                "stage",
+                stage=name,
+                status="end",
+                seconds=round(time.monotonic() - started, 3),
+            )
+
+    def _summary(self, status: str, **fields: object) -> None:
+        self._flush_pending()
+        self._emit(
+            "summary",
+            status=status,
+            warnings=dict(self.warnings),
+            seconds=round(time.monotonic() - self._started, 3),
+            **fields,
+        )
+
+    def summary(self, functions: int, outputs: Sequence[str]) -> None:
+        self._summary("ok", functions=functions, outputs=list(outputs))
+
+    def failed(self) -> None:
+        self._summary("error")
+
+
+_current: ContextVar[ProgressReporter] = ContextVar("progress_reporter")
+_DEFAULT = ProgressReporter()
+
+
+def create_reporter(progress_format: str) -> ProgressReporter:
+    """
+    Create the reporter for a `--progress-format` value.
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    if progress_format == "text":
+        return ProgressReporter()
+    if progress_format == "jsonl":
+        return JsonlProgressReporter()
+    raise ValueError(
+        f"Unknown progress format: {progress_format} "
+        f"(expected one of: {', '.join(PROGRESS_FORMATS)})"
+    )
+
+
+def current() -> ProgressReporter:
+    """Reporter of the current run (plain output outside `reporting`)."""
+    return _current.get(_DEFAULT)
+
+
+@contextmanager
+def reporting(reporter: ProgressReporter) -> Iterator[ProgressReporter]:
+    """Send progress and warnings of the enclosed code to `reporter`."""
+    token = _current.set(reporter)
+    try:
+        yield reporter
+    finally:
+        _current.reset(token)
+
+
+def warn(kind: str, message: str) -> None:
+    """Report a warning such as a conflicting row or a name collision."""
+    current().warning(kind, message)
+
+
+def fetched(nbytes: int) -> None:
+    """Report `nbytes` more bytes of input downloaded or read."""
+    current().fetched(nbytes)
@@ -0,0 +1,250 @@
+"""
+Network benchmark for Google Sheets runs of the analytics_codegen CLI.
+
+Serves a generated sheet from a local `sheets_server` stand-in under several
+network scenarios (latency, throttled bandwidth, chunked transfer, a large
+sheet, 429/5xx bursts, a connection reset) and measures end-to-end
+`cli.main` runs against it: wall time (median of untraced runs), peak
+Python heap of one `tracemalloc` run, requests served and bytes sent.
+
+Usage:
+    python -m analytics_codegen.sheets_benchmark [--rows 20000] [--repeat 3]
+        [--scenario NAME ...] [--format text|json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import statistics
+import tempfile
+import time
+from contextlib import redirect_stderr, redirect_stdout
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from .sheets_server import RESET, NetworkProfile, SheetsStandIn
+
+SHEET_ID = "BENCHMARK"
+SHEET_URL = f"https://docs.google.com/spreadsheets/d/{SHEET_ID}/edit#gid=0"
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """A network profile plus the sheet size it is measured with."""
+
+    name: str
+    profile: NetworkProfile = NetworkProfile()
+    # Multiplies `--rows` (large-body scenarios)
+    rows_scale: int = 1
+    description: str = ""
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    s.name: s
+    for s in (
+        Scenario("baseline", description="No added latency or limits"),
+        Scenario("latency", NetworkProfile(latency=0.2), description="200 ms to first byte"),
+        Scenario(
+            "throttled",
+            NetworkProfile(bandwidth=1024 * 1024, chunk_size=16 * 1024),
+            description="1 MB/s",
+        ),
+        Scenario("chunked", NetworkProfile(chunked=True), description="Chunked transfer"),
+        Scenario("large", rows_scale=10, description="10x the rows"),
+        Scenario(
+            "rate_limited",
+            NetworkProfile(faults=(429,), retry_after=1),
+            description="First request answered with 429",
+        ),
+        Scenario(
+            "server_errors",
+            NetworkProfile(faults=(503, 502)),
+            description="First requests answered with 503, 502",
+        ),
+        Scenario(
+            "reset",
+            NetworkProfile(faults=(RESET,)),
+            description="Connection closed halfway through the body",
+        ),
+    )
+}
+
+
+@dataclass
+class ScenarioResult:
+    """Measurements of one scenario."""
+
+    name: str
+    rows: int
+    exit_code: int
+    seconds: float
+    peak_bytes: int
+    requests: int
+    bytes_sent: int
+    runs: List[float] = field(default_factory=list)
+
+
+def make_sheet(rows: int) -> bytes:
+    """
+    Generate a CSV export with a header row and `rows` distinct events.
+
+    Every tenth row has `event_details`, every fiftieth a parameterized
+    section, and the padding column stands for the notes columns real
+    sheets carry.
+    """
+    out = io.StringIO()
+    out.write(
+        "Screen:,Section:,Component:,Element:,Action:,"
+        "event_details,Advertisement ID,Notes\n"
+    )
+    for i in range(rows):
+        section = f"section_{i % 97}|section_{i % 89}" if i % 50 == 0 else f"section_{i}"
+        details = "price|float, category_id|integer" if i % 10 == 0 else ""
+        out.write(
+            f"screen_{i % 400},{section},component_{i % 60},element_{i % 30},"
+            f"tap,\"{details}\",,note for row {i}\n"
+        )
+    return out.getvalue().encode("utf-8")
+
+
+def _run_cli(output: Path) -> int:
+    from .cli import main
+
+    # Progress and warnings are not part of the measurement
+    with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+        return main(["--input", SHEET_URL, "--output", str(output)])
+
+
+def run_scenario(
+    server: SheetsStandIn,
+    scenario: Scenario,
+    rows: int,
+    repeat: int = 3,
+    trace_memory: bool = True,
+) -> ScenarioResult:
+    """
+    Measure `cli.main` against a running stand-in with the scenario's profile.
+
+    The fault sequence starts over for every run.
+    """
+    import tracemalloc
+
+    from .cli import CACHE_DIR_ENV, SHEETS_BASE_URL_ENV
+
+    saved = {name: os.environ.get(name) for name in (CACHE_DIR_ENV, SHEETS_BASE_URL_ENV)}
+    os.environ.pop(CACHE_DIR_ENV, None)
+    os.environ[SHEETS_BASE_URL_ENV] = server.base_url
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            output = Path(tmp) / "Tracking.swift"
+            runs: List[float] = []
+            exit_code = 0
+            for _ in range(max(1, repeat)):
+                server.reset(scenario.profile)
+                started = time.perf_counter()
+                exit_code = _run_cli(output)
+                runs.append(time.perf_counter() - started)
+            requests, bytes_sent = len(server.requests), server.bytes_sent
+
+            peak = 0
+            if trace_memory:
+                server.reset(scenario.profile)
+                tracemalloc.start()
+                try:
+                    _run_cli(output)
+                    peak = tracemalloc.get_traced_memory()[1]
+                finally:
+                    tracemalloc.stop()
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+    return ScenarioResult(
+        name=scenario.name,
+        rows=rows,
+        exit_code=exit_code,
+        seconds=statistics.median(runs),
+        peak_bytes=peak,
+        requests=requests,
+        bytes_sent=bytes_sent,
+        runs=runs,
+    )
+
+
+def run_benchmark(
+    scenarios: Sequence[Scenario],
+    rows: int = 20000,
+    repeat: int = 3,
+    trace_memory: bool = True,
+) -> List[ScenarioResult]:
+    """Run every scenario against one stand-in server."""
+    sheets: Dict[str, bytes] = {f"{SHEET_ID}.csv": make_sheet(min(rows, 100))}
+    with SheetsStandIn(sheets) as server:
+        # Import the generation modules before the first timed run
+        run_scenario(server, Scenario("warmup"), 0, repeat=1, trace_memory=False)
+        results = []
+        for scenario in scenarios:
+            scenario_rows = rows * scenario.rows_scale
+            sheets[f"{SHEET_ID}.csv"] = make_sheet(scenario_rows)
+            results.append(run_scenario(server, scenario, scenario_rows, repeat, trace_memory))
+        return results
+
+
+def format_results(results: Sequence[ScenarioResult]) -> str:
+    lines = [
+        f"{'scenario':<14} {'rows':>8} {'exit':>4} {'time (s)':>9} "
+        f"{'peak (MB)':>9} {'requests':>8} {'sent (KB)':>10}"
+    ]
+    for r in results:
+        lines.append(
+            f"{r.name:<14} {r.rows:>8} {r.exit_code:>4} {r.seconds:>9.3f} "
+            f"{r.peak_bytes / (1024 * 1024):>9.1f} {r.requests:>8} {r.bytes_sent / 1024:>10.0f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark Google Sheets runs against a local stand-in server.",
+        epilog="Scenarios: "
+        + "; ".join(f"{s.name}: {s.description}" for s in SCENARIOS.values()),
+    )
+    parser.add_argument(
+        "--rows", type=int, default=20000, help="Rows of the generated sheet (default: 20000)"
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Timed runs per scenario; the median is reported (default: 3)",
+    )
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS),
+        help="Scenario to run (repeatable; default: all)",
+    )
+    parser.add_argument(
+        "--no-memory", action="store_true", help="Skip the tracemalloc run"
+    )
+    parser.add_argument("--format", choices=("text", "json"), default="text")
+    args = parser.parse_args(argv)
+
+    scenarios = [SCENARIOS[name] for name in args.scenario or SCENARIOS]
+    results = run_benchmark(scenarios, args.rows, args.repeat, not args.no_memory)
+    if args.format == "json":
+        print(json.dumps([asdict(r) for r in results], indent=2))
+    else:
+        print(format_results(results))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,360 @@
+"""
+Local stand-in for the Google Sheets export endpoints.
+
+Serves `/spreadsheets/d/{id}/export?format=csv|xlsx&gid=N` and the
+`/spreadsheets/d/{id}/gviz/tq` query endpoint from fixture files, with a
+configurable network profile (latency, bandwidth, chunked transfer and
+injected faults), so fetch behavior can be tested and benchmarked offline.
+
+Fixtures are looked up as `{id}/{gid}.{format}`, then `{id}.{format}`, in a
+directory or in a mapping of those names to bytes. Point the CLI at the
+server with `ANALYTICS_CODEGEN_SHEETS_BASE_URL` (see `cli`), or pass
+`base_url` to `GoogleSheetsInputSource`.
+
+Usage:
+    python -m analytics_codegen.sheets_server FIXTURE_DIR [--port 8765]
+        [--latency-ms 200] [--bandwidth-kbps 512] [--chunked]
+        [--faults 429,503,reset]
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import re
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List, Mapping, Optional, Sequence, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+# Fault that sends the headers and half of the body, then closes the connection
+RESET = "reset"
+
+Fault = Union[int, str]
+Fixtures = Union[Path, Mapping[str, bytes]]
+
+_PATH = re.compile(r"^/spreadsheets/d/([^/]+)/(export|gviz/tq)$")
+
+
+@dataclass(frozen=True)
+class NetworkProfile:
+    """How the stand-in delivers responses."""
+
+    # Seconds before the response headers are sent
+    latency: float = 0.0
+    # Body bytes per second (None: as fast as possible)
+    bandwidth: Optional[int] = None
+    # Send the body with `Transfer-Encoding: chunked` instead of a length
+    chunked: bool = False
+    chunk_size: int = 64 * 1024
+    # Responses to the first requests, in order: HTTP status codes or `RESET`
+    faults: Sequence[Fault] = ()
+    # `Retry-After` header of 429 and 503 faults
+    retry_after: Optional[int] = None
+
+
+def parse_faults(value: str) -> Tuple[Fault, ...]:
+    """
+    Parse a comma-separated fault list such as `429,503,reset`.
+
+    Raises:
+        ValueError: If an entry is neither an HTTP status nor `reset`
+    """
+    faults: List[Fault] = []
+    for part in (p.strip() for p in value.split(",")):
+        if not part:
+            continue
+        if part == RESET:
+            faults.append(RESET)
+        elif part.isdigit() and 400 <= int(part) <= 599:
+            faults.append(int(part))
+        else:
+            raise ValueError(
+                f"Invalid fault '{part}' (expected an HTTP error status or '{RESET}')"
+            )
+    return tuple(faults)
+
+
+def _column_index(letters: str) -> int:
+    index = 0
+    for ch in letters.upper():
+        index = index * 26 + (ord(ch) - ord("A") + 1)
+    return index - 1
+
+
+def _query_rows(rows: List[List[str]], params: Mapping[str, str]) -> List[List[str]]:
+    """Apply the `range` and `tq` (select/limit) parameters of a gviz query."""
+    first_column = 0
+    if "range" in params:
+        # The sheet name of "Sheet1!B1:J" is ignored: tabs are chosen by gid
+        cells = params["range"].rpartition("!")[2]
+        match = re.match(r"([A-Z]+)(\d*)(?::([A-Z]+)(\d*))?", cells)
+        if match:
+            first_column = _column_index(match.group(1))
+            first_row = int(match.group(2) or 1) - 1
+            last_column = _column_index(match.group(3)) + 1 if match.group(3) else None
+            last_row = int(match.group(4)) if match.group(4) else None
+            rows = [row[first_column:last_column] for row in rows[first_row:last_row]]
+    query = params.get("tq", "")
+    select = re.search(r"select ([A-Z, ]+?)(?: limit|$)", query)
+    if select:
+        columns = [_column_index(c.strip()) - first_column for c in select.group(1).split(",")]
+        rows = [[row[c] if c < len(row) else "" for c in columns] for row in rows]
+    limit = re.search(r"limit (\d+)", query)
+    if limit:
+        rows = rows[: int(limit.group(1))]
+    return rows
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: "_Server"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        stand_in = self.server.stand_in
+        fault = stand_in._record(self.path)
+        profile = stand_in.profile
+        if profile.latency:
+            time.sleep(profile.latency)
+
+        url = urlsplit(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        match = _PATH.match(url.path)
+        if isinstance(fault, int):
+            self._send_error(fault, profile)
+            return
+        if match is None:
+            self._send_error(404, profile)
+            return
+
+        sheet_id, endpoint = match.groups()
+        gid = params.get("gid", "0")
+        if endpoint == "export":
+            file_format = params.get("format", "csv")
+            body = stand_in.fixture(sheet_id, gid, file_format)
+            content_type = (
+                "text/csv"
+                if file_format == "csv"
+                else "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            )
+        else:
+            data = stand_in.fixture(sheet_id, gid, "csv")
+            if data is not None:
+                rows = list(csv.reader(io.StringIO(data.decode("utf-8"))))
+                out = io.StringIO()
+                csv.writer(out, quoting=csv.QUOTE_ALL, lineterminator="\n").writerows(
+                    _query_rows(rows, params)
+                )
+                data = out.getvalue().encode("utf-8")
+            body, content_type = data, "text/csv"
+
+        if body is None:
+            self._send_error(404, profile)
+            return
+        self._send_body(body, content_type, profile, reset=fault == RESET)
+
+    def _send_error(self, status: int, profile: NetworkProfile) -> None:
+        body = f"Error {status}\n".encode("utf-8")
+        self.send_response(status)
+        if status in (429, 503) and profile.retry_after is not None:
+            self.send_header("Retry-After", str(profile.retry_after))
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_body(
+        self, body: bytes, content_type: str, profile: NetworkProfile, reset: bool
+    ) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        if profile.chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+        else:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+
+        view = memoryview(body)
+        end = len(body) // 2 if reset else len(body)
+        started = time.monotonic()
+        sent = 0
+        while sent < end:
+            chunk = view[sent : min(sent + profile.chunk_size, end)]
+            if profile.bandwidth:
+                # A chunk is written once the bandwidth allows all of it
+                delay = (sent + len(chunk)) / profile.bandwidth - (time.monotonic() - started)
+                if delay > 0:
+                    time.sleep(delay)
+            # Counted before the write: the client may finish reading (and a
+            # test check `bytes_sent`) before this thread runs again
+            self.server.stand_in._sent(len(chunk))
+            if profile.chunked:
+                self.wfile.write(b"%x\r\n" % len(chunk))
+                self.wfile.write(chunk)
+                self.wfile.write(b"\r\n")
+            else:
+                self.wfile.write(chunk)
+            sent += len(chunk)
+
+        if reset:
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        if profile.chunked:
+            self.wfile.write(b"0\r\n\r\n")
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    stand_in: "SheetsStandIn"
+
+
+class SheetsStandIn:
+    """
+    Local HTTP server serving Google Sheets exports from fixtures.
+
+    Example:
+        with SheetsStandIn(Path("fixtures"), NetworkProfile(latency=0.2)) as server:
+            GoogleSheetsInputSource(url, base_url=server.base_url).get_csv_rows()
+    """
+
+    def __init__(
+        self,
+        fixtures: Fixtures,
+        profile: NetworkProfile = NetworkProfile(),
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        Initialize the server (not started).
+
+        Args:
+            fixtures: Fixture directory, or fixture names mapped to bytes
+            profile: Network profile of every response
+            host: Interface to listen on
+            port: Port to listen on (0: any free port)
+        """
+        self.fixtures = fixtures
+        self.profile = profile
+        self.host = host
+        self.port = port
+        self.requests: List[str] = []
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._server: Optional[_Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """Spreadsheets URL prefix to use instead of `SHEETS_BASE_URL`."""
+        return f"http://{self.host}:{self.port}/spreadsheets/d"
+
+    def fixture(self, sheet_id: str, gid: str, file_format: str) -> Optional[bytes]:
+        """Fixture bytes for a sheet tab and format, or None if there is none."""
+        for name in (f"{sheet_id}/{gid}.{file_format}", f"{sheet_id}.{file_format}"):
+            if isinstance(self.fixtures, Path):
+                path = self.fixtures / name
+                if path.is_file():
+                    return path.read_bytes()
+            elif name in self.fixtures:
+                return self.fixtures[name]
+        return None
+
+    def reset(self, profile: Optional[NetworkProfile] = None) -> None:
+        """Clear the request log and start the fault sequence over."""
+        with self._lock:
+            if profile is not None:
+                self.profile = profile
+            self.requests = []
+            self.bytes_sent = 0
+
+    def _record(self, path: str) -> Optional[Fault]:
+        with self._lock:
+            index = len(self.requests)
+            self.requests.append(path)
+            faults = self.profile.faults
+            return faults[index] if index < len(faults) else None
+
+    def _sent(self, nbytes: int) -> None:
+        with self._lock:
+            self.bytes_sent += nbytes
+
+    def start(self) -> "SheetsStandIn":
+        self._server = _Server((self.host, self.port), _Handler)
+        self._server.stand_in = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "SheetsStandIn":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Serve Google Sheets exports from fixture files."
+    )
+    parser.add_argument(
+        "fixtures",
+        type=Path,
+        help="Fixture directory ({id}.csv, {id}/{gid}.csv, {id}.xlsx)",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--bandwidth-kbps", type=float, help="Body bandwidth in KB/s")
+    parser.add_argument("--chunked", action="store_true", help="Use chunked transfer encoding")
+    parser.add_argument(
+        "--faults",
+        default="",
+        help=f"Responses to the first requests, e.g. 429,503,{RESET}",
+    )
+    parser.add_argument("--retry-after", type=int, help="Retry-After of 429/503 faults")
+    args = parser.parse_args(argv)
+
+    try:
+        profile = NetworkProfile(
+            latency=args.latency_ms / 1000.0,
+            bandwidth=int(args.bandwidth_kbps * 1024) if args.bandwidth_kbps else None,
+            chunked=args.chunked,
+            faults=parse_faults(args.faults),
+            retry_after=args.retry_after,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    server = SheetsStandIn(args.fixtures, profile, args.host, args.port).start()
+    print(f"Serving {args.fixtures} at {server.base_url}")
+    print(f"export ANALYTICS_CODEGEN_SHEETS_BASE_URL={server.base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,166 @@
+"""
+Startup-time benchmark for the analytics_codegen CLI.
+
+Runs a fresh interpreter with `-X importtime`, parses the per-module import
+times it reports on stderr and checks them against a regression budget.
+
+Usage:
+    python -m analytics_codegen.startup_budget [--budget-ms 60] [--runs 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Modules a local CSV run must never import (pulled in by urllib.request)
+FORBIDDEN_MODULES: Tuple[str, ...] = ("urllib.request", "http.client", "ssl", "email")
+
+# Cumulative import time budget for `analytics_codegen.cli`, in milliseconds
+DEFAULT_BUDGET_MS = 60.0
+
+_PACKAGE_PARENT = Path(__file__).resolve().parent.parent
+
+
+@dataclass
+class StartupReport:
+    """Result of an import-time measurement."""
+
+    module: str
+    cumulative_us: int
+    # Module name -> (self time, cumulative time) in microseconds
+    modules: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+
+    @property
+    def cumulative_ms(self) -> float:
+        return self.cumulative_us / 1000.0
+
+    def forbidden_imports(self) -> List[str]:
+        return [m for m in FORBIDDEN_MODULES if m in self.modules]
+
+    def slowest(self, limit: int = 10) -> List[Tuple[str, int]]:
+        """Return the modules with the highest self time."""
+        ranked = sorted(self.modules.items(), key=lambda item: item[1][0], reverse=True)
+        return [(name, times[0]) for name, times in ranked[:limit]]
+
+
+def parse_importtime(stderr: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Parse `-X importtime` output.
+
+    Args:
+        stderr: Interpreter stderr containing `import time:` lines
+
+    Returns:
+        Mapping of module name to (self time, cumulative time) in microseconds
+    """
+    modules: Dict[str, Tuple[int, int]] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        self_us, cumulative_us, name = parts
+        try:
+            modules[name.strip()] = (int(self_us), int(cumulative_us))
+        except ValueError:
+            # Header line: "self [us] | cumulative | imported package"
+            continue
+    return modules
+
+
+def measure(
+    code: str = "import analytics_codegen.cli",
+    module: str = "analytics_codegen.cli",
+    runs: int = 5,
+    python: Optional[str] = None,
+) -> StartupReport:
+    """
+    Measure the import time of `module` in fresh interpreters.
+
+    The fastest of `runs` measurements is reported, which filters out
+    scheduling noise from the machine running the benchmark.
+
+    Args:
+        code: Code executed by each interpreter
+        module: Module whose cumulative import time is reported
+        runs: Number of interpreter launches
+        python: Interpreter to use (default: the current one)
+
+    Returns:
+        StartupReport for the fastest run
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        p for p in (str(_PACKAGE_PARENT), env.get("PYTHONPATH", "")) if p
+    )
+    # Bytecode is cached after the first run; never measure compilation
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+
+    best: Optional[StartupReport] = None
+    for _ in range(max(1, runs)):
+        completed = subprocess.run(
+            [python or sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True,
+            text=True,
+            env=env,
+            check=True,
+        )
+        modules = parse_importtime(completed.stderr)
+        if module not in modules:
+            raise ValueError(f"Module {module} was not imported by: {code}")
+        report = StartupReport(
+            module=module,
+            cumulative_us=modules[module][1],
+            modules=modules,
+        )
+        if best is None or report.cumulative_us < best.cumulative_us:
+            best = report
+
+    assert best is not None
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Check the analytics_codegen CLI import time against a budget."
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=DEFAULT_BUDGET_MS,
+        help=f"Cumulative import time budget in ms (default: {DEFAULT_BUDGET_MS:g})",
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=5,
+        help="Number of interpreter launches; the fastest is reported (default: 5)",
+    )
+    args = parser.parse_args(argv)
+
+    report = measure(runs=args.runs)
+    print(f"{report.module}: {report.cumulative_ms:.1f} ms (budget {args.budget_ms:g} ms)")
+    for name, self_us in report.slowest(5):
+        print(f"  {self_us / 1000.0:6.1f} ms  {name}")
+
+    failed = False
+    forbidden = report.forbidden_imports()
+    if forbidden:
+        print(f"❌ Imported at startup: {', '.join(forbidden)}", file=sys.stderr)
+        failed = True
+    if report.cumulative_ms > args.budget_ms:
+        print("❌ Startup time budget exceeded", file=sys.stderr)
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,193 @@
+"""
+Symbol table of generated tracking functions.
+
+Function names are built by concatenating the PascalCase of five fields, so
+distinct rows can produce the same name (`a_b` + `c` vs `a` + `b_c`, or a
+`|` field next to a literal value equal to its type name). The symbol table
+indexes every generated name with its parameter signature in one pass and
+reports such collisions before they become Swift compile errors.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Mapping, Optional, Set, Tuple
+
+from .codegen import EventRow, _function_signature, _row_key
+from .progress import warn
+
+DUPLICATE = "duplicate"
+OVERLOAD = "overload"
+
+
+@dataclass(frozen=True)
+class Symbol:
+    """A generated function: name, parameter signature and source row."""
+
+    name: str
+    params: Tuple[str, ...]
+    row: EventRow
+
+
+@dataclass(frozen=True)
+class Collision:
+    """
+    Several rows generating the same function name.
+
+    `kind` is DUPLICATE when at least two of them also share the parameter
+    signature (an invalid redeclaration in Swift), otherwise OVERLOAD: legal
+    Swift, but one name tracks different events. Rows differing only in the
+    advertisement (`trackX()` and `trackX(advertisement:)`) are not a
+    collision.
+    """
+
+    name: str
+    kind: str
+    symbols: Tuple[Symbol, ...]
+
+
+@dataclass
+class SymbolTable:
+    """Generated function names mapped to the symbols that produce them."""
+
+    symbols: Dict[str, List[Symbol]] = field(default_factory=dict)
+
+    @property
+    def collisions(self) -> List[Collision]:
+        result: List[Collision] = []
+        for name, symbols in self.symbols.items():
+            if len(symbols) < 2:
+                continue
+            signatures = {symbol.params for symbol in symbols}
+            if len(signatures) < len(symbols):
+                kind = DUPLICATE
+            elif len({_event_fields(symbol.row) for symbol in symbols}) > 1:
+                kind = OVERLOAD
+            else:
+                # trackX() and trackX(advertisement:) track the same event:
+                # legal overloads that call sites rely on
+                continue
+            result.append(Collision(name=name, kind=kind, symbols=tuple(symbols)))
+        return result
+
+
+def _event_fields(row: EventRow) -> Tuple[str, str, str, str, str]:
+    return (row.screen, row.section, row.component, row.element, row.action)
+
+
+def build_symbol_table(
+    rows: List[EventRow], details_schema: Optional[Mapping[str, str]] = None
+) -> SymbolTable:
+    """
+    Index the generated name and parameter signature of every row.
+
+    Args:
+        rows: Deduplicated event rows
+        details_schema: Key types of `--typed-details`, which turn
+            `event_details` into typed arguments (None: untyped)
+
+    Returns:
+        SymbolTable
+    """
+    table = SymbolTable()
+    for row in rows:
+        name, params = _function_signature(row, details_schema)
+        table.symbols.setdefault(name, []).append(Symbol(name, tuple(params), row))
+    return table
+
+
+def _suffix(row: EventRow, length: int) -> str:
+    key = "|".join(_row_key(row))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:length]
+
+
+def disambiguate_rows(
+    rows: List[EventRow], details_schema: Optional[Mapping[str, str]] = None
+) -> List[EventRow]:
+    """
+    Rename colliding functions deterministically.
+
+    The first row (in input order) producing a name keeps it, so existing call
+    sites stay valid. Rows for another event get the name suffixed with a
+    short hash of an identity tuple, which does not depend on row order;
+    their advertisement variants share the new name, so they stay overloads.
+    Same-signature duplicates are suffixed with their own hash.
+
+    Args:
+        rows: Deduplicated event rows
+        details_schema: Key types of `--typed-details` (see `build_symbol_table`)
+
+    Returns:
+        Rows with `function_name` set where a rename was needed
+    """
+    table = build_symbol_table(rows, details_schema)
+    taken = set(table.symbols)
+    renamed: Dict[Tuple[str, str, str, str, str, str], str] = {}
+
+    for collision in table.collisions:
+        events: Dict[Tuple[str, str, str, str, str], List[EventRow]] = {}
+        for symbol in collision.symbols:
+            events.setdefault(_event_fields(symbol.row), []).append(symbol.row)
+        names = {_event_fields(collision.symbols[0].row): collision.name}
+        declared: Set[Tuple[str, Tuple[str, ...]]] = set()
+
+        for symbol in collision.symbols:
+            fields = _event_fields(symbol.row)
+            name = names.get(fields)
+            if name is None:
+                leader = min(events[fields], key=_row_key)
+                name = names[fields] = _free_name(collision.name, leader, taken)
+            if (name, symbol.params) in declared:
+                name = _free_name(collision.name, symbol.row, taken)
+            declared.add((name, symbol.params))
+            if name != collision.name:
+                renamed[_row_key(symbol.row)] = name
+
+    result: List[EventRow] = []
+    for row in rows:
+        new_name = renamed.get(_row_key(row))
+        if new_name is None:
+            result.append(row)
+            continue
+        warn(
+            "rename",
+            f"ℹ️ Renamed colliding function {_function_signature(row)[0]} "
+            f"→ {new_name} for {_row_text(row)}",
+        )
+        result.append(replace(row, function_name=new_name))
+    return result
+
+
+def _free_name(name: str, row: EventRow, taken: Set[str]) -> str:
+    length = 8
+    new_name = f"{name}_{_suffix(row, length)}"
+    while new_name in taken:
+        length += 4
+        new_name = f"{name}_{_suffix(row, length)}"
+    taken.add(new_name)
+    return new_name
+
+
+def _row_text(row: EventRow) -> str:
+    return (
+        f"(screen={row.screen}, section={row.section}, "
+        f"component={row.component}, element={row.element}, "
+        f"action={row.action}, advertisement={row.advertisement})"
+    )
+
+
+def report_collisions(collisions: List[Collision]) -> None:
+    """Print a warning with the offending rows for each collision."""
+    for collision in collisions:
+        if collision.kind == DUPLICATE:
+            problem = "rows generate the same function signature"
+        else:
+            problem = "rows generate overloads of the same function"
+        lines = [
+            f"⚠️ Function name collision for {collision.name}: "
+            f"{len(collision.symbols)} {problem}."
+        ]
+        for symbol in collision.symbols:
+            lines.append(f"   {_row_text(symbol.row)} → ({', '.join(symbol.params)})")
+        warn("collision", "\n".join(lines))
@@ -0,0 +1,271 @@
+"""
+Call-site index for generated tracking functions.
+
+Scans a source tree for references to `track...` functions and reports
+generated functions that are never called, and calls to `track...`
+functions that are neither generated nor defined anywhere in the tree.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Pattern, Sequence, Set
+
+# Below this many files, scanning in-process is faster than starting workers
+_PARALLEL_MIN_FILES = 256
+
+# Files handed to a worker process per task
+_CHUNK_SIZE = 128
+
+_SKIP_DIRS = {".git", ".build", "build", "DerivedData", "Pods", "Carthage", "node_modules"}
+
+
+@lru_cache(maxsize=None)
+def _identifier_pattern() -> Pattern[str]:
+    # One scan finds both definitions (`func trackX`, `let trackXDetails`)
+    # and references (`trackX`)
+    return re.compile(r"(\b(?:func|let|var)\s+)?\b(track[A-Z][A-Za-z0-9_]*)\b")
+
+
+@dataclass(frozen=True)
+class CallSite:
+    """A reference to a tracking function."""
+
+    path: str
+    line: int
+
+
+@dataclass
+class UsageIndex:
+    """Call sites per referenced name and functions defined in the tree."""
+
+    call_sites: Dict[str, List[CallSite]] = field(default_factory=dict)
+    definitions: Set[str] = field(default_factory=set)
+
+    def merge(self, other: "UsageIndex") -> None:
+        for name, sites in other.call_sites.items():
+            self.call_sites.setdefault(name, []).extend(sites)
+        self.definitions.update(other.definitions)
+
+
+@dataclass
+class UsageReport:
+    """Usage of generated functions in a source tree."""
+
+    generated: List[str]
+    call_sites: Dict[str, List[CallSite]]
+    unused: List[str]
+    missing: Dict[str, List[CallSite]]
+    files_scanned: int
+
+
+def generated_function_names(swift_source: str) -> List[str]:
+    """
+    Extract generated function names from a generated Swift file.
+
+    Args:
+        swift_source: Contents of the generated file
+
+    Returns:
+        Function names in file order
+    """
+    names: List[str] = []
+    for match in _identifier_pattern().finditer(swift_source):
+        if match.group(1) and match.group(1).startswith("func"):
+            names.append(match.group(2))
+    return list(dict.fromkeys(names))
+
+
+def _scan_text(path: str, text: str, index: UsageIndex) -> None:
+    if "track" not in text:
+        return
+
+    line = 1
+    last_pos = 0
+    for match in _identifier_pattern().finditer(text):
+        name = match.group(2)
+        if match.group(1):
+            index.definitions.add(name)
+            continue
+        start = match.start(2)
+        line += text.count("\n", last_pos, start)
+        last_pos = start
+        index.call_sites.setdefault(name, []).append(CallSite(path, line))
+
+
+def _scan_files(paths: Sequence[str]) -> UsageIndex:
+    index = UsageIndex()
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                text = f.read()
+        except OSError:
+            continue
+        _scan_text(path, text, index)
+    return index
+
+
+def iter_source_files(
+    root: Path,
+    extensions: Iterable[str] = (".swift",),
+    exclude: Iterable[Path] = (),
+) -> List[str]:
+    """
+    List source files under `root` with the given extensions.
+
+    Build output and dependency directories (Pods, DerivedData, ...) are skipped.
+    """
+    suffixes = tuple(extensions)
+    excluded = {str(p.resolve()) for p in exclude}
+    files: List[str] = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in _SKIP_DIRS]
+        for filename in filenames:
+            if filename.endswith(suffixes):
+                path = os.path.join(dirpath, filename)
+                if excluded and str(Path(path).resolve()) in excluded:
+                    continue
+                files.append(path)
+    files.sort()
+    return files
+
+
+def build_index(paths: Sequence[str], workers: int | None = None) -> UsageIndex:
+    """
+    Build the call-site index for the given files.
+
+    Large file sets are scanned in worker processes in chunks.
+
+    Args:
+        paths: Files to scan
+        workers: Number of worker processes (default: CPU count)
+
+    Returns:
+        UsageIndex with call sites sorted by path and line
+    """
+    if len(paths) < _PARALLEL_MIN_FILES or workers == 1:
+        index = _scan_files(paths)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunks = [
+            list(paths[i:i + _CHUNK_SIZE]) for i in range(0, len(paths), _CHUNK_SIZE)
+        ]
+        index = UsageIndex()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for partial in executor.map(_scan_files, chunks):
+                index.merge(partial)
+
+    for sites in index.call_sites.values():
+        sites.sort(key=lambda site: (site.path, site.line))
+    return index
+
+
+def analyze_usage(
+    generated: Sequence[str],
+    index: UsageIndex,
+    files_scanned: int,
+) -> UsageReport:
+    """
+    Compare generated function names against a call-site index.
+
+    Args:
+        generated: Names of generated functions
+        index: Call-site index of the source tree (without the generated file)
+        files_scanned: Number of files that were scanned
+
+    Returns:
+        UsageReport
+    """
+    generated_set = set(generated)
+    call_sites = {name: index.call_sites.get(name, []) for name in generated}
+    unused = [name for name in generated if not call_sites[name]]
+    missing = {
+        name: sites
+        for name, sites in sorted(index.call_sites.items())
+        if name not in generated_set and name not in index.definitions
+    }
+    return UsageReport(
+        generated=list(generated),
+        call_sites=call_sites,
+        unused=unused,
+        missing=missing,
+        files_scanned=files_scanned,
+    )
+
+
+def _site_text(site: CallSite) -> str:
+    return f"{site.path}:{site.line}"
+
+
+def format_usage_text(report: UsageReport) -> str:
+    """Render a usage report in a human-readable form."""
+    lines: List[str] = []
+    if report.unused:
+        lines.append(f"Unused generated functions ({len(report.unused)}):")
+        lines.extend(f"  {name}" for name in report.unused)
+    if report.missing:
+        lines.append(f"References to functions that are not generated ({len(report.missing)}):")
+        for name, sites in report.missing.items():
+            lines.append(f"  {name}")
+            lines.extend(f"    {_site_text(site)}" for site in sites)
+    used = len(report.generated) - len(report.unused)
+    lines.append(
+        f"{used}/{len(report.generated)} generated functions used, "
+        f"{len(report.missing)} missing, {report.files_scanned} files scanned"
+    )
+    return "\n".join(lines)
+
+
+def format_usage_json(report: UsageReport) -> str:
+    """Render a usage report as a JSON document."""
+
+    def sites(items: List[CallSite]) -> List[Dict[str, object]]:
+        return [{"path": s.path, "line": s.line} for s in items]
+
+    payload = {
+        "call_sites": {name: sites(items) for name, items in report.call_sites.items()},
+        "unused": report.unused,
+        "missing": {name: sites(items) for name, items in report.missing.items()},
+        "summary": {
+            "generated": len(report.generated),
+            "unused": len(report.unused),
+            "missing": len(report.missing),
+            "files_scanned": report.files_scanned,
+        },
+    }
+    return json.dumps(payload, ensure_ascii=False, indent=2)
+
+
+def scan_tree(
+    generated: Sequence[str],
+    root: Path,
+    extensions: Iterable[str] = (".swift",),
+    exclude: Iterable[Path] = (),
+    workers: int | None = None,
+) -> UsageReport:
+    """
+    Index a source tree and report usage of the generated functions.
+
+    Args:
+        generated: Names of generated functions
+        root: Source tree root
+        extensions: File extensions to scan
+        exclude: Files to skip (normally the generated file itself)
+        workers: Number of worker processes (default: CPU count)
+
+    Returns:
+        UsageReport
+    """
+    if not root.is_dir():
+        raise FileNotFoundError(f"Source directory not found: {root}")
+
+    paths = iter_source_files(root, extensions, exclude)
+    index = build_index(paths, workers)
+    return analyze_usage(generated, index, len(paths))
+
@@ -0,0 +1,202 @@
+"""
+Validate concatenated event strings against a compiled event catalog.
+
+Loads the JSON catalog written by `--target catalog` (see `catalog`) once and
+checks `client|screen|component|section|element|action` strings in batches,
+for ingestion backends that must reject events outside the approved
+taxonomy. Fields that are parameterized in the sheet (`*` in the catalog)
+accept any value.
+
+Events are checked in two passes: a lookup of the whole string in a table of
+every client × fully specified key (done in C by `map`), then, for the misses
+only, one tuple lookup per distinct wildcard shape. The results of the second
+pass are remembered (up to `MAX_RESOLVED` strings), so repeated events that
+match a wildcard, or no key at all, also cost about one hash lookup each.
+
+The module only uses the standard library, so it can be copied into a
+backend without the rest of the package.
+"""
+
+from __future__ import annotations
+
+import json
+from itertools import compress, repeat
+from operator import is_, itemgetter, not_
+from pathlib import Path
+from typing import (
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+# Identifies catalog files and their layout version
+CATALOG_FORMAT = "analytics-event-catalog"
+CATALOG_VERSION = 1
+
+# Segments after the client: screen|component|section|element|action
+_FIELD_COUNT = 5
+
+WILDCARD = "*"
+
+# Wildcard and miss results remembered before the memo is reset
+MAX_RESOLVED = 1 << 20
+
+_Getter = Callable[[List[str]], Tuple[str, ...]]
+
+
+def _getter(positions: Tuple[int, ...]) -> _Getter:
+    # itemgetter returns a bare value (not a 1-tuple) for a single index
+    if len(positions) == 1:
+        index = positions[0]
+        return lambda parts: (parts[index],)
+    if not positions:
+        return lambda parts: ()
+    return itemgetter(*positions)
+
+
+class EventValidator:
+    """Checks event strings against the keys of one catalog."""
+
+    def __init__(self, clients: Iterable[str], keys: Iterable[str]):
+        """
+        Initialize the validator.
+
+        Args:
+            clients: Accepted client segments (e.g. "ios", "web")
+            keys: `screen|component|section|element|action` keys, with `*`
+                for fields that accept any value
+
+        Raises:
+            ValueError: If a key does not have five fields
+        """
+        self.clients: FrozenSet[str] = frozenset(clients)
+        exact: List[str] = []
+        patterns: Dict[Tuple[int, ...], Dict[Tuple[str, ...], str]] = {}
+        for key in keys:
+            parts = key.split("|")
+            if len(parts) != _FIELD_COUNT:
+                raise ValueError(f"Invalid catalog key: {key!r}")
+            if WILDCARD not in parts:
+                exact.append(key)
+                continue
+            fixed = tuple(i for i, part in enumerate(parts) if part != WILDCARD)
+            values = patterns.setdefault(fixed, {})
+            values.setdefault(tuple(parts[i] for i in fixed), key)
+
+        self._exact: FrozenSet[str] = frozenset(
+            f"{client}|{key}" for client in self.clients for key in exact
+        )
+        # Wildcard shape → fixed field values → catalog key
+        self._patterns: List[Tuple[_Getter, Dict[Tuple[str, ...], str]]] = [
+            (_getter(fixed), values) for fixed, values in patterns.items()
+        ]
+        self._reset_resolved()
+
+    def _reset_resolved(self) -> None:
+        # Exact keys plus remembered results of `_matches_pattern`
+        self._resolved: Dict[str, bool] = dict.fromkeys(self._exact, True)
+
+    @classmethod
+    def from_catalog(cls, data: Mapping[str, object]) -> "EventValidator":
+        """
+        Create a validator from a parsed catalog.
+
+        Raises:
+            ValueError: If `data` is not a supported catalog
+        """
+        if data.get("format") != CATALOG_FORMAT:
+            raise ValueError("Not an analytics event catalog")
+        if data.get("version") != CATALOG_VERSION:
+            raise ValueError(
+                f"Unsupported catalog version {data.get('version')} "
+                f"(expected {CATALOG_VERSION})"
+            )
+        return cls(data["clients"], data["keys"])  # type: ignore[arg-type]
+
+    def _match_pattern(self, event: str) -> Optional[str]:
+        client, _, rest = event.partition("|")
+        if client not in self.clients:
+            return None
+        parts = rest.split("|")
+        if len(parts) != _FIELD_COUNT:
+            return None
+        for get, values in self._patterns:
+            key = values.get(get(parts))
+            if key is not None:
+                return key
+        return None
+
+    def _matches_pattern(self, event: str) -> bool:
+        return self._match_pattern(event) is not None
+
+    def match(self, event: str) -> Optional[str]:
+        """
+        Return the catalog key an event string matches, or None.
+
+        The key has no client segment and keeps `*` for wildcard fields, so
+        all events of one parameterized definition share a key.
+        """
+        if event in self._exact:
+            return event.partition("|")[2]
+        return self._match_pattern(event)
+
+    def _resolve(self, event: str) -> bool:
+        if len(self._resolved) >= len(self._exact) + MAX_RESOLVED:
+            self._reset_resolved()
+        valid = self._resolved[event] = self._matches_pattern(event)
+        return valid
+
+    def is_valid(self, event: str) -> bool:
+        """True if the event string is in the catalog."""
+        valid = self._resolved.get(event)
+        return self._resolve(event) if valid is None else valid
+
+    def validate(self, events: Sequence[str]) -> List[bool]:
+        """
+        Check a batch of event strings.
+
+        Args:
+            events: Concatenated event strings
+
+        Returns:
+            One flag per event, True if it is in the catalog
+        """
+        if not isinstance(events, (list, tuple)):
+            events = list(events)
+        results: List[Optional[bool]] = list(map(self._resolved.get, events))
+        unresolved = compress(range(len(results)), map(is_, results, repeat(None)))
+        for i in unresolved:
+            # Repeats within the batch were resolved by an earlier iteration
+            results[i] = self.is_valid(events[i])
+        return results  # type: ignore[return-value]
+
+    def invalid(self, events: Sequence[str]) -> List[str]:
+        """Return the events of a batch that are not in the catalog."""
+        if not isinstance(events, (list, tuple)):
+            events = list(events)
+        return list(compress(events, map(not_, self.validate(events))))
+
+
+def load_catalog(path: Path) -> EventValidator:
+    """
+    Load a catalog file written by `--target catalog`.
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        ValueError: If the file is not a supported catalog
+    """
+    if not path.is_file():
+        raise FileNotFoundError(f"Event catalog not found: {path}")
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid event catalog {path}: {e}") from e
+    if not isinstance(data, dict):
+        raise ValueError(f"Invalid event catalog {path}")
+    return EventValidator.from_catalog(data)
@@ -0,0 +1,248 @@
+"""
+Streaming XLSX/ODS workbook reader (standard library only).
+
+Sheet XML is parsed incrementally straight out of the zip archive with
+`iterparse`, and every row element is discarded once it has been converted,
+so memory does not grow with the size of the sheet XML.
+"""
+
+from __future__ import annotations
+
+import posixpath
+import zipfile
+from typing import IO, Iterator, List, Optional, Sequence, Tuple, Union
+from xml.etree import ElementTree
+
+_XLSX_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_XLSX_DOC_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_XLSX_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+_ODS_TABLE = "{urn:oasis:names:tc:opendocument:xmlns:table:1.0}"
+_ODS_TEXT = "{urn:oasis:names:tc:opendocument:xmlns:text:1.0}"
+
+# Repeated ODS rows/cells beyond this are padding to the sheet's full size
+_ODS_MAX_REPEAT = 1000
+
+WorkbookFile = Union[str, IO[bytes]]
+
+
+def _column_index(cell_ref: str) -> int:
+    # "AB12" -> 27 (zero-based)
+    index = 0
+    for ch in cell_ref:
+        if not ch.isalpha():
+            break
+        index = index * 26 + (ord(ch.upper()) - ord("A") + 1)
+    return index - 1
+
+
+def _xlsx_sheets(archive: zipfile.ZipFile) -> List[Tuple[str, str]]:
+    """Return (tab name, archive member) pairs in workbook order."""
+    targets = {}
+    with archive.open("xl/_rels/workbook.xml.rels") as f:
+        for _, elem in ElementTree.iterparse(f):
+            if elem.tag == f"{_XLSX_PKG_REL}Relationship":
+                target = elem.get("Target", "")
+                if target.startswith("/"):
+                    member = target.lstrip("/")
+                else:
+                    member = posixpath.normpath(posixpath.join("xl", target))
+                targets[elem.get("Id")] = member
+
+    sheets: List[Tuple[str, str]] = []
+    with archive.open("xl/workbook.xml") as f:
+        for _, elem in ElementTree.iterparse(f):
+            if elem.tag == f"{_XLSX_MAIN}sheet":
+                rel_id = elem.get(f"{_XLSX_DOC_REL}id")
+                if rel_id in targets:
+                    sheets.append((elem.get("name", ""), targets[rel_id]))
+    return sheets
+
+
+def _xlsx_shared_strings(archive: zipfile.ZipFile) -> List[str]:
+    if "xl/sharedStrings.xml" not in archive.namelist():
+        return []
+
+    strings: List[str] = []
+    with archive.open("xl/sharedStrings.xml") as f:
+        for _, elem in ElementTree.iterparse(f):
+            if elem.tag == f"{_XLSX_MAIN}si":
+                # Plain (<t>) and rich-text (<r><t>) strings; skip phonetic runs
+                parts: List[str] = []
+                for child in elem:
+                    if child.tag == f"{_XLSX_MAIN}t":
+                        parts.append(child.text or "")
+                    elif child.tag == f"{_XLSX_MAIN}r":
+                        parts.extend(t.text or "" for t in child.iter(f"{_XLSX_MAIN}t"))
+                strings.append("".join(parts))
+                elem.clear()
+    return strings
+
+
+def _xlsx_cell_value(cell: ElementTree.Element, shared: List[str]) -> str:
+    cell_type = cell.get("t", "n")
+    if cell_type == "inlineStr":
+        return "".join(t.text or "" for t in cell.iter(f"{_XLSX_MAIN}t"))
+
+    value = cell.find(f"{_XLSX_MAIN}v")
+    text = value.text if value is not None and value.text is not None else ""
+    if cell_type == "s" and text:
+        return shared[int(text)]
+    if cell_type == "b":
+        return "TRUE" if text == "1" else "FALSE"
+    return text
+
+
+def _iter_xlsx(
+    archive: zipfile.ZipFile,
+    tabs: Optional[Sequence[str]],
+) -> Iterator[Tuple[str, List[str]]]:
+    shared = _xlsx_shared_strings(archive)
+    for name, member in _xlsx_sheets(archive):
+        if tabs is not None and name not in tabs:
+            continue
+        with archive.open(member) as f:
+            sheet_data: Optional[ElementTree.Element] = None
+            for event, elem in ElementTree.iterparse(f, events=("start", "end")):
+                if event == "start":
+                    if elem.tag == f"{_XLSX_MAIN}sheetData":
+                        sheet_data = elem
+                    continue
+                if elem.tag != f"{_XLSX_MAIN}row":
+                    continue
+
+                row: List[str] = []
+                for cell in elem.iter(f"{_XLSX_MAIN}c"):
+                    ref = cell.get("r")
+                    if ref:
+                        column = _column_index(ref)
+                        if column > len(row):
+                            row.extend([""] * (column - len(row)))
+                    row.append(_xlsx_cell_value(cell, shared))
+                yield name, row
+
+                elem.clear()
+                if sheet_data is not None:
+                    sheet_data.remove(elem)
+
+
+def _ods_text(node: ElementTree.Element) -> str:
+    parts: List[str] = [node.text or ""]
+    for child in node:
+        if child.tag == f"{_ODS_TEXT}s":
+            parts.append(" " * int(child.get(f"{_ODS_TEXT}c", "1")))
+        elif child.tag == f"{_ODS_TEXT}tab":
+            parts.append("\t")
+        elif child.tag == f"{_ODS_TEXT}line-break":
+            parts.append("\n")
+        else:
+            parts.append(_ods_text(child))
+        parts.append(child.tail or "")
+    return "".join(parts)
+
+
+def _ods_cell_text(cell: ElementTree.Element) -> str:
+    return "\n".join(_ods_text(p) for p in cell.findall(f"{_ODS_TEXT}p"))
+
+
+def _iter_ods(
+    archive: zipfile.ZipFile,
+    tabs: Optional[Sequence[str]],
+) -> Iterator[Tuple[str, List[str]]]:
+    with archive.open("content.xml") as f:
+        table_name: Optional[str] = None
+        table_elem: Optional[ElementTree.Element] = None
+        for event, elem in ElementTree.iterparse(f, events=("start", "end")):
+            if elem.tag == f"{_ODS_TABLE}table":
+                if event == "start":
+                    table_name = elem.get(f"{_ODS_TABLE}name", "")
+                    table_elem = elem
+                else:
+                    table_name = None
+                    table_elem = None
+                    elem.clear()
+                continue
+            if event != "end" or elem.tag != f"{_ODS_TABLE}table-row":
+                continue
+
+            if table_name is not None and (tabs is None or table_name in tabs):
+                row: List[str] = []
+                for cell in elem:
+                    if cell.tag not in (
+                        f"{_ODS_TABLE}table-cell",
+                        f"{_ODS_TABLE}covered-table-cell",
+                    ):
+                        continue
+                    repeat = int(cell.get(f"{_ODS_TABLE}number-columns-repeated", "1"))
+                    row.extend([_ods_cell_text(cell)] * min(repeat, _ODS_MAX_REPEAT))
+                while row and not row[-1]:
+                    row.pop()
+
+                repeat = int(elem.get(f"{_ODS_TABLE}number-rows-repeated", "1"))
+                if row:
+                    for _ in range(min(repeat, _ODS_MAX_REPEAT)):
+                        yield table_name, list(row)
+
+            elem.clear()
+            if table_elem is not None:
+                try:
+                    table_elem.remove(elem)
+                except ValueError:
+                    # Rows nested in row groups aren't direct children
+                    pass
+
+
+def iter_workbook_rows(
+    source: WorkbookFile,
+    tabs: Optional[Sequence[str]] = None,
+) -> Iterator[Tuple[str, List[str]]]:
+    """
+    Stream (tab name, row) pairs from an XLSX or ODS workbook.
+
+    Args:
+        source: Path or binary file object of the workbook
+        tabs: Only read these tabs (default: all tabs)
+
+    Returns:
+        Iterator of (tab name, row values) in workbook order
+
+    Raises:
+        ValueError: If the file is not a supported workbook
+    """
+    try:
+        archive = zipfile.ZipFile(source)
+    except zipfile.BadZipFile as e:
+        raise ValueError(f"Not an XLSX/ODS workbook: {e}") from e
+
+    with archive:
+        names = set(archive.namelist())
+        if "xl/workbook.xml" in names:
+            yield from _iter_xlsx(archive, tabs)
+        elif "content.xml" in names:
+            yield from _iter_ods(archive, tabs)
+        else:
+            raise ValueError("Not an XLSX/ODS workbook: no workbook XML found")
+
+
+def read_workbook_tables(
+    source: WorkbookFile,
+    tabs: Optional[Sequence[str]] = None,
+) -> List[Tuple[str, List[List[str]]]]:
+    """
+    Read a workbook into (tab name, rows) tables in workbook order.
+
+    Raises:
+        ValueError: If the file is not a supported workbook or a requested
+            tab doesn't exist
+    """
+    tables: List[Tuple[str, List[List[str]]]] = []
+    for name, row in iter_workbook_rows(source, tabs):
+        if not tables or tables[-1][0] != name:
+            tables.append((name, []))
+        tables[-1][1].append(row)
+
+    if tabs is not None:
+        missing = [tab for tab in tabs if tab not in {name for name, _ in tables}]
+        if missing:
+            raise ValueError(f"Workbook tabs not found or empty: {', '.join(missing)}")
+    return tables
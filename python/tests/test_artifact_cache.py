@@ -0,0 +1,123 @@
+"""Tests for the content-addressed artifact cache."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from analytics_codegen.artifact_cache import (
+    ArtifactCache,
+    cache_key,
+    format_cache_report,
+    normalize_input,
+)
+
+
+class TestCacheKey(unittest.TestCase):
+    def test_normalized_text_shares_key(self):
+        options = {"target": "swift"}
+        plain = cache_key(b"a,b\nc,d\n", options, version="1")
+        self.assertEqual(cache_key(b"\xef\xbb\xbfa,b\r\nc,d\r\n\r\n", options, version="1"), plain)
+        self.assertNotEqual(cache_key(b"a,b\nc,e\n", options, version="1"), plain)
+
+    def test_options_and_version_change_key(self):
+        base = cache_key(b"data", {"target": "swift"}, version="1")
+        self.assertNotEqual(cache_key(b"data", {"target": "kotlin"}, version="1"), base)
+        self.assertNotEqual(cache_key(b"data", {"target": "swift"}, version="2"), base)
+
+    def test_workbooks_hashed_as_is(self):
+        data = b"PK\x03\x04\r\n"
+        self.assertEqual(normalize_input(data), data)
+
+    def test_chunk_boundaries_dont_change_key(self):
+        options = {"target": "swift"}
+        for data in (b"\xef\xbb\xbfa,b\r\nc,d\r\r\n\n", b"PK\x03\x04\r\nzip\r\n"):
+            whole = cache_key(data, options, version="1")
+            for size in (1, 2, 3, 5):
+                chunks = [data[i:i + size] for i in range(0, len(data), size)]
+                self.assertEqual(cache_key(chunks, options, version="1"), whole, (data, size))
+
+
+class TestArtifactCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.temp_dir.name)
+        self.cache = ArtifactCache(self.dir / "cache")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _outputs(self, name: str, content: str):
+        swift = self.dir / name / "Tracking.swift"
+        kotlin = self.dir / name / "Tracking.kt"
+        swift.parent.mkdir(parents=True, exist_ok=True)
+        swift.write_text(f"swift {content}", encoding="utf-8")
+        kotlin.write_text(f"kotlin {content}", encoding="utf-8")
+        return {"swift": swift, "kotlin": kotlin}
+
+    def test_store_and_restore(self):
+        self.assertIsNone(self.cache.lookup("ab" * 32))
+        self.cache.store("ab" * 32, 3, self._outputs("run", "v1"))
+
+        entry = self.cache.lookup("ab" * 32)
+        self.assertEqual(entry.count, 3)
+
+        restored = {
+            "swift": self.dir / "out" / "A.swift",
+            "kotlin": self.dir / "out" / "A.kt",
+        }
+        self.cache.restore(entry, restored)
+        self.assertEqual(restored["swift"].read_text(encoding="utf-8"), "swift v1")
+        self.assertEqual(restored["kotlin"].read_text(encoding="utf-8"), "kotlin v1")
+
+    def test_store_existing_key(self):
+        self.cache.store("cd" * 32, 1, self._outputs("first", "v1"))
+        self.cache.store("cd" * 32, 1, self._outputs("second", "v1"))
+        self.assertEqual(self.cache.lookup("cd" * 32).count, 1)
+        self.assertEqual(
+            [p.name for p in self.cache.root.iterdir() if p.name.startswith(".staging")], []
+        )
+
+    def test_restore_evicted_entry(self):
+        entry = self.cache.store("ab" * 32, 1, self._outputs("run", "v1"))
+        shutil.rmtree(entry.path)
+        self.assertFalse(self.cache.restore(entry, {"swift": self.dir / "out" / "A.swift"}))
+
+    def test_incomplete_entry_is_miss(self):
+        entry = self.cache.store("ef" * 32, 1, self._outputs("run", "v1"))
+        (entry.path / entry.files["swift"]).unlink()
+        self.assertIsNone(self.cache.lookup("ef" * 32))
+
+    def test_lru_eviction(self):
+        keys = [f"{i:02x}" * 32 for i in range(3)]
+        for i, key in enumerate(keys):
+            entry = self.cache.store(key, 1, self._outputs(f"run{i}", "x" * 100))
+            # Distinct, increasing access times
+            os.utime(entry.path / "entry.json", (1000 + i, 1000 + i))
+        entry_size = sum(p.stat().st_size for p in entry.path.iterdir())
+
+        # Using the oldest entry makes the second one least recently used
+        self.cache.lookup(keys[0])
+        self.cache.max_bytes = entry_size * 2
+        self.assertEqual(self.cache.evict(), 1)
+
+        self.assertIsNotNone(self.cache.lookup(keys[0]))
+        self.assertIsNone(self.cache.lookup(keys[1]))
+        self.assertIsNotNone(self.cache.lookup(keys[2]))
+        self.assertEqual(self.cache.stats().evictions, 1)
+
+    def test_hit_rate(self):
+        self.cache.record(misses=1)
+        stats = self.cache.record(hits=3)
+        self.assertEqual(stats.hit_rate, 0.75)
+        self.assertEqual(
+            format_cache_report(True, "0123456789abcdef", stats),
+            "📦 Cache hit (0123456789ab), hit rate 75% (3/4)",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
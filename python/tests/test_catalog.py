@@ -0,0 +1,146 @@
+"""Tests for the compiled event catalog and its validator."""
+
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from analytics_codegen import validator
+from analytics_codegen.catalog import build_catalog, catalog_keys, render_catalog
+from analytics_codegen.cli import main
+from analytics_codegen.codegen import EventRow
+from analytics_codegen.dispatch import fnv1a
+from analytics_codegen.validator import EventValidator, load_catalog
+
+ROWS = [
+    EventRow("settings", "settings", "language", "field", "select"),
+    EventRow("settings", "settings", "language", "field", "select", "lang|string"),
+    EventRow("my_ad", "boost_photo", "post", "onboarding", "view", advertisement="ad"),
+    EventRow("feed", "feed|search", "post", "card", "tap"),
+    EventRow("feed|search", "banner", "post", "card|button", "view"),
+]
+
+
+class TestCatalog(unittest.TestCase):
+    def test_keys_are_distinct_with_wildcards(self):
+        self.assertEqual(
+            catalog_keys(ROWS),
+            [
+                "settings|language|settings|field|select",
+                "my_ad|post|boost_photo|onboarding|view",
+                "feed|post|*|card|tap",
+                "*|post|banner|*|view",
+            ],
+        )
+
+    def test_perfect_hash_index(self):
+        catalog = build_catalog(ROWS)
+        seeds, keys = catalog["seeds"], catalog["keys"]
+        for key in catalog_keys(ROWS):
+            data = key.encode("utf-8")
+            slot = fnv1a(data, seeds[fnv1a(data) % len(seeds)]) % len(keys)
+            self.assertEqual(keys[slot], key)
+
+    def test_render_is_compact_json(self):
+        content = render_catalog(ROWS, clients=["ios"])
+        self.assertNotIn(" ", content.strip())
+        self.assertEqual(json.loads(content)["clients"], ["ios"])
+
+
+class TestEventValidator(unittest.TestCase):
+    def setUp(self):
+        self.validator = EventValidator.from_catalog(build_catalog(ROWS))
+
+    def test_exact_and_wildcard_events(self):
+        events = [
+            "web|settings|language|settings|field|select",
+            "ios|my_ad|post|boost_photo|onboarding|view",
+            "android|feed|post|recommended|card|tap",
+            "web-mobile|search|post|banner|button|view",
+            "ios|feed|post|recommended|card|view",
+            "desktop|settings|language|settings|field|select",
+            "ios|settings|language|settings|field",
+            "ios|feed|post|a|b|card|tap",
+            "",
+        ]
+        self.assertEqual(
+            self.validator.validate(events),
+            [True, True, True, True, False, False, False, False, False],
+        )
+        self.assertEqual(self.validator.invalid(iter(events)), events[4:])
+        self.assertTrue(self.validator.is_valid(events[2]))
+
+    def test_match_returns_catalog_key(self):
+        self.assertEqual(
+            self.validator.match("android|feed|post|nearby|card|tap"), "feed|post|*|card|tap"
+        )
+        self.assertEqual(
+            self.validator.match("ios|settings|language|settings|field|select"),
+            "settings|language|settings|field|select",
+        )
+        self.assertIsNone(self.validator.match("ios|feed|post|nearby|card|view"))
+
+    def test_repeated_misses_are_resolved_once(self):
+        events = ["ios|feed|post|x|card|tap", "ios|nope|post|x|card|tap"] * 50
+        with patch.object(
+            EventValidator, "_matches_pattern", wraps=self.validator._matches_pattern
+        ) as matches:
+            results = self.validator.validate(events)
+            self.validator.validate(events)
+        self.assertEqual(results, [True, False] * 50)
+        self.assertEqual(matches.call_count, 2)
+
+    def test_resolved_memo_is_bounded(self):
+        with patch.object(validator, "MAX_RESOLVED", 3):
+            events = [f"ios|feed|post|s{i}|card|tap" for i in range(10)]
+            self.assertTrue(all(self.validator.validate(events)))
+            resolved = len(self.validator._resolved) - len(self.validator._exact)
+            self.assertLessEqual(resolved, 3)
+
+    def test_rejects_other_files(self):
+        with self.assertRaises(ValueError):
+            EventValidator.from_catalog({"format": "something-else"})
+        with self.assertRaises(ValueError):
+            EventValidator(["ios"], ["a|b|c"])
+        with self.assertRaises(FileNotFoundError):
+            load_catalog(Path("/nonexistent/catalog.json"))
+
+
+class TestCatalogTarget(unittest.TestCase):
+    def test_cli_writes_loadable_catalog(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = Path(tmp) / "analytics.csv"
+            csv_path.write_text(
+                "my_ad,boost_photo,post,onboarding,view,,\n"
+                "feed,feed|search,post,card,tap,,\n",
+                encoding="utf-8",
+            )
+            output = Path(tmp) / "Generated" / "Tracking.swift"
+
+            exit_code = main(
+                [
+                    "--input", str(csv_path),
+                    "--output", str(output),
+                    "--target", "swift,catalog",
+                ]
+            )
+
+            self.assertEqual(exit_code, 0)
+            checker = load_catalog(output.with_suffix(".json"))
+            self.assertEqual(
+                checker.validate(
+                    [
+                        "ios|my_ad|post|boost_photo|onboarding|view",
+                        "android|feed|post|anything|card|tap",
+                        "ios|feed|post|anything|card|view",
+                    ]
+                ),
+                [True, True, False],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -49,3 +49,138 @@ class TestCLI:
         # We won't actually run it, just ensure it parses
         # In a real scenario, you'd mock the file system
         pass
+
+    def test_cli_diff_with_snapshot(self, capsys):
+        with tempfile.TemporaryDirectory() as tmp:
+            old_csv = Path(tmp) / "old.csv"
+            new_csv = Path(tmp) / "new.csv"
+            snapshot = Path(tmp) / "new.json"
+            old_csv.write_text(
+                "my_ad,boost_photo,post,onboarding,view,,\n", encoding="utf-8"
+            )
+            new_csv.write_text(
+                "my_ad,boost_photo,post,onboarding,view,,\n"
+                "my_ad,boost_photo,post,button,tap,,\n",
+                encoding="utf-8",
+            )
+
+            exit_code = main(
+                ["diff", str(old_csv), str(new_csv), "--save-snapshot", str(snapshot)]
+            )
+            assert exit_code == 0
+            assert snapshot.is_file()
+            out = capsys.readouterr().out
+            assert "+ trackMyAdBoostPhotoPostButtonTap()" in out
+            assert "1 added, 0 removed, 0 changed" in out
+
+            # Diffing a version against its own snapshot yields no changes
+            exit_code = main(["diff", str(snapshot), str(new_csv), "--format", "json"])
+            assert exit_code == 0
+            assert '"added": 0' in capsys.readouterr().out
+
+    def test_cli_diff_missing_input(self):
+        exit_code = main(["diff", "/nonexistent/old.csv", "/nonexistent/new.csv"])
+        assert exit_code == 1
+
+    def test_cli_multiple_targets(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = Path(tmp) / "analytics.csv"
+            csv_path.write_text("my_ad,boost_photo,post,onboarding,view,,\n", encoding="utf-8")
+            swift_path = Path(tmp) / "Tracking.swift"
+
+            exit_code = main(
+                [
+                    "--input", str(csv_path),
+                    "--output", str(swift_path),
+                    "--target", "swift,kotlin,ts",
+                ]
+            )
+            assert exit_code == 0
+            for suffix in (".swift", ".kt", ".ts"):
+                assert swift_path.with_suffix(suffix).is_file()
+
+    def test_cli_dedupe_on_disk(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = Path(tmp) / "analytics.csv"
+            csv_path.write_text(
+                "my_ad,boost_photo,post,onboarding,view,,\n" * 3, encoding="utf-8"
+            )
+            swift_path = Path(tmp) / "Tracking.swift"
+
+            exit_code = main(
+                [
+                    "--input", str(csv_path),
+                    "--output", str(swift_path),
+                    "--dedupe-memory-mb", "1",
+                ]
+            )
+            assert exit_code == 0
+            content = swift_path.read_text(encoding="utf-8")
+            assert content.count("func trackMyAdBoostPhotoPostOnboardingView") == 1
+
+    def test_cli_cache_hit_skips_generation(self, capsys, monkeypatch):
+        from analytics_codegen import emitters
+
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = Path(tmp) / "analytics.csv"
+            csv_path.write_text("my_ad,boost_photo,post,onboarding,view,,\n", encoding="utf-8")
+            argv = [
+                "--input", str(csv_path),
+                "--cache-dir", str(Path(tmp) / "cache"),
+                "--target", "swift,kotlin",
+            ]
+
+            first = Path(tmp) / "first" / "Tracking.swift"
+            assert main(argv + ["--output", str(first)]) == 0
+            assert "Cache miss" in capsys.readouterr().out
+
+            def fail(*args, **kwargs):
+                raise AssertionError("input was parsed on a cache hit")
+
+            monkeypatch.setattr(emitters, "generate_targets_from_input", fail)
+            second = Path(tmp) / "second" / "Tracking.swift"
+            assert main(argv + ["--output", str(second)]) == 0
+            out = capsys.readouterr().out
+            assert "Cache hit" in out
+            assert "hit rate 50% (1/2)" in out
+            assert "Generated 1 functions" in out
+            for suffix in (".swift", ".kt"):
+                assert second.with_suffix(suffix).read_text(encoding="utf-8") == (
+                    first.with_suffix(suffix).read_text(encoding="utf-8")
+                )
+
+    def test_cli_flight_key_resolves_input(self, monkeypatch):
+        from analytics_codegen.cli import _build_parser, _flight_key
+
+        args = _build_parser().parse_args([])
+        keys = set()
+        with tempfile.TemporaryDirectory() as tmp:
+            for project in ("one", "two"):
+                (Path(tmp) / project).mkdir()
+                monkeypatch.chdir(Path(tmp) / project)
+                keys.add(_flight_key(args, cached=False))
+        assert len(keys) == 2
+
+    def test_cli_unknown_target(self):
+        exit_code = main(["--input", "analytics.csv", "--target", "java"])
+        assert exit_code == 1
+
+    def test_cli_projection_requires_google_sheets(self, capsys):
+        exit_code = main(["--input", "analytics.csv", "--project-columns"])
+        assert exit_code == 1
+        assert "--project-columns" in capsys.readouterr().err
+
+    def test_cli_usage(self, capsys):
+        with tempfile.TemporaryDirectory() as tmp:
+            generated = Path(tmp) / "Generated.swift"
+            generated.write_text(
+                "static func trackMyAdBoostPhotoPostOnboardingView() {\n}\n",
+                encoding="utf-8",
+            )
+            (Path(tmp) / "Screen.swift").write_text(
+                "trackMyAdBoostPhotoPostOnboardingView()\n", encoding="utf-8"
+            )
+
+            exit_code = main(["usage", tmp, "--generated", str(generated)])
+            assert exit_code == 0
+            assert "1/1 generated functions used" in capsys.readouterr().out
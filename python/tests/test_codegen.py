@@ -12,6 +12,9 @@ from analytics_codegen.codegen import (
     _generate_function,
     _parse_csv,
     _pascal_case,
+    _render_swift,
+    _split_variants,
+    _variant_tokens,
     generate_swift_from_csv,
 )
 
@@ -38,6 +41,49 @@ class TestCaseConverters(unittest.TestCase):
         self.assertEqual(_pascal_case("___"), "")
 
 
+class TestSectionVariants(unittest.TestCase):
+    def test_split_whitespace_and_cyrillic(self):
+        text = (
+            "reach_category_advertise_button - якщо потрапили НЕ з флоу постінга\n"
+            "reach_category_after_posting - якщо потрапили з флоу постінга"
+        )
+        self.assertEqual(
+            _split_variants(text),
+            ["reach_category_advertise_button", "reach_category_after_posting"],
+        )
+
+    def test_split_commas_and_slashes(self):
+        self.assertEqual(
+            _split_variants("boost_photo, boost_video/boost_story"),
+            ["boost_photo", "boost_video", "boost_story"],
+        )
+
+    def test_short_tokens_dropped(self):
+        self.assertEqual(_split_variants("boost_photo or boost_video"), ["boost_photo", "boost_video"])
+        self.assertEqual(_split_variants("ab cd", min_length=2), ["ab", "cd"])
+
+    def test_custom_delimiters(self):
+        self.assertEqual(_split_variants("a_b,c_d;e_f", delimiters=",;"), ["a_b", "c_d", "e_f"])
+        self.assertEqual(_split_variants("a_b c_d", delimiters=","), ["a_b c_d"])
+
+    def test_malformed_tokens_dropped(self):
+        self.assertEqual(
+            _split_variants("boost_photo (see doc), Boost-Video 2nd_try boost_story!"),
+            ["boost_photo"],
+        )
+
+    def test_no_valid_variants_keeps_text(self):
+        self.assertEqual(_split_variants("|"), ["|"])
+        self.assertEqual(_split_variants("a b"), ["a b"])
+        self.assertEqual(_split_variants("тільки коментар"), ["тільки коментар"])
+
+    def test_results_cached(self):
+        _variant_tokens.cache_clear()
+        _split_variants("cached_section other_section")
+        _split_variants("cached_section other_section")
+        self.assertEqual(_variant_tokens.cache_info().hits, 1)
+
+
 class TestCSVParsing(unittest.TestCase):
     def test_parse_valid_csv(self):
         with tempfile.NamedTemporaryFile(
@@ -169,6 +215,76 @@ class TestFunctionGeneration(unittest.TestCase):
         self.assertIn("component: Event.Component", result)
         self.assertIn("func trackMyAdBoostPhotoComponentButtonTap", result)
 
+    def test_generate_function_hoists_constant_details(self):
+        row = EventRow("my_ad", "boost_photo", "post", "onboarding", "view", "", "ad")
+        result = _generate_function(row)
+
+        self.assertIn(
+            "private static let trackMyAdBoostPhotoPostOnboardingViewDetails: "
+            "EventDetails = EventDetails(",
+            result,
+        )
+        self.assertIn(
+            "    let eventDetails: EventDetails = "
+            "trackMyAdBoostPhotoPostOnboardingViewDetails",
+            result,
+        )
+        self.assertIn("EventFactory.event(for: advertisement, with: eventDetails)", result)
+
+    def test_overloads_share_hoisted_details(self):
+        rows = [
+            EventRow("home", "feed", "listing", "ad", "view", "", ""),
+            EventRow("home", "feed", "listing", "ad", "view", "", "ad"),
+            # Same function name, different details
+            EventRow("home_feed", "listing", "ad", "view", "x", "", "ad"),
+            EventRow("home", "feed_listing", "ad", "view", "x", "", ""),
+        ]
+        content = _render_swift(rows)
+
+        self.assertIn("static func trackHomeFeedListingAdView() {", content)
+        self.assertIn(
+            "static func trackHomeFeedListingAdView(advertisement: EventAdvertisementProtocol) {",
+            content,
+        )
+        for name in (
+            "trackHomeFeedListingAdViewDetails",
+            "trackHomeFeedListingAdViewXDetails",
+            "trackHomeFeedListingAdViewXDetails2",
+        ):
+            self.assertEqual(content.count(f"private static let {name}:"), 1, name)
+        self.assertEqual(content.count("= trackHomeFeedListingAdViewDetails\n"), 2)
+        self.assertEqual(content.count("= trackHomeFeedListingAdViewXDetails2\n"), 1)
+
+    def test_generate_function_event_strings(self):
+        row = EventRow("my_ad", "boost_photo", "post", "onboarding", "view", "", "")
+        self.assertNotIn("EventKey", _generate_function(row))
+
+        result = _generate_function(row, event_strings=True)
+        self.assertIn(
+            'static let trackMyAdBoostPhotoPostOnboardingViewEventKey: String = '
+            '"ios|my_ad|post|boost_photo|onboarding|view"',
+            result,
+        )
+        self.assertIn(
+            'static let trackMyAdBoostPhotoPostOnboardingViewEventFields: '
+            'EventFieldStrings = (screen: "my_ad", component: "post", '
+            'section: "boost_photo", element: "onboarding", action: "view")',
+            result,
+        )
+
+    def test_generate_function_event_strings_skip_parameterized(self):
+        row = EventRow("my_ad", "boost_photo", "|", "button", "tap", "", "")
+        self.assertNotIn("EventKey", _generate_function(row, event_strings=True))
+
+    def test_generate_function_parameterized_details_not_hoisted(self):
+        for row in (
+            EventRow("my_ad", "boost_photo", "|", "button", "tap", "", ""),
+            EventRow("my_ad", "boost_photo", "post", "button", "tap", "price", ""),
+        ):
+            result = _generate_function(row)
+            self.assertNotIn("private static let", result)
+            self.assertIn("let eventDetails: EventDetails = EventDetails(", result)
+
 
 class TestEndToEnd(unittest.TestCase):
     def test_generate_swift_from_csv(self):
@@ -0,0 +1,173 @@
+"""Tests for typed event_details parameters."""
+
+from __future__ import annotations
+
+import io
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from pathlib import Path
+
+from analytics_codegen.cli import main
+from analytics_codegen.codegen import EventRow, _generate_function, _render_swift
+from analytics_codegen.details import (
+    DEFAULT_DETAILS_SCHEMA,
+    DetailField,
+    load_details_schema,
+    parse_event_details,
+)
+from analytics_codegen.symbols import DUPLICATE, OVERLOAD, build_symbol_table
+
+
+class TestParseEventDetails(unittest.TestCase):
+    def test_schema_and_explicit_types(self):
+        self.assertEqual(
+            parse_event_details("price, category_id\nuser_id|string; ok:boolean price"),
+            (
+                DetailField("price", "float"),
+                DetailField("category_id", "integer"),
+                DetailField("user_id", "string"),
+                DetailField("ok", "boolean"),
+            ),
+        )
+
+    def test_untyped_cells(self):
+        for cell in (
+            "", "details", "price, notes", "user_id|uuid", "price?", "screen|string",
+            "guard|string", "true:boolean", "parameters|string", "private|string",
+        ):
+            self.assertIsNone(parse_event_details(cell), cell)
+
+    def test_load_schema(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "details.json"
+            path.write_text(json.dumps({"ad_id": "integer"}), encoding="utf-8")
+            schema = load_details_schema(path)
+            self.assertEqual(schema["ad_id"], "integer")
+            self.assertEqual(schema["price"], DEFAULT_DETAILS_SCHEMA["price"])
+
+            path.write_text(json.dumps({"ad_id": "uuid"}), encoding="utf-8")
+            with self.assertRaises(ValueError):
+                load_details_schema(path)
+            with self.assertRaises(FileNotFoundError):
+                load_details_schema(Path(tmp) / "missing.json")
+
+
+class TestTypedFunctions(unittest.TestCase):
+    def test_typed_arguments_and_struct(self):
+        row = EventRow("my_ad", "boost_photo", "|", "button", "tap", "price, timestamp", "ad")
+        result = _generate_function(row, details_schema=DEFAULT_DETAILS_SCHEMA)
+
+        self.assertIn(
+            "struct TrackMyAdBoostPhotoComponentButtonTapDetails: EventDetailsFields {",
+            result,
+        )
+        self.assertIn("    let price: Double\n    let timestamp: Date\n", result)
+        self.assertIn(
+            'EventDetailsParameter(key: "timestamp", '
+            "value: EventDetailsFormat.string(from: timestamp)),",
+            result,
+        )
+        self.assertIn(
+            "static func trackMyAdBoostPhotoComponentButtonTap("
+            "advertisement: EventAdvertisementProtocol, component: Event.Component, "
+            "price: Double, timestamp: Date) {",
+            result,
+        )
+        self.assertIn(
+            "details: .typed(TrackMyAdBoostPhotoComponentButtonTapDetails("
+            "price: price, timestamp: timestamp))",
+            result,
+        )
+        self.assertNotIn("parameters: [EventDetailsParameter])", result)
+
+    def test_untyped_cell_keeps_parameters(self):
+        row = EventRow("my_ad", "boost_photo", "post", "button", "tap", "event_details", "")
+        typed = _generate_function(row, details_schema=DEFAULT_DETAILS_SCHEMA)
+        self.assertEqual(typed, _generate_function(row))
+        self.assertIn("parameters: [EventDetailsParameter]", typed)
+
+    def test_overloads_declare_each_struct_once(self):
+        rows = [
+            EventRow("home", "feed", "listing", "ad", "view", "price", ""),
+            EventRow("home", "feed", "listing", "ad", "view", "price", "ad"),
+            # Same function name, other keys
+            EventRow("home_feed", "listing", "ad", "view", "x", "query", ""),
+            EventRow("home", "feed_listing", "ad", "view", "x", "price", ""),
+        ]
+        content = _render_swift(rows, details_schema=DEFAULT_DETAILS_SCHEMA)
+
+        for name in (
+            "TrackHomeFeedListingAdViewDetails",
+            "TrackHomeFeedListingAdViewXDetails",
+            "TrackHomeFeedListingAdViewXDetails2",
+        ):
+            self.assertEqual(content.count(f"struct {name}:"), 1, name)
+        self.assertEqual(content.count(".typed(TrackHomeFeedListingAdViewDetails("), 2)
+        self.assertIn(".typed(TrackHomeFeedListingAdViewXDetails2(price: price))", content)
+
+    def test_symbol_table_uses_typed_signatures(self):
+        rows = [
+            EventRow("home_feed", "listing", "ad", "view", "x", "query", ""),
+            EventRow("home", "feed_listing", "ad", "view", "x", "price", ""),
+        ]
+        self.assertEqual(build_symbol_table(rows).collisions[0].kind, DUPLICATE)
+
+        collision = build_symbol_table(rows, DEFAULT_DETAILS_SCHEMA).collisions[0]
+        self.assertEqual(collision.kind, OVERLOAD)
+        self.assertEqual(
+            [symbol.params for symbol in collision.symbols],
+            [("query: String",), ("price: Double",)],
+        )
+
+    def test_default_output_unchanged(self):
+        row = EventRow("my_ad", "boost_photo", "post", "button", "tap", "price", "")
+        self.assertIn("details: .defined(parameters)", _generate_function(row))
+
+
+class TestTypedDetailsCLI(unittest.TestCase):
+    def test_details_schema(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = Path(tmp) / "analytics.csv"
+            csv_path.write_text(
+                'my_ad,boost_photo,post,button,tap,"ad_id, price",\n', encoding="utf-8"
+            )
+            schema = Path(tmp) / "details.json"
+            schema.write_text(json.dumps({"ad_id": "integer"}), encoding="utf-8")
+            output = Path(tmp) / "Tracking.swift"
+
+            exit_code = main(
+                [
+                    "--input", str(csv_path),
+                    "--output", str(output),
+                    "--details-schema", str(schema),
+                ]
+            )
+
+            self.assertEqual(exit_code, 0)
+            self.assertIn(
+                "static func trackMyAdBoostPhotoPostButtonTap(adId: Int, price: Double)",
+                output.read_text(encoding="utf-8"),
+            )
+
+    def test_swift_table_rejected(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = Path(tmp) / "analytics.csv"
+            csv_path.write_text("my_ad,boost_photo,post,button,tap,price,\n", encoding="utf-8")
+            err = io.StringIO()
+            with redirect_stderr(err):
+                exit_code = main(
+                    [
+                        "--input", str(csv_path),
+                        "--output", str(Path(tmp) / "Tracking.swift"),
+                        "--target", "swift-table",
+                        "--typed-details",
+                    ]
+                )
+            self.assertEqual(exit_code, 1)
+            self.assertIn("only apply to the swift target", err.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
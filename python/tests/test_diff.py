@@ -0,0 +1,109 @@
+"""Tests for the taxonomy diff engine."""
+
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from analytics_codegen.codegen import EventRow
+from analytics_codegen.diff import (
+    diff_rows,
+    format_diff_json,
+    format_diff_text,
+    load_snapshot,
+    write_snapshot,
+)
+
+
+class TestDiffRows(unittest.TestCase):
+    """Test added/removed/changed detection."""
+
+    def test_identical_rows_produce_empty_diff(self):
+        rows = [EventRow("my_ad", "boost_photo", "post", "onboarding", "view")]
+        result = diff_rows(rows, list(rows))
+        self.assertTrue(result.is_empty)
+
+    def test_added_removed_changed(self):
+        old = [
+            EventRow("my_ad", "boost_photo", "post", "onboarding", "view"),
+            EventRow("my_ad", "boost_photo", "post", "button", "tap"),
+            EventRow("home", "feed", "listing", "ad", "view"),
+        ]
+        new = [
+            EventRow("my_ad", "boost_photo", "post", "button", "tap", "price"),
+            EventRow("home", "feed", "listing", "ad", "view"),
+            EventRow("home", "feed", "listing", "banner", "tap"),
+        ]
+        result = diff_rows(old, new)
+
+        self.assertEqual([r.element for r in result.added], ["banner"])
+        self.assertEqual([r.element for r in result.removed], ["onboarding"])
+        self.assertEqual(len(result.changed), 1)
+        self.assertEqual(result.changed[0].old.event_details, "")
+        self.assertEqual(result.changed[0].new.event_details, "price")
+
+    def test_advertisement_is_part_of_identity(self):
+        old = [EventRow("s", "sec", "c", "e", "a", "", "")]
+        new = [EventRow("s", "sec", "c", "e", "a", "", "ad")]
+        result = diff_rows(old, new)
+        self.assertEqual(len(result.added), 1)
+        self.assertEqual(len(result.removed), 1)
+        self.assertEqual(result.changed, [])
+
+
+class TestDiffFormatting(unittest.TestCase):
+    """Test text and JSON rendering."""
+
+    def setUp(self):
+        old = [EventRow("my_ad", "boost_photo", "post", "button", "tap")]
+        new = [EventRow("my_ad", "boost_photo", "post", "button", "tap", "price")]
+        self.result = diff_rows(old, new)
+
+    def test_text_shows_signature_change(self):
+        text = format_diff_text(self.result)
+        self.assertIn(
+            "~ trackMyAdBoostPhotoPostButtonTap() -> "
+            "trackMyAdBoostPhotoPostButtonTap(parameters: [EventDetailsParameter])",
+            text,
+        )
+        self.assertIn("0 added, 0 removed, 1 changed", text)
+
+    def test_json_includes_function_names(self):
+        payload = json.loads(format_diff_json(self.result))
+        self.assertEqual(payload["summary"], {"added": 0, "removed": 0, "changed": 1})
+        change = payload["changed"][0]
+        self.assertEqual(change["function"], "trackMyAdBoostPhotoPostButtonTap")
+        self.assertEqual(change["old"]["parameters"], [])
+        self.assertEqual(
+            change["new"]["parameters"], ["parameters: [EventDetailsParameter]"]
+        )
+
+
+class TestSnapshots(unittest.TestCase):
+    """Test snapshot round-trip."""
+
+    def test_round_trip(self):
+        rows = [
+            EventRow("my_ad", "boost_photo", "post", "button", "tap", "price", "ad"),
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "snapshot.json"
+            write_snapshot(rows, path)
+            self.assertEqual(load_snapshot(path), rows)
+
+    def test_invalid_snapshot(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "snapshot.json"
+            path.write_text('{"version": 99}', encoding="utf-8")
+            with self.assertRaises(ValueError):
+                load_snapshot(path)
+
+    def test_missing_snapshot(self):
+        with self.assertRaises(FileNotFoundError):
+            load_snapshot(Path("/nonexistent/snapshot.json"))
+
+
+if __name__ == "__main__":
+    unittest.main()
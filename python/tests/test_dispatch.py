@@ -0,0 +1,77 @@
+"""Tests for the concatenated-key dispatch table."""
+
+from __future__ import annotations
+
+import unittest
+
+from analytics_codegen.codegen import EventRow, _event_key
+from analytics_codegen.dispatch import (
+    build_perfect_hash,
+    dispatch_rows,
+    fnv1a,
+    render_swift_dispatch_table,
+)
+from analytics_codegen.emitters import SwiftEmitter
+
+
+class TestEventKey(unittest.TestCase):
+    def test_key_order_matches_readme(self):
+        row = EventRow("language", "settings", "language", "field", "select")
+        self.assertEqual(_event_key(row, "web"), "web|language|language|settings|field|select")
+
+    def test_parameterized_field_is_wildcard(self):
+        row = EventRow("home", "feed", "|", "ad", "view")
+        self.assertEqual(_event_key(row, "ios"), "ios|home|*|feed|ad|view")
+
+
+class TestPerfectHash(unittest.TestCase):
+    def test_fnv1a_reference_vectors(self):
+        self.assertEqual(fnv1a(b""), 0x811C9DC5)
+        self.assertEqual(fnv1a(b"a"), 0xE40C292C)
+
+    def test_every_key_has_unique_slot(self):
+        keys = [f"ios|screen_{i}|post|section_{i % 7}|button|tap" for i in range(500)]
+        table = build_perfect_hash(keys)
+        self.assertEqual(len(table.keys), len(keys))
+        self.assertEqual(sorted(table.keys), sorted(keys))
+        for key in keys:
+            self.assertEqual(table.keys[table.slot(key)], key)
+
+    def test_unknown_key(self):
+        table = build_perfect_hash(["ios|home|listing|feed|ad|view"])
+        self.assertIsNone(table.slot("ios|home|listing|feed|ad|tap"))
+        self.assertIsNone(build_perfect_hash([]).slot("anything"))
+
+    def test_duplicate_keys_rejected(self):
+        with self.assertRaises(ValueError):
+            build_perfect_hash(["a", "a"])
+
+
+class TestSwiftDispatchTable(unittest.TestCase):
+    def setUp(self):
+        self.rows = [
+            EventRow("my_ad", "boost_photo", "post", "onboarding", "view"),
+            EventRow("my_ad", "boost_photo", "post", "onboarding", "view", "", "ad"),
+            EventRow("my_ad", "boost_photo", "|", "button", "tap"),
+        ]
+
+    def test_parameterized_rows_skipped_and_first_wins(self):
+        by_key = dispatch_rows(self.rows)
+        self.assertEqual(list(by_key), ["ios|my_ad|post|boost_photo|onboarding|view"])
+        self.assertEqual(by_key["ios|my_ad|post|boost_photo|onboarding|view"].advertisement, "")
+
+    def test_render(self):
+        content = render_swift_dispatch_table(self.rows)
+        self.assertIn('    "ios|my_ad|post|boost_photo|onboarding|view",', content)
+        self.assertIn("    (.myAd, .boostPhoto, .post, .onboarding, .view),", content)
+        self.assertIn("static func trackEvent(forKey key: String,", content)
+
+    def test_emitter_option(self):
+        self.assertNotIn("trackEvent(forKey", SwiftEmitter().render(self.rows))
+        self.assertIn(
+            "trackEvent(forKey", SwiftEmitter(dispatch_table=True).render(self.rows)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+"""Tests for target-language emitters."""
+
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from analytics_codegen import emitters as emitters_module
+from analytics_codegen.codegen import EventRow, _render_swift
+from analytics_codegen.emitters import (
+    KotlinEmitter,
+    SwiftEmitter,
+    SwiftTableEmitter,
+    TypeScriptEmitter,
+    function_spec,
+    generate_targets_from_input,
+    parse_targets,
+    render_targets,
+    target_output_paths,
+)
+from analytics_codegen.input_source import FileInputSource
+
+
+class TestFunctionSpec(unittest.TestCase):
+    def test_spec_matches_swift_naming(self):
+        row = EventRow("my_ad", "boost_photo", "|", "button", "tap", "details", "ad")
+        spec = function_spec(row)
+        self.assertEqual(spec.name, "trackMyAdBoostPhotoComponentButtonTap")
+        self.assertTrue(spec.has_advertisement)
+        self.assertTrue(spec.has_event_details)
+        self.assertEqual(spec.fields[2], ("Component", "|", True))
+
+
+class TestEmitters(unittest.TestCase):
+    def setUp(self):
+        self.rows = [
+            EventRow("my_ad", "boost_photo", "post", "onboarding", "view"),
+            EventRow("my_ad", "boost_photo", "|", "button", "tap", "details", "ad"),
+        ]
+
+    def test_swift_matches_legacy_output(self):
+        self.assertEqual(SwiftEmitter().render(self.rows), _render_swift(self.rows))
+
+    def test_swift_table(self):
+        content = SwiftTableEmitter().render(self.rows)
+        self.assertIn("    /* 0 */ (.myAd, .boostPhoto, .post, .onboarding, .view),", content)
+        self.assertIn("    /* 1 */ (.myAd, .boostPhoto, nil, .button, .tap),", content)
+        self.assertIn(
+            "static func trackMyAdBoostPhotoPostOnboardingView() { trackDescriptor(0) }",
+            content,
+        )
+        self.assertIn(
+            "static func trackMyAdBoostPhotoComponentButtonTap(advertisement: "
+            "EventAdvertisementProtocol, component: Event.Component, parameters: "
+            "[EventDetailsParameter]) { trackDescriptor(1, advertisement: advertisement, "
+            "component: component, parameters: parameters) }",
+            content,
+        )
+        self.assertEqual(content.count("EventDetails("), 2)
+
+    def test_swift_event_strings(self):
+        for emitter in (SwiftEmitter(event_strings=True), SwiftTableEmitter(event_strings=True)):
+            content = emitter.render(self.rows)
+            self.assertEqual(content.count("typealias EventFieldStrings"), 1)
+            self.assertIn("trackMyAdBoostPhotoPostOnboardingViewEventKey", content)
+            self.assertNotIn("trackMyAdBoostPhotoComponentButtonTapEventKey", content)
+
+    def test_swift_event_strings_overloads(self):
+        rows = [
+            EventRow("home", "feed", "listing", "ad", "view", "", ""),
+            EventRow("home", "feed", "listing", "ad", "view", "", "ad"),
+        ]
+        for emitter in (SwiftEmitter(event_strings=True), SwiftTableEmitter(event_strings=True)):
+            content = emitter.render(rows)
+            self.assertEqual(content.count("func trackHomeFeedListingAdView("), 2)
+            self.assertEqual(content.count("static let trackHomeFeedListingAdViewEventKey:"), 1)
+            self.assertEqual(
+                content.count("static let trackHomeFeedListingAdViewEventFields:"), 1
+            )
+
+    def test_kotlin(self):
+        content = KotlinEmitter().render(self.rows)
+        self.assertIn("fun trackMyAdBoostPhotoPostOnboardingView() {", content)
+        self.assertIn("screen = Event.Screen.MY_AD", content)
+        self.assertIn(
+            "fun trackMyAdBoostPhotoComponentButtonTap(advertisement: EventAdvertisement, "
+            "component: Event.Component, parameters: List<EventDetailsParameter>)",
+            content,
+        )
+        self.assertIn("component = component", content)
+
+    def test_typescript(self):
+        content = TypeScriptEmitter().render(self.rows)
+        self.assertIn("export function trackMyAdBoostPhotoPostOnboardingView(): void {", content)
+        self.assertIn("screen: Event.Screen.myAd,", content)
+        self.assertIn("parameters: EventDetailsParameter[]", content)
+        self.assertIn("EventFactory.event(eventDetails, advertisement);", content)
+
+
+class TestTargets(unittest.TestCase):
+    def test_parse_targets(self):
+        names = [e.name for e in parse_targets("swift, kotlin,ts,swift")]
+        self.assertEqual(names, ["swift", "kotlin", "ts"])
+
+    def test_parse_unknown_target(self):
+        with self.assertRaises(ValueError) as cm:
+            parse_targets("swift,java")
+        self.assertIn("Unknown target: java", str(cm.exception))
+
+    def test_output_paths(self):
+        output = Path("out/Tracking.swift")
+        self.assertEqual(target_output_paths(parse_targets("swift"), output), [output])
+        self.assertEqual(
+            target_output_paths(parse_targets("swift,kotlin,ts"), output),
+            [Path("out/Tracking.swift"), Path("out/Tracking.kt"), Path("out/Tracking.ts")],
+        )
+
+    def test_output_paths_conflict(self):
+        with self.assertRaises(ValueError):
+            target_output_paths(parse_targets("swift,swift-table"), Path("out/T.swift"))
+
+    def test_parallel_render_matches_sequential(self):
+        rows = [EventRow("s", f"sec_{i}", "c", "e", "a") for i in range(5)]
+        targets = parse_targets("swift,kotlin")
+        expected = [e.render(rows) for e in targets]
+        with patch.object(emitters_module, "_PARALLEL_MIN_ROWS", 1):
+            self.assertEqual(render_targets(targets, rows), expected)
+
+    def test_generate_targets_parses_once(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = Path(tmp) / "analytics.csv"
+            csv_path.write_text("my_ad,boost_photo,post,onboarding,view,,\n", encoding="utf-8")
+            source = FileInputSource(csv_path)
+            targets = parse_targets("swift,kotlin,ts")
+            paths = target_output_paths(targets, Path(tmp) / "Tracking.swift")
+
+            with patch.object(source, "iter_tables", wraps=source.iter_tables) as fetch:
+                count = generate_targets_from_input(source, targets, paths)
+                self.assertEqual(fetch.call_count, 1)
+
+            self.assertEqual(count, 1)
+            for path in paths:
+                self.assertIn(
+                    "trackMyAdBoostPhotoPostOnboardingView",
+                    path.read_text(encoding="utf-8"),
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
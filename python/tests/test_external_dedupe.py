@@ -0,0 +1,94 @@
+"""Tests for spill-to-disk deduplication."""
+
+from __future__ import annotations
+
+import io
+import random
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from pathlib import Path
+from unittest.mock import patch
+
+from analytics_codegen import external_dedupe
+from analytics_codegen.codegen import EventRow, _deduplicate
+from analytics_codegen.external_dedupe import deduplicate_external
+
+
+def _rows(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        i = rng.randrange(count // 3)
+        details = rng.choice(["", "", "", "user_id|string"])
+        rows.append(
+            EventRow(f"screen_{i % 11}", f"section_{i}", "post", "button", "tap",
+                     details, rng.choice(["", "ad"]))
+        )
+    return rows
+
+
+class TestExternalDedupe(unittest.TestCase):
+    def _compare(self, rows, **kwargs):
+        expected_err = io.StringIO()
+        with redirect_stderr(expected_err):
+            expected = _deduplicate(rows)
+
+        actual_err = io.StringIO()
+        with tempfile.TemporaryDirectory() as tmp, redirect_stderr(actual_err):
+            actual = list(deduplicate_external(iter(rows), temp_dir=Path(tmp), **kwargs))
+            self.assertEqual(list(Path(tmp).iterdir()), [])
+
+        self.assertEqual(actual, expected)
+        self.assertEqual(actual_err.getvalue(), expected_err.getvalue())
+        return actual_err.getvalue()
+
+    def test_fits_in_memory(self):
+        rows = _rows(300)
+        with patch.object(external_dedupe, "_partition") as partition:
+            self._compare(rows, memory_budget=10 * 1024 * 1024)
+            partition.assert_not_called()
+
+    def test_spills_with_same_order_and_warnings(self):
+        warnings = self._compare(_rows(3000), memory_budget=20_000, partitions=8)
+        self.assertIn("Conflicting rows", warnings)
+
+    def test_repartitions_oversized_runs(self):
+        runs = []
+        dedupe_run = external_dedupe._dedupe_run
+
+        def record(path, size, spill, memory_budget, partitions, depth, *args):
+            runs.append((size, depth))
+            dedupe_run(path, size, spill, memory_budget, partitions, depth, *args)
+
+        with patch.object(external_dedupe, "_dedupe_run", record):
+            self._compare(_rows(2000), memory_budget=20_000, partitions=4)
+
+        self.assertGreater(max(depth for _, depth in runs), 0)
+        self.assertLess(max(depth for _, depth in runs), external_dedupe._MAX_DEPTH)
+        # Every row ends up in a run that was deduplicated within budget
+        deduped = [size for size, _ in runs if size <= 20_000]
+        self.assertEqual(sum(deduped), sum(size for size, depth in runs if depth == 0))
+
+    def test_merges_runs_in_batches(self):
+        write = external_dedupe._SpillDirectory.write
+        with patch.object(external_dedupe, "_MERGE_FAN_IN", 3), patch.object(
+            external_dedupe._SpillDirectory, "write", autospec=True, side_effect=write
+        ) as spill_write:
+            self._compare(_rows(3000), memory_budget=20_000, partitions=8)
+        self.assertIn("merged", [c.args[1] for c in spill_write.call_args_list])
+
+    def test_keeps_function_name(self):
+        rows = [EventRow("s", f"sec_{i}", "c", "e", "a") for i in range(50)]
+        rows[3] = EventRow("s", "sec_3", "c", "e", "a", function_name="trackRenamed")
+        result = list(deduplicate_external(rows, memory_budget=1_000, partitions=4))
+        self.assertEqual(result[3].function_name, "trackRenamed")
+        self.assertEqual(result[4].function_name, "")
+
+    def test_invalid_budget(self):
+        with self.assertRaises(ValueError):
+            list(deduplicate_external([], memory_budget=0))
+
+
+if __name__ == "__main__":
+    unittest.main()
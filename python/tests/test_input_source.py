@@ -2,18 +2,23 @@
 
 from __future__ import annotations
 
+import csv
 import io
 import unittest
 from pathlib import Path
+from typing import List
 from unittest.mock import MagicMock, patch
 from urllib import error
+from urllib.parse import parse_qs, urlsplit
 
+from analytics_codegen.codegen import _parse_csv_rows
 from analytics_codegen.input_source import (
     FileInputSource,
     GoogleSheetsInputSource,
     InputType,
     detect_input_type,
 )
+from analytics_codegen.sheets_server import SheetsStandIn
 
 
 class TestDetectInputType(unittest.TestCase):
@@ -121,7 +126,10 @@ class TestGoogleSheetsInputSource(unittest.TestCase):
         """Test successful CSV data fetching."""
         # Mock HTTP response
         mock_response = MagicMock()
-        mock_response.read.return_value = b"screen,section,component,element,action\nmy_ad,boost,post,button,tap"
+        mock_response.read.side_effect = [
+            b"screen,section,component,element,action\nmy_ad,boost,post,button,tap",
+            b"",
+        ]
         mock_response.__enter__.return_value = mock_response
         mock_urlopen.return_value = mock_response
 
@@ -185,5 +193,104 @@ class TestFileInputSource(unittest.TestCase):
         self.assertIn("Input file not found", str(cm.exception))
 
 
+class TestProjectedExport(unittest.TestCase):
+    """Test column projection and range limits against a local server."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.sheets = {}
+        cls.server = SheetsStandIn(cls.sheets).start()
+        cls.base_url = cls.server.base_url
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def _serve(self, rows: List[List[str]]) -> None:
+        out = io.StringIO()
+        csv.writer(out, lineterminator="\n").writerows(rows)
+        self.sheets["ABC123/7.csv"] = out.getvalue().encode("utf-8")
+        self.server.reset()
+
+    def setUp(self):
+        header = ["Owner", "Screen:", "Notes", "Section:", "Component:",
+                  "Element:", "Action:", "Comments", "event_details", "Advertisement ID"]
+        data = [
+            ["alice", "feed", "long note " * 20, "list", "post", "card", "tap",
+             "comment " * 30, "", ""],
+            ["bob", "profile", "note", "header", "avatar", "image", "view",
+             "", "user_id|string", "ad"],
+        ]
+        self._serve([header] + data)
+        self.url = "https://docs.google.com/spreadsheets/d/ABC123/edit#gid=7"
+
+    def _fetch(self, **kwargs) -> List[List[str]]:
+        source = GoogleSheetsInputSource(self.url, base_url=self.base_url, **kwargs)
+        return source.get_csv_rows()
+
+    def test_full_export(self):
+        """Test the default export downloads every column."""
+        rows = self._fetch()
+
+        self.assertEqual(len(rows[0]), 10)
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertIn("/ABC123/export?format=csv&gid=7", self.server.requests[0])
+
+    def test_projected_columns(self):
+        """Test only the header-mapped columns are downloaded."""
+        full = _parse_csv_rows(self._fetch())
+        full_bytes = self.server.bytes_sent
+        self.server.reset()
+
+        rows = self._fetch(project_columns=True)
+
+        self.assertEqual(
+            rows[0],
+            ["Screen:", "Section:", "Component:", "Element:", "Action:",
+             "event_details", "Advertisement ID"],
+        )
+        self.assertEqual(_parse_csv_rows(rows), full)
+        self.assertLess(self.server.bytes_sent, full_bytes)
+        query = parse_qs(urlsplit(self.server.requests[-1]).query)
+        self.assertEqual(query["tq"], ["select B, D, E, F, G, I, J"])
+        self.assertEqual(query["gid"], ["7"])
+
+    def test_range(self):
+        """Test an explicit range limits rows and columns."""
+        rows = self._fetch(cell_range="A1:J2")
+
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(_parse_csv_rows(rows)[0].screen, "feed")
+
+    def test_projection_within_range(self):
+        """Test projected columns are named by sheet column inside a range."""
+        rows = self._fetch(project_columns=True, cell_range="B1:J")
+
+        self.assertEqual(len(rows[0]), 7)
+        self.assertEqual(len(_parse_csv_rows(rows)), 2)
+        query = parse_qs(urlsplit(self.server.requests[-1]).query)
+        self.assertEqual(query["tq"], ["select B, D, E, F, G, I, J"])
+        self.assertEqual(query["range"], ["B1:J"])
+
+    def test_projection_within_sheet_range(self):
+        """Test the sheet name of a qualified range doesn't shift columns."""
+        for cell_range in ("Sheet1!B1:J", "'Q1!Plan'!B1:J"):
+            rows = self._fetch(project_columns=True, cell_range=cell_range)
+
+            self.assertEqual(len(_parse_csv_rows(rows)), 2)
+            query = parse_qs(urlsplit(self.server.requests[-1]).query)
+            self.assertEqual(query["tq"], ["select B, D, E, F, G, I, J"])
+
+    def test_projection_positional(self):
+        """Test sheets without a header row keep the first seven columns."""
+        self._serve([
+            ["feed", "list", "post", "card", "tap", "", "", "owner", "notes"],
+        ])
+
+        rows = self._fetch(project_columns=True)
+
+        self.assertEqual(rows, [["feed", "list", "post", "card", "tap", "", ""]])
+
+
 if __name__ == "__main__":
     unittest.main()
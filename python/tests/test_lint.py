@@ -0,0 +1,145 @@
+"""Tests for the taxonomy library linter."""
+
+from __future__ import annotations
+
+import io
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from pathlib import Path
+
+from analytics_codegen.cli import main
+from analytics_codegen.codegen import EventRow
+from analytics_codegen.lint import (
+    TaxonomyLibrary,
+    TrigramIndex,
+    _edit_distance,
+    lint_rows,
+    load_library,
+)
+
+LIBRARY = {
+    "screen": ["home", "listing", "my_profile", "settings"],
+    "component": {"post": "Ad posting", "search": "Search", "header": "Navigation"},
+    "section": ["feed", "search", "header"],
+    "element": ["button", "card", "field"],
+    "action": ["tap", "view", "select"],
+}
+
+
+def _row(screen="home", section="feed", component="post", element="card", action="tap"):
+    return EventRow(screen, section, component, element, action)
+
+
+class TestTrigramIndex(unittest.TestCase):
+    def test_suggestions(self):
+        index = TrigramIndex(["my_profile", "user_profile", "profile_edit", "listing"])
+        self.assertEqual(index.suggest("my_profil"), ["my_profile"])
+        self.assertEqual(index.suggest("user_profle")[0], "user_profile")
+        self.assertEqual(index.suggest("checkout"), [])
+
+    def test_edit_distance(self):
+        self.assertEqual(_edit_distance("tap", "tap", 2), 0)
+        self.assertEqual(_edit_distance("tpa", "tap", 2), 1)
+        self.assertEqual(_edit_distance("listng", "listing", 2), 1)
+        self.assertEqual(_edit_distance("home", "settings", 2), 3)
+
+
+class TestLintRows(unittest.TestCase):
+    def test_unknown_values_with_suggestions(self):
+        library = TaxonomyLibrary(LIBRARY)
+        rows = [
+            _row(),
+            _row(screen="hme"),
+            _row(screen="hme", action="veiw"),
+            _row(section="feed|serch"),
+            _row(screen="checkout"),
+        ]
+        issues = {(i.field, i.value): i for i in lint_rows(rows, library)}
+
+        self.assertEqual(
+            set(issues),
+            {("screen", "hme"), ("action", "veiw"), ("section", "serch"), ("screen", "checkout")},
+        )
+        self.assertEqual(issues["screen", "hme"].rows, 2)
+        self.assertEqual(issues["screen", "hme"].suggestions, ("home",))
+        self.assertEqual(issues["action", "veiw"].suggestions, ("view",))
+        self.assertEqual(issues["section", "serch"].suggestions, ("search",))
+        self.assertEqual(issues["screen", "checkout"].suggestions, ())
+        self.assertEqual(issues["section", "serch"].example, "home|post|*|card|tap")
+        self.assertIn("did you mean 'home'?", issues["screen", "hme"].message())
+
+    def test_missing_fields_are_not_checked(self):
+        library = TaxonomyLibrary({"action": ["tap"]})
+        self.assertEqual(lint_rows([_row(screen="anything")], library), [])
+        with self.assertRaises(ValueError):
+            TaxonomyLibrary({"client": ["ios"]})
+
+    def test_large_vocabulary(self):
+        words = [f"screen_{i:05d}_name" for i in range(20000)]
+        library = TaxonomyLibrary({"screen": words})
+        rows = [_row(screen=words[i % 20000]) for i in range(50000)]
+        rows.append(_row(screen="screen_01234_nmae"))
+        issues = lint_rows(rows, library)
+        self.assertEqual(len(issues), 1)
+        self.assertEqual(issues[0].suggestions[0], "screen_01234_name")
+
+
+class TestLoadLibrary(unittest.TestCase):
+    def test_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "taxonomy.json"
+            path.write_text(json.dumps(LIBRARY), encoding="utf-8")
+            library = load_library(path)
+            self.assertTrue(library.is_known("component", "search"))
+            self.assertFalse(library.is_known("component", "serch"))
+
+            path.write_text(json.dumps({"screen": [1, 2]}), encoding="utf-8")
+            with self.assertRaises(ValueError):
+                load_library(path)
+        with self.assertRaises(FileNotFoundError):
+            load_library(Path(tmp) / "missing.json")
+
+
+class TestLintStage(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.temp_dir.name)
+        self.library = self.dir / "taxonomy.json"
+        self.library.write_text(json.dumps(LIBRARY), encoding="utf-8")
+        self.csv_path = self.dir / "analytics.csv"
+        self.csv_path.write_text(
+            "home,feed,post,card,tap,,\nhme,feed,post,card,tap,,\n", encoding="utf-8"
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _run(self, options):
+        err = io.StringIO()
+        with redirect_stderr(err):
+            exit_code = main(
+                [
+                    "--input", str(self.csv_path),
+                    "--output", str(self.dir / "Tracking.swift"),
+                    "--stage", "lint=" + json.dumps(options),
+                ]
+            )
+        return exit_code, err.getvalue()
+
+    def test_warns(self):
+        exit_code, err = self._run({"library": str(self.library)})
+        self.assertEqual(exit_code, 0)
+        self.assertIn("Unknown screen 'hme' in hme|post|feed|card|tap (1 row)", err)
+        self.assertIn("did you mean 'home'?", err)
+
+    def test_strict_fails(self):
+        exit_code, err = self._run({"library": str(self.library), "strict": True})
+        self.assertEqual(exit_code, 1)
+        self.assertIn("1 taxonomy value(s) missing", err)
+        self.assertFalse((self.dir / "Tracking.swift").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+"""Tests for file locks, atomic writes and single-flight runs."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from analytics_codegen import emitters, locking
+from analytics_codegen.cli import main
+from analytics_codegen.locking import (
+    atomic_write_text,
+    file_lock,
+    flight_key,
+    single_flight,
+)
+
+
+class TestFileLock(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_lock_timeout(self):
+        path = self.dir / "locks" / "a.lock"
+        with file_lock(path):
+            with self.assertRaises(TimeoutError):
+                with file_lock(path, timeout=0.1):
+                    pass
+        # Released again
+        with file_lock(path, timeout=0.1):
+            pass
+
+    def test_atomic_write_keeps_mode(self):
+        path = self.dir / "out" / "Tracking.swift"
+        atomic_write_text(path, "first")
+        os.chmod(path, 0o640)
+
+        atomic_write_text(path, "second")
+
+        self.assertEqual(path.read_text(encoding="utf-8"), "second")
+        self.assertEqual(path.stat().st_mode & 0o777, 0o640)
+        self.assertEqual([p.name for p in path.parent.iterdir()], ["Tracking.swift"])
+
+    def test_default_lock_dir_is_private_per_user(self):
+        with patch.object(locking.tempfile, "gettempdir", return_value=str(self.dir)):
+            lock_dir = locking.default_lock_dir()
+            self.assertEqual(locking.default_lock_dir(), lock_dir)
+
+        self.assertEqual(lock_dir.parent, self.dir)
+        self.assertTrue(lock_dir.is_dir())
+        if hasattr(os, "getuid"):
+            self.assertEqual(lock_dir.name, f"analytics-codegen-locks-{os.getuid()}")
+            self.assertEqual(lock_dir.stat().st_mode & 0o777, 0o700)
+
+    def test_flight_result_only_shared_with_waiting_runs(self):
+        output = self.dir / "A.swift"
+        other = self.dir / "B.swift"
+        key = flight_key("input.csv", {"target": "swift"})
+
+        with single_flight(self.dir, key) as flight:
+            output.write_text("generated", encoding="utf-8")
+            flight.publish(7, {"swift": output})
+
+        # Started after the first run finished: must run itself
+        with single_flight(self.dir, key) as flight:
+            self.assertIsNone(flight.shared_count({"swift": other}))
+
+        # Started while the first run was still going: reuses its output
+        with single_flight(self.dir, key) as flight:
+            flight.started -= 60
+            self.assertEqual(flight.shared_count({"swift": other}), 7)
+        self.assertEqual(other.read_text(encoding="utf-8"), "generated")
+
+        # Output changed since it was published: must run itself
+        output.write_text("edited", encoding="utf-8")
+        with single_flight(self.dir, key) as flight:
+            flight.started -= 60
+            self.assertIsNone(flight.shared_count({"swift": other}))
+
+
+class TestConcurrentRuns(unittest.TestCase):
+    def test_concurrent_runs_generate_once(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = Path(tmp) / "analytics.csv"
+            csv_path.write_text("my_ad,boost_photo,post,onboarding,view,,\n", encoding="utf-8")
+            output = Path(tmp) / "Tracking.swift"
+            generate = emitters.generate_targets_from_input
+            calls = []
+
+            def slow_generate(*args, **kwargs):
+                calls.append(1)
+                time.sleep(0.3)
+                return generate(*args, **kwargs)
+
+            results = []
+            argv = ["--input", str(csv_path), "--output", str(output)]
+            with patch.object(locking, "default_lock_dir", return_value=Path(tmp) / "locks"), \
+                    patch.object(emitters, "generate_targets_from_input", slow_generate):
+                threads = [
+                    threading.Thread(target=lambda: results.append(main(list(argv))))
+                    for _ in range(4)
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+
+            self.assertEqual(results, [0, 0, 0, 0])
+            self.assertEqual(len(calls), 1)
+            self.assertIn("trackMyAdBoostPhotoPostOnboardingView", output.read_text())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+"""Tests for the event log coverage analyzer."""
+
+from __future__ import annotations
+
+import gzip
+import io
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest.mock import patch
+
+from analytics_codegen import log_coverage
+from analytics_codegen.cli import main
+from analytics_codegen.log_coverage import (
+    analyze_logs,
+    count_events,
+    format_coverage_text,
+    plan_shards,
+)
+
+KEYS = [
+    "settings|language|settings|field|select",
+    "feed|post|*|card|tap",
+    "my_ad|post|boost_photo|onboarding|view",
+]
+CLIENTS = ["android", "ios", "web"]
+
+LOG_LINES = [
+    '{"event": "web|settings|language|settings|field|select", "ts": 1}',
+    '{"client": "ios", "screen": "feed", "component": "post", '
+    '"section": "recommended", "element": "card", "action": "tap"}',
+    "android|feed|post|nearby|card|tap",
+    '"ios|feed|post|nearby|card|tap"',
+    "",
+    "ios|feed|post|nearby|card|view",
+    "{not json",
+    '{"ts": 2}',
+    "ios|feed|post|nearby|card|view",
+]
+
+
+class TestLogCoverage(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.temp_dir.name)
+        self.log = self.dir / "events.ndjson"
+        self.log.write_text("\n".join(LOG_LINES * 20) + "\n", encoding="utf-8")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_report(self):
+        report = analyze_logs(KEYS, [self.log], CLIENTS)
+        self.assertEqual(
+            report.defined,
+            {KEYS[0]: 20, KEYS[1]: 60, KEYS[2]: 0},
+        )
+        self.assertEqual(report.unused, [KEYS[2]])
+        self.assertEqual(report.undefined, {"ios|feed|post|nearby|card|view": 40})
+        self.assertEqual(report.records, 160)
+        self.assertEqual(report.malformed, 40)
+        self.assertAlmostEqual(report.coverage, 2 / 3)
+
+    def test_byte_ranges_count_every_line_once(self):
+        whole = count_events(plan_shards([self.log], shard_bytes=1 << 30))
+        for shard_bytes in (1, 7, 64, 1000):
+            shards = plan_shards([self.log], shard_bytes=shard_bytes)
+            self.assertGreater(len(shards), 1)
+            sharded = count_events(shards, workers=1)
+            self.assertEqual(sharded.events, whole.events)
+            self.assertEqual(sharded.records, whole.records)
+            self.assertEqual(sharded.malformed, whole.malformed)
+
+    def test_worker_processes_and_gzip(self):
+        gz_log = self.dir / "events.ndjson.gz"
+        with gzip.open(gz_log, "wb") as f:
+            f.write(self.log.read_bytes())
+
+        with patch.object(log_coverage, "_PARALLEL_MIN_BYTES", 0):
+            report = analyze_logs(
+                KEYS, [self.log, gz_log], CLIENTS, workers=2, shard_bytes=256
+            )
+
+        self.assertEqual(report.defined, {KEYS[0]: 40, KEYS[1]: 120, KEYS[2]: 0})
+        self.assertEqual(report.records, 320)
+
+    def test_missing_log(self):
+        with self.assertRaises(FileNotFoundError):
+            plan_shards([self.dir / "missing.ndjson"])
+
+    def test_text_format(self):
+        text = format_coverage_text(analyze_logs(KEYS, [self.log], CLIENTS), top=1)
+        self.assertIn("Defined events that never fired (1):", text)
+        self.assertIn("40  ios|feed|post|nearby|card|view", text)
+        self.assertIn("2/3 defined events fired (67%), 160 records", text)
+
+
+class TestAnalyzeCLI(unittest.TestCase):
+    def test_json_report(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = Path(tmp) / "analytics.csv"
+            csv_path.write_text(
+                "my_ad,boost_photo,post,onboarding,view,,\n"
+                "feed,feed|search,post,card,tap,,\n",
+                encoding="utf-8",
+            )
+            log = Path(tmp) / "events.log"
+            log.write_text(
+                "ios|feed|post|top|card|tap\nios|unknown|post|top|card|tap\n",
+                encoding="utf-8",
+            )
+
+            out = io.StringIO()
+            with redirect_stdout(out):
+                exit_code = main(
+                    ["analyze", str(log), "--input", str(csv_path), "--format", "json"]
+                )
+
+            self.assertEqual(exit_code, 0)
+            data = json.loads(out.getvalue())
+            self.assertEqual(data["unused"], ["my_ad|post|boost_photo|onboarding|view"])
+            self.assertEqual(data["undefined"], {"ios|unknown|post|top|card|tap": 1})
+            self.assertEqual(data["summary"]["coverage"], 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+"""Tests for per-stage memory profiling."""
+
+from __future__ import annotations
+
+import io
+import json
+import tempfile
+import tracemalloc
+import unittest
+from contextlib import redirect_stderr
+from pathlib import Path
+
+from analytics_codegen.cli import main
+from analytics_codegen.memprofile import MemoryProfiler
+
+
+class TestMemoryProfiler(unittest.TestCase):
+    def test_peak_and_retained(self):
+        profiler = MemoryProfiler(top_sites=3)
+        profiler.start()
+        try:
+            with profiler.stage("temporary"):
+                data = [bytes(1000) for _ in range(1000)]
+                del data
+            with profiler.stage("kept"):
+                kept = [bytes(1000) for _ in range(1000)]
+        finally:
+            profiler.stop()
+
+        temporary, retained = profiler.profile.stages
+        self.assertGreater(temporary.peak_bytes, 1_000_000)
+        self.assertLess(temporary.retained_bytes, 100_000)
+        self.assertGreater(retained.retained_bytes, 1_000_000)
+        self.assertEqual(retained.top_allocations[0].file, __file__)
+        self.assertLessEqual(len(retained.top_allocations), 3)
+        self.assertFalse(tracemalloc.is_tracing())
+        del kept
+
+    def test_stage_without_tracing(self):
+        profiler = MemoryProfiler()
+        with profiler.stage("ignored"):
+            pass
+        self.assertEqual(profiler.profile.stages, [])
+
+
+class TestMemprofileCLI(unittest.TestCase):
+    def test_writes_stage_report(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = Path(tmp) / "analytics.csv"
+            csv_path.write_text(
+                "my_ad,boost_photo,post,onboarding,view,,\n" * 2, encoding="utf-8"
+            )
+            report = Path(tmp) / "memory.json"
+
+            exit_code = main(
+                [
+                    "--input", str(csv_path),
+                    "--output", str(Path(tmp) / "Tracking.swift"),
+                    "--memprofile", str(report),
+                ]
+            )
+
+            self.assertEqual(exit_code, 0)
+            data = json.loads(report.read_text(encoding="utf-8"))
+            self.assertEqual(
+                [stage["name"] for stage in data["stages"]],
+                ["fetch", "parse", "dedupe", "collisions", "render", "write"],
+            )
+            self.assertEqual(data["metadata"]["rows_parsed"], 2)
+            self.assertEqual(data["metadata"]["functions"], 1)
+            self.assertGreater(data["peak_bytes"], 0)
+
+    def test_counts_rows_streamed_into_dedupe(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = Path(tmp) / "analytics.csv"
+            csv_path.write_text(
+                "my_ad,boost_photo,post,onboarding,view,,\n" * 3, encoding="utf-8"
+            )
+            report = Path(tmp) / "memory.json"
+
+            exit_code = main(
+                [
+                    "--input", str(csv_path),
+                    "--output", str(Path(tmp) / "Tracking.swift"),
+                    "--dedupe-memory-mb", "1",
+                    "--memprofile", str(report),
+                ]
+            )
+
+            self.assertEqual(exit_code, 0)
+            data = json.loads(report.read_text(encoding="utf-8"))
+            self.assertEqual(data["stages"][1]["name"], "parse+dedupe")
+            self.assertEqual(data["metadata"]["rows_parsed"], 3)
+
+    def test_unwritable_report_fails_run(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = Path(tmp) / "analytics.csv"
+            csv_path.write_text("my_ad,boost_photo,post,onboarding,view,,\n", encoding="utf-8")
+            output = Path(tmp) / "Tracking.swift"
+
+            err = io.StringIO()
+            with redirect_stderr(err):
+                exit_code = main(
+                    ["--input", str(csv_path), "--output", str(output), "--memprofile", tmp]
+                )
+
+            self.assertEqual(exit_code, 1)
+            self.assertIn("Could not write memory profile", err.getvalue())
+            self.assertTrue(output.exists())
+
+            err = io.StringIO()
+            with redirect_stderr(err):
+                exit_code = main(
+                    ["--input", str(Path(tmp) / "missing.csv"), "--output", str(output),
+                     "--memprofile", tmp]
+                )
+
+            self.assertEqual(exit_code, 1)
+            self.assertIn("not found", err.getvalue().lower())
+
+
+if __name__ == "__main__":
+    unittest.main()
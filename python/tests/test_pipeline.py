@@ -0,0 +1,266 @@
+"""Tests for the pluggable generation pipeline."""
+
+from __future__ import annotations
+
+import io
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from dataclasses import replace
+from pathlib import Path
+
+from analytics_codegen import pipeline
+from analytics_codegen.cli import main
+from analytics_codegen.emitters import SwiftEmitter
+from analytics_codegen.input_source import FileInputSource
+from analytics_codegen.pipeline import (
+    Pipeline,
+    StageSpec,
+    default_stages,
+    load_pipeline_config,
+    parse_stage_spec,
+    register_stage,
+)
+
+
+def legacy_suffix_stage(suffix: str):
+    """Factory referenced by module path in the tests."""
+
+    def stage(rows):
+        return [replace(row, screen=row.screen + suffix) for row in rows]
+
+    return stage
+
+
+class TestStageSpecs(unittest.TestCase):
+    def test_parse_stage_spec(self):
+        self.assertEqual(parse_stage_spec("dedupe"), StageSpec("dedupe"))
+        self.assertEqual(
+            parse_stage_spec('drop={"field": "screen", "values": ["old"]}'),
+            StageSpec("drop", {"field": "screen", "values": ["old"]}),
+        )
+        with self.assertRaises(ValueError):
+            parse_stage_spec("drop=[1]")
+        with self.assertRaises(ValueError):
+            parse_stage_spec("drop={oops")
+
+    def test_load_pipeline_config(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "pipeline.json"
+            path.write_text(
+                json.dumps(
+                    {
+                        "stages": [
+                            "disambiguate",
+                            {"name": "rename", "options": {"field": "screen", "mapping": {}}},
+                        ]
+                    }
+                ),
+                encoding="utf-8",
+            )
+            self.assertEqual(
+                load_pipeline_config(path),
+                [
+                    StageSpec("disambiguate"),
+                    StageSpec("rename", {"field": "screen", "mapping": {}}),
+                ],
+            )
+            path.write_text('{"stages": [1]}', encoding="utf-8")
+            with self.assertRaises(ValueError):
+                load_pipeline_config(path)
+
+    def test_default_stages(self):
+        self.assertEqual(
+            default_stages(), [StageSpec("dedupe"), StageSpec("collisions")]
+        )
+        custom = [StageSpec("drop", {"field": "screen", "values": []})]
+        self.assertEqual(
+            default_stages(custom, disambiguate=True, memory_budget=10),
+            custom
+            + [StageSpec("dedupe", {"memory_budget": 10}), StageSpec("disambiguate")],
+        )
+        # A built-in placed explicitly is not added again
+        explicit = [StageSpec("dedupe"), StageSpec("rename", {"field": "screen", "mapping": {}})]
+        self.assertEqual(
+            default_stages(explicit), explicit + [StageSpec("collisions")]
+        )
+
+    def test_unknown_stage_and_bad_options(self):
+        with self.assertRaises(ValueError):
+            Pipeline([StageSpec("nope")])
+        with self.assertRaises(ValueError):
+            Pipeline([StageSpec("drop", {"values": []})])
+        with self.assertRaises(ValueError):
+            Pipeline([StageSpec("drop", {"field": "colour", "values": []})])
+        with self.assertRaises(ValueError):
+            Pipeline([StageSpec("missing.module:factory")])
+
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.temp_dir.name)
+        self.csv_path = self.dir / "analytics.csv"
+        self.csv_path.write_text(
+            "legacy_feed,banner,post,photo,tap,,\n"
+            "feed,banner,post,photo,tap,,\n"
+            "settings,logout,button,confirm,tap,,\n"
+            "deprecated,promo,post,photo,view,,\n",
+            encoding="utf-8",
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_stages_run_in_order_once_per_batch(self):
+        calls = []
+
+        @register_stage("record_batches")
+        def record_batches():
+            def stage(rows):
+                calls.append(len(rows))
+                return rows
+
+            return stage
+
+        try:
+            stages = default_stages(
+                [
+                    StageSpec("record_batches"),
+                    StageSpec("rename", {"field": "screen", "mapping": {"legacy_feed": "feed"}}),
+                    StageSpec("drop", {"field": "screen", "values": ["deprecated"]}),
+                ]
+            )
+            rows = Pipeline(stages).rows(FileInputSource(self.csv_path))
+        finally:
+            del pipeline.STAGES["record_batches"]
+
+        self.assertEqual(calls, [4])
+        # The renamed legacy row is deduplicated against the current one
+        self.assertEqual(
+            [(row.screen, row.section) for row in rows],
+            [("feed", "banner"), ("settings", "logout")],
+        )
+
+    def test_append_and_module_factory(self):
+        extra = self.dir / "ios_only.csv"
+        extra.write_text("widget,today,card,summary,view,,\n", encoding="utf-8")
+        stages = [
+            StageSpec("append", {"path": str(extra)}),
+            StageSpec(f"{__name__}:legacy_suffix_stage", {"suffix": "_ios"}),
+        ]
+        rows = Pipeline(stages).rows(FileInputSource(self.csv_path))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[-1].screen, "widget_ios")
+
+    def test_streaming_dedupe(self):
+        stages = default_stages(memory_budget=1)
+        self.assertTrue(getattr(Pipeline(stages).stages[0], "streaming", False))
+        with redirect_stderr(io.StringIO()):
+            rows = Pipeline(stages).rows(FileInputSource(self.csv_path))
+        self.assertEqual(len(rows), 4)
+
+    def test_streaming_dedupe_after_custom_stage_warns(self):
+        stages = default_stages(
+            [StageSpec("drop", {"field": "screen", "values": ["deprecated"]})],
+            memory_budget=1,
+        )
+        err = io.StringIO()
+        with redirect_stderr(err):
+            rows = Pipeline(stages).rows(FileInputSource(self.csv_path))
+        self.assertEqual(len(rows), 3)
+        self.assertIn("--dedupe-memory-mb doesn't bound it", err.getvalue())
+
+    def test_run_writes_targets(self):
+        output = self.dir / "Tracking.swift"
+        count = Pipeline(default_stages()).run(
+            FileInputSource(self.csv_path), [SwiftEmitter()], [output]
+        )
+        self.assertEqual(count, 4)
+        self.assertIn("trackSettingsLogoutButtonConfirmTap", output.read_text())
+
+
+class TestPipelineCLI(unittest.TestCase):
+    def test_stage_and_config_flags(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = Path(tmp) / "analytics.csv"
+            csv_path.write_text(
+                "legacy_feed,banner,post,photo,tap,,\n"
+                "deprecated,promo,post,photo,view,,\n",
+                encoding="utf-8",
+            )
+            config = Path(tmp) / "pipeline.json"
+            config.write_text(
+                json.dumps(
+                    {
+                        "stages": [
+                            {
+                                "name": "rename",
+                                "options": {"field": "screen", "mapping": {"legacy_feed": "feed"}},
+                            }
+                        ]
+                    }
+                ),
+                encoding="utf-8",
+            )
+            output = Path(tmp) / "Tracking.swift"
+
+            exit_code = main(
+                [
+                    "--input", str(csv_path),
+                    "--output", str(output),
+                    "--pipeline-config", str(config),
+                    "--stage", 'drop={"field": "screen", "values": ["deprecated"]}',
+                ]
+            )
+
+            self.assertEqual(exit_code, 0)
+            content = output.read_text(encoding="utf-8")
+            self.assertIn("trackFeedBannerPostPhotoTap", content)
+            self.assertNotIn("Deprecated", content)
+
+    def test_cache_key_includes_stage_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = Path(tmp) / "analytics.csv"
+            csv_path.write_text("feed,banner,post,photo,tap,,\n", encoding="utf-8")
+            extra = Path(tmp) / "ios_only.csv"
+            output = Path(tmp) / "Tracking.swift"
+            argv = [
+                "--input", str(csv_path),
+                "--output", str(output),
+                "--cache-dir", str(Path(tmp) / "cache"),
+                "--stage", f'append={{"path": {json.dumps(str(extra))}}}',
+            ]
+
+            for screen in ("widget", "watch"):
+                extra.write_text(f"{screen},today,card,summary,view,,\n", encoding="utf-8")
+                out = io.StringIO()
+                with redirect_stdout(out):
+                    self.assertEqual(main(argv), 0)
+                self.assertIn("Cache miss", out.getvalue())
+                self.assertIn(f"track{screen.capitalize()}Today", output.read_text())
+
+            out = io.StringIO()
+            with redirect_stdout(out):
+                suffix_stage = f'{__name__}:legacy_suffix_stage={{"suffix": "_ios"}}'
+                self.assertEqual(main(argv + ["--stage", suffix_stage]), 0)
+            self.assertIn("Cache skipped", out.getvalue())
+            self.assertIn("trackFeedIosBanner", output.read_text())
+
+    def test_unknown_stage_fails(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = Path(tmp) / "analytics.csv"
+            csv_path.write_text("a,b,c,d,e,,\n", encoding="utf-8")
+            err = io.StringIO()
+            with redirect_stderr(err):
+                exit_code = main(
+                    ["--input", str(csv_path), "--output", str(Path(tmp) / "T.swift"),
+                     "--stage", "nope"]
+                )
+            self.assertEqual(exit_code, 1)
+            self.assertIn("Unknown pipeline stage 'nope'", err.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+"""Tests for text and JSON-lines progress reporting."""
+
+from __future__ import annotations
+
+import io
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+from analytics_codegen import progress
+from analytics_codegen.cli import main
+from analytics_codegen.progress import JsonlProgressReporter, create_reporter, reporting
+
+
+def _events(text: str):
+    return [json.loads(line) for line in text.splitlines()]
+
+
+class TestJsonlProgressReporter(unittest.TestCase):
+    def test_warnings_are_capped_and_aggregated(self):
+        stream = io.StringIO()
+        reporter = JsonlProgressReporter(stream, max_warnings=2, interval=3600)
+        with reporting(reporter):
+            with reporter.stage("dedupe"):
+                for i in range(500):
+                    progress.warn("conflict", f"conflict {i}")
+            reporter.summary(3, ["Out.swift"])
+
+        events = _events(stream.getvalue())
+        kinds = [e["event"] for e in events]
+        self.assertEqual(kinds[:3], ["stage", "warning", "warning"])
+        self.assertEqual(kinds[-2:], ["stage", "summary"])
+        aggregates = [e for e in events if e["event"] == "warnings"]
+        # The first aggregate is sent right away, the rest at the stage end
+        self.assertLessEqual(len(aggregates), 2)
+        self.assertEqual(sum(e["suppressed"] for e in aggregates), 498)
+        self.assertEqual(aggregates[-1]["total"], 500)
+        self.assertEqual(events[-1]["warnings"], {"conflict": 500})
+        self.assertEqual(events[-1]["outputs"], ["Out.swift"])
+
+    def test_progress_is_throttled(self):
+        stream = io.StringIO()
+        reporter = JsonlProgressReporter(stream, interval=3600)
+        reporter.fetched(10)
+        reporter.fetched(20)
+        rows = list(reporter.count_rows(range(5000)))
+        with reporter.stage("parse"):
+            pass
+
+        events = _events(stream.getvalue())
+        self.assertEqual(len(rows), 5000)
+        self.assertEqual(
+            [e["event"] for e in events], ["fetch", "rows", "fetch", "stage", "stage"]
+        )
+        self.assertEqual(events[0]["bytes"], 10)
+        self.assertEqual(events[1]["parsed"], 5000)
+        self.assertEqual(events[2]["bytes"], 30)
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            create_reporter("xml")
+
+    def test_default_reporter_prints_warnings(self):
+        err = io.StringIO()
+        with redirect_stderr(err):
+            progress.warn("conflict", "⚠️ plain")
+        self.assertEqual(err.getvalue(), "⚠️ plain\n")
+
+
+class TestProgressCLI(unittest.TestCase):
+    def test_jsonl_run(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = Path(tmp) / "analytics.csv"
+            csv_path.write_text(
+                "".join(f"feed,banner,post,card,tap,id_{i}|string,\n" for i in range(50)),
+                encoding="utf-8",
+            )
+            output = Path(tmp) / "Tracking.swift"
+
+            out, err = io.StringIO(), io.StringIO()
+            with redirect_stdout(out), redirect_stderr(err):
+                exit_code = main(
+                    [
+                        "--input", str(csv_path),
+                        "--output", str(output),
+                        "--progress-format", "jsonl",
+                    ]
+                )
+
+            self.assertEqual(exit_code, 0)
+            self.assertEqual(err.getvalue(), "")
+            events = _events(out.getvalue())
+            stages = [
+                e["stage"] for e in events if e["event"] == "stage" and e["status"] == "end"
+            ]
+            self.assertEqual(
+                stages, ["fetch", "parse", "dedupe", "collisions", "render", "write"]
+            )
+            rows = [e["parsed"] for e in events if e["event"] == "rows"]
+            self.assertEqual(rows[-1], 50)
+            warnings = [e for e in events if e["event"] == "warning"]
+            self.assertEqual(len(warnings), progress.DEFAULT_MAX_WARNINGS)
+            summary = events[-1]
+            self.assertEqual(summary["event"], "summary")
+            self.assertEqual(summary["functions"], 1)
+            self.assertEqual(summary["warnings"], {"conflict": 49})
+
+    def test_jsonl_error(self):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            exit_code = main(
+                ["--input", "/nonexistent/file.csv", "--progress-format", "jsonl"]
+            )
+        self.assertEqual(exit_code, 1)
+        error, summary = _events(out.getvalue())[-2:]
+        self.assertEqual(error["event"], "error")
+        self.assertIn("Input file not found", error["message"])
+        self.assertEqual(summary["status"], "error")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+"""Tests for the Google Sheets stand-in server and the network benchmark."""
+
+from __future__ import annotations
+
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from urllib import error, request
+
+from analytics_codegen.input_source import GoogleSheetsInputSource
+from analytics_codegen.sheets_benchmark import SCENARIOS, format_results, run_benchmark
+from analytics_codegen.sheets_server import (
+    RESET,
+    NetworkProfile,
+    SheetsStandIn,
+    parse_faults,
+)
+
+URL = "https://docs.google.com/spreadsheets/d/ABC123/edit#gid=7"
+CSV = b"Screen:,Section:,Component:,Element:,Action:\n" + b"".join(
+    b"screen_%d,section,post,card,tap\n" % i for i in range(5000)
+)
+
+
+class TestSheetsStandIn(unittest.TestCase):
+    def setUp(self):
+        self.server = SheetsStandIn({"ABC123.csv": CSV}).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def _rows(self):
+        return GoogleSheetsInputSource(URL, base_url=self.server.base_url).get_csv_rows()
+
+    def test_fixture_directory(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            (Path(tmp) / "ABC123").mkdir()
+            (Path(tmp) / "ABC123" / "7.csv").write_bytes(b"a,b\n")
+            (Path(tmp) / "ABC123.csv").write_bytes(b"c,d\n")
+            with SheetsStandIn(Path(tmp)) as server:
+                tab = GoogleSheetsInputSource(URL, base_url=server.base_url)
+                first = GoogleSheetsInputSource(URL.split("#")[0], base_url=server.base_url)
+                self.assertEqual(tab.get_csv_rows(), [["a", "b"]])
+                self.assertEqual(first.get_csv_rows(), [["c", "d"]])
+
+                missing = GoogleSheetsInputSource(
+                    "https://docs.google.com/spreadsheets/d/NOPE/edit",
+                    base_url=server.base_url,
+                )
+                with self.assertRaises(FileNotFoundError):
+                    missing.get_csv_rows()
+
+    def test_chunked_transfer(self):
+        self.server.reset(NetworkProfile(chunked=True, chunk_size=1000))
+        rows = self._rows()
+        self.assertEqual(len(rows), 5001)
+        self.assertEqual(self.server.bytes_sent, len(CSV))
+
+    def test_latency_and_bandwidth(self):
+        self.server.reset(NetworkProfile(latency=0.1, bandwidth=len(CSV) * 4))
+        started = time.monotonic()
+        self._rows()
+        self.assertGreaterEqual(time.monotonic() - started, 0.3)
+
+    def test_faults_then_success(self):
+        self.server.reset(NetworkProfile(faults=(429, 503), retry_after=2))
+        export_url = f"{self.server.base_url}/ABC123/export?format=csv&gid=0"
+        with self.assertRaises(error.HTTPError) as cm:
+            request.urlopen(export_url)
+        self.assertEqual(cm.exception.code, 429)
+        self.assertEqual(cm.exception.headers["Retry-After"], "2")
+
+        with self.assertRaises(ValueError) as cm:
+            self._rows()
+        self.assertIn("HTTP error 503", str(cm.exception))
+
+        self.assertEqual(len(self._rows()), 5001)
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_reset_is_not_a_short_sheet(self):
+        for chunked in (False, True):
+            self.server.reset(NetworkProfile(faults=(RESET,), chunked=chunked))
+            with self.assertRaises(ValueError):
+                self._rows()
+
+    def test_parse_faults(self):
+        self.assertEqual(parse_faults("429, 503,reset"), (429, 503, RESET))
+        with self.assertRaises(ValueError):
+            parse_faults("200")
+
+
+class TestSheetsBenchmark(unittest.TestCase):
+    def test_scenarios(self):
+        names = ["baseline", "chunked", "rate_limited", "reset"]
+        results = run_benchmark([SCENARIOS[n] for n in names], rows=200, repeat=1)
+
+        by_name = {r.name: r for r in results}
+        self.assertEqual(by_name["baseline"].exit_code, 0)
+        self.assertEqual(by_name["chunked"].exit_code, 0)
+        self.assertEqual(by_name["rate_limited"].exit_code, 1)
+        self.assertEqual(by_name["reset"].exit_code, 1)
+        self.assertGreater(by_name["baseline"].peak_bytes, 0)
+        self.assertEqual(by_name["baseline"].requests, 1)
+        self.assertIn("rate_limited", format_results(results))
+
+
+if __name__ == "__main__":
+    unittest.main()
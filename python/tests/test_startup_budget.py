@@ -0,0 +1,70 @@
+"""Tests for CLI startup time and lazy imports."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from analytics_codegen.startup_budget import (
+    DEFAULT_BUDGET_MS,
+    FORBIDDEN_MODULES,
+    measure,
+    parse_importtime,
+)
+
+# Timing depends on machine load, so the budget is only checked on request
+TIMING_TESTS_ENV = "ANALYTICS_CODEGEN_TIMING_TESTS"
+
+
+class TestParseImporttime(unittest.TestCase):
+    """Test parsing of `-X importtime` output."""
+
+    def test_parse_lines(self):
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   _io\n"
+            "import time:      2386 |      18322 | analytics_codegen.cli\n"
+            "unrelated line\n"
+        )
+        modules = parse_importtime(stderr)
+        self.assertEqual(modules, {"_io": (120, 120), "analytics_codegen.cli": (2386, 18322)})
+
+
+class TestStartupBudget(unittest.TestCase):
+    """Run fresh interpreters and check what the CLI imports."""
+
+    def test_cli_import_skips_network_modules(self):
+        report = measure(runs=1)
+        self.assertEqual(report.forbidden_imports(), [])
+
+    def test_local_csv_run_skips_network_modules(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = Path(tmp) / "analytics.csv"
+            swift_path = Path(tmp) / "out.swift"
+            csv_path.write_text("my_ad,boost_photo,post,onboarding,view,,\n", encoding="utf-8")
+            code = (
+                "import analytics_codegen.cli as cli; "
+                f"cli.main(['--input', {str(csv_path)!r}, '--output', {str(swift_path)!r}])"
+            )
+            report = measure(code=code, runs=1)
+            self.assertTrue(swift_path.is_file())
+
+        for name in FORBIDDEN_MODULES:
+            self.assertNotIn(name, report.modules)
+        # Only imported with --memprofile and --cache-dir
+        for name in ("tracemalloc", "analytics_codegen.artifact_cache"):
+            self.assertNotIn(name, report.modules)
+
+    @unittest.skipUnless(
+        os.environ.get(TIMING_TESTS_ENV),
+        f"wall-clock budget; set {TIMING_TESTS_ENV}=1 to check it",
+    )
+    def test_cli_import_within_budget(self):
+        report = measure(runs=3)
+        self.assertLessEqual(report.cumulative_ms, DEFAULT_BUDGET_MS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+"""Tests for the generated-function symbol table."""
+
+from __future__ import annotations
+
+import io
+import unittest
+from contextlib import redirect_stderr
+
+from analytics_codegen.codegen import EventRow, _generate_function
+from analytics_codegen.symbols import (
+    DUPLICATE,
+    OVERLOAD,
+    build_symbol_table,
+    disambiguate_rows,
+    report_collisions,
+)
+
+
+class TestCollisions(unittest.TestCase):
+    def test_no_collisions(self):
+        rows = [
+            EventRow("home", "feed", "listing", "ad", "view"),
+            EventRow("home", "feed", "listing", "ad", "tap"),
+        ]
+        self.assertEqual(build_symbol_table(rows).collisions, [])
+
+    def test_split_boundary_duplicate(self):
+        rows = [
+            EventRow("my_ad", "boost", "post", "button", "tap"),
+            EventRow("my", "ad_boost", "post", "button", "tap"),
+        ]
+        collisions = build_symbol_table(rows).collisions
+        self.assertEqual(len(collisions), 1)
+        self.assertEqual(collisions[0].name, "trackMyAdBoostPostButtonTap")
+        self.assertEqual(collisions[0].kind, DUPLICATE)
+        self.assertEqual([s.row for s in collisions[0].symbols], rows)
+
+    def test_parameter_collapses_to_type_name(self):
+        rows = [
+            EventRow("home", "feed", "|", "button", "tap"),
+            EventRow("home", "feed", "component", "button", "tap"),
+        ]
+        collisions = build_symbol_table(rows).collisions
+        self.assertEqual(len(collisions), 1)
+        self.assertEqual(collisions[0].kind, OVERLOAD)
+
+    def test_advertisement_overloads_not_reported(self):
+        rows = [
+            EventRow("home", "feed", "listing", "ad", "view", "", ""),
+            EventRow("home", "feed", "listing", "ad", "view", "", "ad"),
+        ]
+        self.assertEqual(build_symbol_table(rows).collisions, [])
+        f = io.StringIO()
+        with redirect_stderr(f):
+            self.assertEqual(disambiguate_rows(rows), rows)
+        self.assertEqual(f.getvalue(), "")
+
+    def test_report_lists_rows(self):
+        rows = [
+            EventRow("my_ad", "boost", "post", "button", "tap"),
+            EventRow("my", "ad_boost", "post", "button", "tap"),
+        ]
+        f = io.StringIO()
+        with redirect_stderr(f):
+            report_collisions(build_symbol_table(rows).collisions)
+        output = f.getvalue()
+        self.assertIn("⚠️ Function name collision for trackMyAdBoostPostButtonTap", output)
+        self.assertIn("screen=my_ad, section=boost", output)
+        self.assertIn("screen=my, section=ad_boost", output)
+
+
+class TestDisambiguation(unittest.TestCase):
+    def test_first_row_keeps_name(self):
+        rows = [
+            EventRow("my_ad", "boost", "post", "button", "tap"),
+            EventRow("my", "ad_boost", "post", "button", "tap"),
+        ]
+        with redirect_stderr(io.StringIO()):
+            result = disambiguate_rows(rows)
+
+        self.assertEqual(result[0].function_name, "")
+        self.assertRegex(result[1].function_name, r"^trackMyAdBoostPostButtonTap_[0-9a-f]{8}$")
+        self.assertEqual(build_symbol_table(result).collisions, [])
+        self.assertIn(f"static func {result[1].function_name}()", _generate_function(result[1]))
+
+    def test_renamed_event_keeps_advertisement_overload(self):
+        rows = [
+            EventRow("my_ad", "boost", "post", "button", "tap", "", ""),
+            EventRow("my_ad", "boost", "post", "button", "tap", "", "ad"),
+            EventRow("my", "ad_boost", "post", "button", "tap", "", "ad"),
+            EventRow("my", "ad_boost", "post", "button", "tap", "", ""),
+        ]
+        with redirect_stderr(io.StringIO()):
+            result = disambiguate_rows(rows)
+            reordered = disambiguate_rows(rows[:2] + rows[:1:-1])
+
+        self.assertEqual([r.function_name for r in result[:2]], ["", ""])
+        self.assertRegex(result[2].function_name, r"^trackMyAdBoostPostButtonTap_[0-9a-f]{8}$")
+        self.assertEqual(result[3].function_name, result[2].function_name)
+        self.assertEqual(reordered[2].function_name, result[2].function_name)
+        self.assertEqual(build_symbol_table(result).collisions, [])
+
+    def test_deterministic(self):
+        rows = [
+            EventRow("my_ad", "boost", "post", "button", "tap"),
+            EventRow("my", "ad_boost", "post", "button", "tap"),
+        ]
+        with redirect_stderr(io.StringIO()):
+            first = disambiguate_rows(rows)
+            second = disambiguate_rows(list(rows))
+        self.assertEqual(
+            [r.function_name for r in first], [r.function_name for r in second]
+        )
+
+    def test_rows_without_collisions_unchanged(self):
+        rows = [EventRow("home", "feed", "listing", "ad", "view")]
+        self.assertEqual(disambiguate_rows(rows), rows)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+"""Tests for the generated-function call-site index."""
+
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from analytics_codegen import usage as usage_module
+from analytics_codegen.usage import (
+    CallSite,
+    analyze_usage,
+    build_index,
+    format_usage_json,
+    format_usage_text,
+    generated_function_names,
+    iter_source_files,
+    scan_tree,
+)
+
+GENERATED = """// Auto-generated tracking functions
+
+static func trackHomeFeedListingAdView() {
+}
+
+static func trackHomeFeedListingBannerTap() {
+}
+"""
+
+
+class TestGeneratedNames(unittest.TestCase):
+    def test_extract_names(self):
+        self.assertEqual(
+            generated_function_names(GENERATED),
+            ["trackHomeFeedListingAdView", "trackHomeFeedListingBannerTap"],
+        )
+
+
+class TestScanTree(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        (self.root / "Feature").mkdir()
+        (self.root / "Feature" / "HomeViewController.swift").write_text(
+            "final class HomeViewController {\n"
+            "  func viewDidAppear() {\n"
+            "    EventsTracker.trackHomeFeedListingAdView()\n"
+            "    EventsTracker.trackOldRemovedEvent()\n"
+            "    EventsTracker.trackEvent(event: event)\n"
+            "  }\n"
+            "}\n",
+            encoding="utf-8",
+        )
+        (self.root / "EventsTracker.swift").write_text(
+            "static func trackEvent(event: EventModel) {}\n", encoding="utf-8"
+        )
+        (self.root / "Pods").mkdir()
+        (self.root / "Pods" / "Vendor.swift").write_text(
+            "trackHomeFeedListingBannerTap()\n", encoding="utf-8"
+        )
+        (self.root / "notes.txt").write_text(
+            "trackHomeFeedListingBannerTap()\n", encoding="utf-8"
+        )
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_report(self):
+        names = generated_function_names(GENERATED)
+        report = scan_tree(names, self.root)
+
+        self.assertEqual(report.files_scanned, 2)
+        self.assertEqual(report.unused, ["trackHomeFeedListingBannerTap"])
+        path = str(self.root / "Feature" / "HomeViewController.swift")
+        self.assertEqual(
+            report.call_sites["trackHomeFeedListingAdView"], [CallSite(path, 3)]
+        )
+        # trackEvent is defined in the tree, so only the removed event is missing
+        self.assertEqual(list(report.missing), ["trackOldRemovedEvent"])
+        self.assertEqual(report.missing["trackOldRemovedEvent"], [CallSite(path, 4)])
+
+    def test_parallel_matches_serial(self):
+        paths = iter_source_files(self.root)
+        serial = build_index(paths, workers=1)
+        with patch.object(usage_module, "_PARALLEL_MIN_FILES", 1), patch.object(
+            usage_module, "_CHUNK_SIZE", 1
+        ):
+            parallel = build_index(paths, workers=2)
+        self.assertEqual(serial.call_sites, parallel.call_sites)
+        self.assertEqual(serial.definitions, parallel.definitions)
+
+    def test_formatting(self):
+        report = scan_tree(generated_function_names(GENERATED), self.root)
+        text = format_usage_text(report)
+        self.assertIn("Unused generated functions (1):", text)
+        self.assertIn("1/2 generated functions used, 1 missing, 2 files scanned", text)
+
+        payload = json.loads(format_usage_json(report))
+        self.assertEqual(payload["unused"], ["trackHomeFeedListingBannerTap"])
+        self.assertEqual(payload["summary"]["missing"], 1)
+
+    def test_missing_source_dir(self):
+        with self.assertRaises(FileNotFoundError):
+            scan_tree([], self.root / "nope")
+
+
+class TestAnalyzeUsage(unittest.TestCase):
+    def test_empty_index(self):
+        report = analyze_usage(["trackA"], build_index([]), 0)
+        self.assertEqual(report.unused, ["trackA"])
+        self.assertEqual(report.missing, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,285 @@
+"""Tests for the streaming XLSX/ODS workbook reader."""
+
+from __future__ import annotations
+
+import io
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+from unittest.mock import MagicMock, patch
+from xml.sax.saxutils import escape
+
+from analytics_codegen.codegen import generate_swift_from_input
+from analytics_codegen.input_source import (
+    GoogleSheetsWorkbookInputSource,
+    InputType,
+    WorkbookInputSource,
+    detect_input_type,
+)
+from analytics_codegen.workbook import iter_workbook_rows, read_workbook_tables
+
+HEADER = ["screen:", "section:", "component:", "element:", "action:"]
+
+
+def _column_letter(index: int) -> str:
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
+
+
+def build_xlsx(sheets: Sequence[Tuple[str, List[List[Optional[str]]]]]) -> bytes:
+    """Build a minimal XLSX; strings go to sharedStrings, None leaves a gap."""
+    shared: Dict[str, int] = {}
+    sheet_xml: List[str] = []
+    for _, rows in sheets:
+        row_xml: List[str] = []
+        for r, row in enumerate(rows, start=1):
+            cells = []
+            for c, value in enumerate(row):
+                if value is None:
+                    continue
+                index = shared.setdefault(value, len(shared))
+                cells.append(f'<c r="{_column_letter(c)}{r}" t="s"><v>{index}</v></c>')
+            row_xml.append(f'<row r="{r}">{"".join(cells)}</row>')
+        sheet_xml.append(
+            '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            f'<sheetData>{"".join(row_xml)}</sheetData></worksheet>'
+        )
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr(
+            "xl/workbook.xml",
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            "<sheets>"
+            + "".join(
+                f'<sheet name="{escape(name)}" sheetId="{i}" r:id="rId{i}"/>'
+                for i, (name, _) in enumerate(sheets, start=1)
+            )
+            + "</sheets></workbook>",
+        )
+        archive.writestr(
+            "xl/_rels/workbook.xml.rels",
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            + "".join(
+                f'<Relationship Id="rId{i}" Target="worksheets/sheet{i}.xml"/>'
+                for i in range(1, len(sheets) + 1)
+            )
+            + "</Relationships>",
+        )
+        archive.writestr(
+            "xl/sharedStrings.xml",
+            '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            + "".join(f"<si><t>{escape(value)}</t></si>" for value in shared)
+            + "</sst>",
+        )
+        for i, xml in enumerate(sheet_xml, start=1):
+            archive.writestr(f"xl/worksheets/sheet{i}.xml", xml)
+    return buffer.getvalue()
+
+
+def build_ods(tables_xml: str) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("mimetype", "application/vnd.oasis.opendocument.spreadsheet")
+        archive.writestr(
+            "content.xml",
+            '<office:document-content '
+            'xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" '
+            'xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0" '
+            'xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0">'
+            f"<office:body><office:spreadsheet>{tables_xml}</office:spreadsheet>"
+            "</office:body></office:document-content>",
+        )
+    return buffer.getvalue()
+
+
+class TestXlsx(unittest.TestCase):
+    """Test XLSX parsing."""
+
+    def test_shared_strings_and_gaps(self):
+        """Test shared strings are resolved and skipped columns become empty."""
+        data = build_xlsx([("Events", [["a", None, "c"], ["d"]])])
+
+        rows = list(iter_workbook_rows(io.BytesIO(data)))
+
+        self.assertEqual(rows, [("Events", ["a", "", "c"]), ("Events", ["d"])])
+
+    def test_inline_strings_and_numbers(self):
+        """Test inline strings, numbers and booleans."""
+        data = build_xlsx([("S", [])])
+        # Replace the sheet with inline/number/boolean cells
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(io.BytesIO(data)) as src, zipfile.ZipFile(buffer, "w") as dst:
+            for item in src.namelist():
+                if item == "xl/worksheets/sheet1.xml":
+                    continue
+                dst.writestr(item, src.read(item))
+            dst.writestr(
+                "xl/worksheets/sheet1.xml",
+                '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                '<sheetData><row r="1">'
+                '<c r="A1" t="inlineStr"><is><t>inline</t></is></c>'
+                '<c r="B1"><v>42</v></c>'
+                '<c r="C1" t="b"><v>1</v></c>'
+                "</row></sheetData></worksheet>",
+            )
+
+        rows = list(iter_workbook_rows(io.BytesIO(buffer.getvalue())))
+
+        self.assertEqual(rows, [("S", ["inline", "42", "TRUE"])])
+
+    def test_tab_filter(self):
+        """Test only the requested tabs are read, in workbook order."""
+        data = build_xlsx([("One", [["1"]]), ("Two", [["2"]]), ("Three", [["3"]])])
+
+        tables = read_workbook_tables(io.BytesIO(data), ["Three", "One"])
+
+        self.assertEqual(tables, [("One", [["1"]]), ("Three", [["3"]])])
+
+    def test_missing_tab(self):
+        """Test a requested tab that doesn't exist is an error."""
+        data = build_xlsx([("One", [["1"]])])
+
+        with self.assertRaises(ValueError) as cm:
+            read_workbook_tables(io.BytesIO(data), ["Other"])
+        self.assertIn("Other", str(cm.exception))
+
+    def test_not_a_workbook(self):
+        """Test non-zip input is rejected."""
+        with self.assertRaises(ValueError):
+            read_workbook_tables(io.BytesIO(b"screen,section\n"))
+
+
+class TestOds(unittest.TestCase):
+    """Test ODS parsing."""
+
+    def test_repeated_cells_and_rows(self):
+        """Test repeated cells/rows expand and trailing padding is dropped."""
+        data = build_ods(
+            '<table:table table:name="Events">'
+            "<table:table-row>"
+            '<table:table-cell><text:p>a</text:p></table:table-cell>'
+            '<table:table-cell table:number-columns-repeated="2"><text:p>b</text:p></table:table-cell>'
+            '<table:table-cell table:number-columns-repeated="1000"/>'
+            "</table:table-row>"
+            '<table:table-row table:number-rows-repeated="2">'
+            '<table:table-cell><text:p>x<text:s text:c="2"/>y</text:p></table:table-cell>'
+            "</table:table-row>"
+            '<table:table-row table:number-rows-repeated="1048000">'
+            '<table:table-cell table:number-columns-repeated="1024"/>'
+            "</table:table-row>"
+            "</table:table>"
+        )
+
+        rows = list(iter_workbook_rows(io.BytesIO(data)))
+
+        self.assertEqual(
+            rows,
+            [
+                ("Events", ["a", "b", "b"]),
+                ("Events", ["x  y"]),
+                ("Events", ["x  y"]),
+            ],
+        )
+
+    def test_tab_filter(self):
+        """Test only the requested tables are read."""
+        data = build_ods(
+            '<table:table table:name="One"><table:table-row>'
+            "<table:table-cell><text:p>1</text:p></table:table-cell>"
+            "</table:table-row></table:table>"
+            '<table:table table:name="Two"><table:table-row>'
+            "<table:table-cell><text:p>2</text:p></table:table-cell>"
+            "</table:table-row></table:table>"
+        )
+
+        self.assertEqual(read_workbook_tables(io.BytesIO(data), ["Two"]), [("Two", [["2"]])])
+
+
+class TestWorkbookInputSource(unittest.TestCase):
+    """Test workbook input sources."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.temp_dir.name)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _workbook(self) -> bytes:
+        return build_xlsx(
+            [
+                ("Feed", [HEADER, ["feed", "list", "post", "card", "tap"]]),
+                ("Profile", [HEADER, ["profile", "header", "avatar", "image", "view"]]),
+            ]
+        )
+
+    def test_detect_workbook(self):
+        """Test .xlsx and .ods paths are detected as workbooks."""
+        self.assertEqual(detect_input_type("events.xlsx"), InputType.WORKBOOK_FILE)
+        self.assertEqual(detect_input_type("events.ods"), InputType.WORKBOOK_FILE)
+
+    def test_generate_from_all_tabs(self):
+        """Test functions are generated from every tab of a workbook."""
+        path = self.dir / "events.xlsx"
+        path.write_bytes(self._workbook())
+        out = self.dir / "Out.swift"
+
+        count = generate_swift_from_input(WorkbookInputSource(path), out)
+
+        self.assertEqual(count, 2)
+        content = out.read_text()
+        self.assertIn("func trackFeedListPostCardTap", content)
+        self.assertIn("func trackProfileHeaderAvatarImageView", content)
+
+    def test_selected_tabs(self):
+        """Test tabs restrict which rows are generated."""
+        path = self.dir / "events.xlsx"
+        path.write_bytes(self._workbook())
+
+        source = WorkbookInputSource(path, ["Profile"])
+
+        self.assertEqual([name for name, _ in source.get_tables()], ["Profile"])
+        self.assertEqual(source.get_csv_rows()[1][0], "profile")
+
+    def test_missing_file(self):
+        """Test a missing workbook raises FileNotFoundError."""
+        with self.assertRaises(FileNotFoundError):
+            WorkbookInputSource(self.dir / "missing.xlsx").get_tables()
+
+    def test_google_sheets_export_url(self):
+        """Test the whole spreadsheet is exported as XLSX."""
+        source = GoogleSheetsWorkbookInputSource(
+            "https://docs.google.com/spreadsheets/d/ABC123/edit#gid=456"
+        )
+
+        self.assertEqual(
+            source._build_export_url(),
+            "https://docs.google.com/spreadsheets/d/ABC123/export?format=xlsx",
+        )
+
+    @patch("analytics_codegen.input_source.request.urlopen")
+    def test_google_sheets_single_download(self, mock_urlopen):
+        """Test all tabs come from one XLSX download."""
+        mock_response = MagicMock()
+        mock_response.__enter__.return_value = io.BytesIO(self._workbook())
+        mock_urlopen.return_value = mock_response
+
+        source = GoogleSheetsWorkbookInputSource(
+            "https://docs.google.com/spreadsheets/d/ABC123/edit"
+        )
+        tables = source.get_tables()
+
+        self.assertEqual([name for name, _ in tables], ["Feed", "Profile"])
+        mock_urlopen.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()